@@ -0,0 +1,110 @@
+"""Bounded in-memory LRU cache of encoded values, with hit, miss and eviction counters."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+
+class EncodedValueCache:
+    """Thread-safe LRU map of encoded values bounded by entry count and total size in bytes.
+
+    The contents belong to one generation: a lookup or a store under a newer generation empties
+    the cache first, and values read under an older one are not stored.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self._values: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._generation: int | None = None
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._resets = 0
+        self._lock = threading.Lock()
+
+    def _accepts(self, generation: int) -> bool:
+        """Empty the cache if `generation` is newer; return whether it matches."""
+        if self._generation is None or generation > self._generation:
+            if self._values:
+                self._resets += 1
+            self._values.clear()
+            self._bytes = 0
+            self._generation = generation
+        return generation == self._generation
+
+    def get_many(self, keys: Iterable[Hashable], generation: int) -> dict[Hashable, bytes]:
+        """Return the cached values of `keys`, counting a hit or a miss for each one."""
+        found: dict[Hashable, bytes] = {}
+        with self._lock:
+            current = self._accepts(generation)
+            for key in keys:
+                value = self._values.get(key) if current else None
+                if value is None:
+                    self._misses += 1
+                    continue
+                self._values.move_to_end(key)
+                found[key] = value
+                self._hits += 1
+        return found
+
+    def put_many(
+        self,
+        values: dict[Hashable, bytes],
+        generation: int,
+        is_current: Callable[[], bool] | None = None,
+    ) -> None:
+        """Store values read under `generation`, evicting the least recently used beyond the bounds.
+
+        `is_current` runs under the lock, so rejected values cannot overtake a `discard()`.
+        """
+        with self._lock:
+            if not self._accepts(generation) or (is_current is not None and not is_current()):
+                return
+            for key, value in values.items():
+                if len(value) > self.max_bytes:
+                    continue
+                previous = self._values.pop(key, None)
+                if previous is not None:
+                    self._bytes -= len(previous)
+                self._values[key] = value
+                self._bytes += len(value)
+            while self._values and (
+                len(self._values) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._values.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Remove every value, keeping the counters."""
+        with self._lock:
+            self._values.clear()
+            self._bytes = 0
+
+    def discard(self, keys: Iterable[Hashable]) -> None:
+        """Remove the values of `keys` after a write changed them."""
+        with self._lock:
+            for key in keys:
+                value = self._values.pop(key, None)
+                if value is not None:
+                    self._bytes -= len(value)
+                    self._invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the size, bounds and counters of the cache."""
+        with self._lock:
+            return {
+                "entries": len(self._values),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "resets": self._resets,
+            }
@@ -0,0 +1,366 @@
+"""Row-level change log used to replay local writes onto a newer remote snapshot."""
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+
+logger = logging.getLogger("ludostock.backend.sqlite")
+CHANGE_LOG_TABLE = "change_log"
+CHANGE_LOG_REPLAY_TABLE = "change_log_replay"
+CHANGE_LOG_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        operation TEXT NOT NULL,
+        old_row TEXT,
+        new_row TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS change_log_replay (
+        active INTEGER PRIMARY KEY
+    )
+    """,
+)
+_OPERATIONS = {
+    "insert": ("NEW", None, "NEW"),
+    "update": ("NEW", "OLD", "NEW"),
+    "delete": ("OLD", "OLD", None),
+}
+
+
+def _trigger_name(table: str, operation: str) -> str:
+    """Return the name of the trigger logging one kind of change on a table."""
+    return f"{CHANGE_LOG_TABLE}_{table}_{operation}"
+
+
+def _json_row(alias: str | None, columns: list[str]) -> str:
+    """Return the SQL expression serializing a trigger row as a JSON object."""
+    if alias is None:
+        return "NULL"
+    return (
+        "json_object(" + ", ".join(f"'{column}', {alias}.\"{column}\"" for column in columns) + ")"
+    )
+
+
+def _trigger_sql(
+    table: str, operation: str, columns: list[str], watch_columns: bool = False
+) -> str:
+    """Return the CREATE TRIGGER statement logging one kind of change on a table.
+
+    With `watch_columns`, updates touching none of `columns` are not logged.
+    """
+    _, old_alias, new_alias = _OPERATIONS[operation]
+    event = operation.upper()
+    if watch_columns and operation == "update":
+        event = "UPDATE OF " + ", ".join(f'"{column}"' for column in columns)
+    return (
+        f"CREATE TRIGGER {_trigger_name(table, operation)} AFTER {event} ON {table} "
+        f"WHEN NOT EXISTS (SELECT 1 FROM {CHANGE_LOG_REPLAY_TABLE}) "
+        f"BEGIN INSERT INTO {CHANGE_LOG_TABLE} (table_name, operation, old_row, new_row) "
+        f"VALUES ('{table}', '{operation}', "
+        f"{_json_row(old_alias, columns)}, {_json_row(new_alias, columns)}); END"
+    )
+
+
+def _table_columns(connection: sqlite3.Connection, table: str, schema: str = "main") -> list[str]:
+    """Return the column names of a table, in declaration order."""
+    return [row[1] for row in connection.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def ensure_change_log(
+    connection: sqlite3.Connection,
+    tables: tuple[str, ...],
+    enabled: bool,
+    derived_columns: dict[str, tuple[str, ...]] | None = None,
+) -> None:
+    """Create or drop the change-log triggers, rewriting only those whose columns changed.
+
+    `derived_columns` lists, per table, columns maintained by triggers from other logged rows;
+    they are neither logged nor replayed, since replaying their sources recomputes them.
+    """
+    derived_columns = derived_columns or {}
+    for statement in CHANGE_LOG_STATEMENTS:
+        connection.execute(statement)
+    existing = {
+        name: sql
+        for name, sql in connection.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"
+        )
+    }
+
+    for table in tables:
+        columns = [
+            column
+            for column in _table_columns(connection, table)
+            if column not in derived_columns.get(table, ())
+        ]
+        for operation in _OPERATIONS:
+            name = _trigger_name(table, operation)
+            expected = (
+                _trigger_sql(table, operation, columns, watch_columns=table in derived_columns)
+                if enabled
+                else None
+            )
+            if existing.get(name) == expected:
+                continue
+            if name in existing:
+                connection.execute(f"DROP TRIGGER {name}")
+            if expected is not None:
+                connection.execute(expected)
+
+    if not enabled:
+        connection.execute(f"DELETE FROM {CHANGE_LOG_TABLE}")
+
+
+def strip_change_log(path: Path) -> int:
+    """Empty the change log of a snapshot copy and return the last sequence number it held."""
+    connection = sqlite3.connect(path)
+    try:
+        exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (CHANGE_LOG_TABLE,),
+        ).fetchone()
+        if not exists:
+            return 0
+        watermark = connection.execute(
+            f"SELECT COALESCE(MAX(seq), 0) FROM {CHANGE_LOG_TABLE}"
+        ).fetchone()[0]
+        connection.execute(f"DELETE FROM {CHANGE_LOG_TABLE}")
+        connection.commit()
+        return watermark
+    finally:
+        connection.close()
+
+
+def trim_change_log(connection: sqlite3.Connection, watermark: int) -> int:
+    """Drop the entries published up to a watermark and return how many entries remain."""
+    connection.execute(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE seq <= ?", (watermark,))
+    return connection.execute(f"SELECT COUNT(*) FROM {CHANGE_LOG_TABLE}").fetchone()[0]
+
+
+class _TableShape:
+    """Columns, keys and foreign keys of one logged table, read from the live schema."""
+
+    def __init__(self, connection: sqlite3.Connection, table: str):
+        self.table = table
+        info = connection.execute(f"PRAGMA table_info({table})").fetchall()
+        self.columns = [row[1] for row in info]
+        self.primary_key = [
+            row[1] for row in sorted((row for row in info if row[5]), key=lambda row: row[5])
+        ]
+        self.rowid_key = (
+            self.primary_key[0]
+            if len(self.primary_key) == 1
+            and any(row[1] == self.primary_key[0] and row[2].upper() == "INTEGER" for row in info)
+            else None
+        )
+        # Natural keys identify the same logical row on both sides, whatever id each writer gave it.
+        self.natural_keys = [
+            [row[2] for row in connection.execute(f"PRAGMA index_info({index[1]})")]
+            for index in connection.execute(f"PRAGMA index_list({table})")
+            if index[2] and index[3] != "pk"
+        ]
+        if self.rowid_key is None:
+            self.natural_keys.append(self.primary_key)
+        self.references = {
+            row[3]: row[2] for row in connection.execute(f"PRAGMA foreign_key_list({table})")
+        }
+
+
+class ChangeReplayer:
+    """Replay logged row changes onto another copy of the database with deterministic rules.
+
+    Inserts whose natural key already exists update that row, and inserts whose id was taken
+    by another writer get a new id that later entries are remapped to. Updates only write the
+    columns they changed (last writer wins per column) and are dropped when the row was
+    deleted remotely; deletes win over remote edits.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self._shapes: dict[str, _TableShape] = {}
+        self._id_map: dict[tuple[str, Any], Any] = {}
+        self.stats = {"applied": 0, "merged": 0, "remapped": 0, "skipped": 0}
+
+    def _shape(self, table: str) -> _TableShape:
+        """Return the cached shape of a table."""
+        if table not in self._shapes:
+            self._shapes[table] = _TableShape(self.connection, table)
+        return self._shapes[table]
+
+    def _remap(self, shape: _TableShape, row: dict[str, Any]) -> dict[str, Any]:
+        """Rewrite a logged row's own id and foreign keys to the ids they received on replay."""
+        remapped = dict(row)
+        for column, parent in shape.references.items():
+            remapped[column] = self._id_map.get(
+                (parent, remapped.get(column)), remapped.get(column)
+            )
+        if shape.rowid_key is not None:
+            key = remapped.get(shape.rowid_key)
+            remapped[shape.rowid_key] = self._id_map.get((shape.table, key), key)
+        return remapped
+
+    def _find(
+        self, shape: _TableShape, columns: list[str], row: dict[str, Any]
+    ) -> sqlite3.Row | None:
+        """Return the key columns of the row matching the given values, if any."""
+        where = " AND ".join(f'"{column}" IS ?' for column in columns)
+        return self.connection.execute(
+            f"SELECT {', '.join(shape.primary_key)} FROM {shape.table} WHERE {where}",
+            [row.get(column) for column in columns],
+        ).fetchone()
+
+    def _update(self, shape: _TableShape, key: tuple, values: dict[str, Any]) -> None:
+        """Write column values onto the row with the given primary key."""
+        if not values:
+            return
+        self.connection.execute(
+            f"UPDATE {shape.table} SET {', '.join(f'{column} = ?' for column in values)} "
+            f"WHERE {' AND '.join(f'{column} = ?' for column in shape.primary_key)}",
+            [*values.values(), *key],
+        )
+
+    def _insert(self, shape: _TableShape, row: dict[str, Any]) -> None:
+        """Insert a logged row, merging into an existing natural-key match or taking a new id."""
+        for columns in shape.natural_keys:
+            if any(row.get(column) is None for column in columns):
+                # NULLs never collide in SQLite unique constraints.
+                continue
+            existing = self._find(shape, columns, row)
+            if existing is not None:
+                self._update(
+                    shape,
+                    tuple(existing),
+                    {
+                        column: row[column]
+                        for column in shape.columns
+                        if column in row and column not in shape.primary_key
+                    },
+                )
+                if shape.rowid_key is not None and existing[0] != row[shape.rowid_key]:
+                    self._id_map[(shape.table, row[shape.rowid_key])] = existing[0]
+                self.stats["merged"] += 1
+                return
+
+        values = dict(row)
+        if shape.rowid_key is not None and self._find(shape, [shape.rowid_key], row) is not None:
+            values.pop(shape.rowid_key)
+        placeholders = ", ".join("?" for _ in values)
+        cursor = self.connection.execute(
+            f"INSERT INTO {shape.table} ({', '.join(values)}) VALUES ({placeholders})",
+            list(values.values()),
+        )
+        if shape.rowid_key is not None and shape.rowid_key not in values:
+            self._id_map[(shape.table, row[shape.rowid_key])] = cursor.lastrowid
+            self.stats["remapped"] += 1
+
+    def apply(
+        self,
+        table: str,
+        operation: str,
+        old_row: dict[str, Any] | None,
+        new_row: dict[str, Any] | None,
+    ) -> None:
+        """Apply one logged change, skipping it when it no longer fits the target's rows."""
+        shape = self._shape(table)
+        try:
+            if operation == "insert":
+                self._insert(shape, self._remap(shape, new_row))
+            elif operation == "update":
+                old, new = self._remap(shape, old_row), self._remap(shape, new_row)
+                target = self._find(shape, shape.primary_key, old)
+                if target is None:
+                    self.stats["skipped"] += 1
+                    return
+                self._update(
+                    shape,
+                    tuple(target),
+                    {
+                        column: new.get(column)
+                        for column in shape.columns
+                        if old.get(column) != new.get(column)
+                    },
+                )
+            else:
+                old = self._remap(shape, old_row)
+                key_clause = " AND ".join(f"{column} IS ?" for column in shape.primary_key)
+                self.connection.execute(
+                    f"DELETE FROM {table} WHERE {key_clause}",
+                    [old[column] for column in shape.primary_key],
+                )
+        except sqlite3.IntegrityError as exc:
+            self.stats["skipped"] += 1
+            logger.warning(
+                "sqlite.change_log_entry_skipped table=%s operation=%s error=%s",
+                table,
+                operation,
+                exc,
+            )
+            return
+        self.stats["applied"] += 1
+
+
+def rebase_onto_snapshot(
+    connection: sqlite3.Connection, snapshot_path: Path, tables: tuple[str, ...]
+) -> dict[str, int]:
+    """Replace the logged tables with a newer snapshot's rows, then replay the local change log.
+
+    The connection must be in autocommit mode (`isolation_level=None`). Runs in one immediate
+    transaction, so concurrent writers wait and readers switch from the old rows to the rebased
+    ones atomically. The replayed entries are logged again with their final ids, ready for the
+    next attempt to publish them.
+    """
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute("ATTACH DATABASE ? AS remote", (str(snapshot_path),))
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            changes = connection.execute(
+                "SELECT table_name, operation, old_row, new_row "
+                f"FROM {CHANGE_LOG_TABLE} ORDER BY seq"
+            ).fetchall()
+            connection.execute(f"INSERT INTO {CHANGE_LOG_REPLAY_TABLE} (active) VALUES (1)")
+            connection.execute("PRAGMA defer_foreign_keys = ON")
+            remote_tables = {
+                row[0]
+                for row in connection.execute(
+                    "SELECT name FROM remote.sqlite_master WHERE type = 'table'"
+                )
+            }
+            for table in reversed(tables):
+                connection.execute(f"DELETE FROM main.{table}")
+            for table in tables:
+                if table in remote_tables:
+                    remote_columns = set(_table_columns(connection, table, "remote"))
+                    columns = ", ".join(
+                        f'"{column}"'
+                        for column in _table_columns(connection, table)
+                        if column in remote_columns
+                    )
+                    connection.execute(
+                        f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM remote.{table}"
+                    )
+            connection.execute("PRAGMA defer_foreign_keys = OFF")
+            connection.execute(f"DELETE FROM {CHANGE_LOG_TABLE}")
+            connection.execute(f"DELETE FROM {CHANGE_LOG_REPLAY_TABLE}")
+
+            replayer = ChangeReplayer(connection)
+            for table, operation, old_row, new_row in changes:
+                replayer.apply(
+                    table,
+                    operation,
+                    json.loads(old_row) if old_row is not None else None,
+                    json.loads(new_row) if new_row is not None else None,
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    finally:
+        connection.execute("DETACH DATABASE remote")
+    return {"changes": len(changes), **replayer.stats}
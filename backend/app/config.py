@@ -25,6 +25,31 @@ class Settings(BaseSettings):
     sqlite_path: str = "backend/app/ludostock.db"
     sqlite_gcs_bucket: str = ""
     sqlite_gcs_object: str = ""
+    sqlite_pool_size: int = 4
+    sqlite_pool_timeout_seconds: float = 30.0
+    sqlite_statement_cache_size: int = 256
+    sqlite_storage_mode: str = "rollback"
+    sqlite_group_commit_window_ms: float = 0.0
+    sqlite_group_commit_max_batch: int = 64
+    sqlite_gcs_sync_interval_seconds: float = 0.0
+    sqlite_gcs_sync_max_backoff_seconds: float = 60.0
+    sqlite_replication_mode: str = "snapshot"
+    sqlite_snapshot_format: str = "raw"
+    sqlite_storage_dir: str = ""
+    sqlite_storage_latency_ms: float = 0.0
+    sqlite_download_parallelism: int = 8
+    sqlite_download_chunk_bytes: int = 8 * 1024 * 1024
+    sqlite_seed_path: str = ""
+    sqlite_hydrate_in_background: bool = False
+    sqlite_instance_role: str = "primary"
+    sqlite_catalog_path: str = ""
+    sqlite_catalog_gcs_object: str = ""
+    sqlite_catalog_sync_interval_seconds: float = 30.0
+    sqlite_catalog_mmap_bytes: int = 256 * 1024 * 1024
+    sqlite_replica_poll_interval_seconds: float = 10.0
+    sqlite_replication_base_interval: int = 100
+    game_cache_max_entries: int = 20000
+    game_cache_max_bytes: int = 32 * 1024 * 1024
     allow_origins: Annotated[list[str], NoDecode] = Field(default_factory=lambda: ["*"])
     auth_service_url: str = "http://localhost:3001"
     auth_internal_secret: str = ""
@@ -55,6 +80,31 @@ ENVIRONMENT = settings.environment
 SQLITE_PATH = settings.sqlite_path
 SQLITE_GCS_BUCKET = settings.sqlite_gcs_bucket
 SQLITE_GCS_OBJECT = settings.sqlite_gcs_object
+SQLITE_POOL_SIZE = settings.sqlite_pool_size
+SQLITE_POOL_TIMEOUT_SECONDS = settings.sqlite_pool_timeout_seconds
+SQLITE_STATEMENT_CACHE_SIZE = settings.sqlite_statement_cache_size
+SQLITE_STORAGE_MODE = settings.sqlite_storage_mode
+SQLITE_GROUP_COMMIT_WINDOW_MS = settings.sqlite_group_commit_window_ms
+SQLITE_GROUP_COMMIT_MAX_BATCH = settings.sqlite_group_commit_max_batch
+SQLITE_GCS_SYNC_INTERVAL_SECONDS = settings.sqlite_gcs_sync_interval_seconds
+SQLITE_GCS_SYNC_MAX_BACKOFF_SECONDS = settings.sqlite_gcs_sync_max_backoff_seconds
+SQLITE_REPLICATION_MODE = settings.sqlite_replication_mode
+SQLITE_SNAPSHOT_FORMAT = settings.sqlite_snapshot_format
+SQLITE_STORAGE_DIR = settings.sqlite_storage_dir
+SQLITE_STORAGE_LATENCY_MS = settings.sqlite_storage_latency_ms
+SQLITE_DOWNLOAD_PARALLELISM = settings.sqlite_download_parallelism
+SQLITE_DOWNLOAD_CHUNK_BYTES = settings.sqlite_download_chunk_bytes
+SQLITE_SEED_PATH = settings.sqlite_seed_path
+SQLITE_HYDRATE_IN_BACKGROUND = settings.sqlite_hydrate_in_background
+SQLITE_INSTANCE_ROLE = settings.sqlite_instance_role
+SQLITE_CATALOG_PATH = settings.sqlite_catalog_path
+SQLITE_CATALOG_GCS_OBJECT = settings.sqlite_catalog_gcs_object
+SQLITE_CATALOG_SYNC_INTERVAL_SECONDS = settings.sqlite_catalog_sync_interval_seconds
+SQLITE_CATALOG_MMAP_BYTES = settings.sqlite_catalog_mmap_bytes
+SQLITE_REPLICA_POLL_INTERVAL_SECONDS = settings.sqlite_replica_poll_interval_seconds
+SQLITE_REPLICATION_BASE_INTERVAL = settings.sqlite_replication_base_interval
+GAME_CACHE_MAX_ENTRIES = settings.game_cache_max_entries
+GAME_CACHE_MAX_BYTES = settings.game_cache_max_bytes
 ALLOW_ORIGINS = settings.allow_origins
 AUTH_SERVICE_URL = settings.auth_service_url
 AUTH_INTERNAL_SECRET = settings.auth_internal_secret
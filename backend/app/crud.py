@@ -1,17 +1,38 @@
 """CRUD helpers backed by SQLite."""
 
+import json
 import logging
 import os
+import re
 import secrets
+import threading
 import sqlite3
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from functools import partial
 from typing import Any, Literal
 from uuid import UUID, uuid4
 
 from fastapi import HTTPException
 
 from . import schemas
-from .database import get_connection
+from .cache import EncodedValueCache
+from .config import GAME_CACHE_MAX_BYTES, GAME_CACHE_MAX_ENTRIES
+from .database import (
+    GAME_SEARCH_TABLE,
+    GAME_SORT_KEYS,
+    get_connection,
+    get_data_generation,
+    get_storage_generation,
+    unit_of_work,
+)
+from .pagination import (
+    InvalidCursorError,
+    OrderTerm,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+)
+from .search import TrigramIndex
 
 
 GAME_RELATIONS = {
@@ -20,10 +41,61 @@ GAME_RELATIONS = {
     "editors": ("editors", "game_editors", "editor_id"),
     "distributors": ("distributors", "game_distributors", "distributor_id"),
 }
+_CONTRIBUTOR_JOINS = {
+    table: (join_table, relation_id_column)
+    for table, join_table, relation_id_column in GAME_RELATIONS.values()
+}
 
-GameSortField = Literal["name", "type", "creation_year", "players", "duration_minutes", "authors", "editors"]
+GAME_CONTRIBUTORS_COLUMN = "contributors"
+# Id sets are bound as one JSON array: the statement text, and so its cached preparation, stays the
+# same whatever the set size, and large sets never hit SQLite's host-parameter limit.
+ID_SET_SUBQUERY = "SELECT value FROM json_each(?)"
+
+GameSortField = Literal[
+    "relevance",
+    "name",
+    "type",
+    "creation_year",
+    "players",
+    "duration_minutes",
+    "authors",
+    "editors",
+]
 GameSortDirection = Literal["asc", "desc"]
+GameTotalMode = Literal["exact", "estimate"]
 SHARE_PERMISSION_VIEWER = "viewer"
+# Name matches outrank contributor matches in full-text search.
+GAME_SEARCH_WEIGHTS = (10.0, 1.0)
+_SEARCH_TERM = re.compile(r"\w+")
+GAME_SUGGESTION_LIMIT = 5
+GAME_TOTAL_CACHE_SIZE = 256
+
+
+class _GenerationSlot:
+    """Value derived from the rows of one data generation, replaced under its lock."""
+
+    def __init__(self, value: Any = None):
+        self.generation: int | None = None
+        self.value = value
+        self.lock = threading.Lock()
+
+
+class _SuggestionIndexSlot:
+    """Trigram index of game names, kept until game names or the served files change."""
+
+    def __init__(self):
+        self.index: TrigramIndex | None = None
+        self.storage_generation: int | None = None
+        # Data generation of the last commit that changed game names; older snapshots miss it.
+        self.names_changed_at = 0
+        self.lock = threading.Lock()
+
+
+_SUGGESTION_INDEX = _SuggestionIndexSlot()
+# Total of each normalized game COUNT query, least recently used first.
+_GAME_TOTALS = _GenerationSlot(OrderedDict())
+# Encoded API payload of each game, keyed by id and by the storage generation of the served files.
+_GAME_CACHE = EncodedValueCache(max_entries=GAME_CACHE_MAX_ENTRIES, max_bytes=GAME_CACHE_MAX_BYTES)
 logger = logging.getLogger("ludostock.backend.collection")
 
 
@@ -66,18 +138,58 @@ def _raise_write_error(exc: sqlite3.IntegrityError, conflict_detail: str) -> Non
     raise HTTPException(status_code=400, detail="Database write failed") from exc
 
 
-def _fetch_paginated_rows(table: str, skip: int = 0, limit: int = 100) -> list[dict[str, Any]]:
-    """Fetch rows from a table using limit and offset."""
+def _require_game(connection: sqlite3.Connection, game_id: int) -> None:
+    """Reject references to a missing game, unchecked by foreign keys once the catalog is split."""
+    if connection.execute("SELECT 1 FROM games WHERE id = ?", (game_id,)).fetchone() is None:
+        raise HTTPException(status_code=400, detail="Referenced resource does not exist")
+
+
+def _decode_cursor(cursor: str, ordering: str, size: int) -> list[Any]:
+    """Decode a pagination cursor, rejecting malformed or mismatched ones with a 400."""
+    try:
+        return decode_cursor(cursor, ordering, size)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor") from exc
+
+
+def _build_paginated_query(
+    table: str,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    columns: str = "*",
+) -> tuple[str, list[Any]]:
+    """Build the id-ordered query of a listing page, resuming after `cursor` when given."""
+    cursor_clause, parameters = "", []
+    if cursor:
+        cursor_clause = " WHERE id > ?"
+        parameters = _decode_cursor(cursor, table, 1)
+    query = f"SELECT {columns} FROM {table}{cursor_clause} ORDER BY id LIMIT ? OFFSET ?"
+    return query, [*parameters, limit, skip]
+
+
+def _fetch_paginated_rows(
+    table: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> list[dict[str, Any]]:
+    """Fetch rows from a table by id, resuming after `cursor` when given, using limit and offset."""
     if limit <= 0:
         return []
+    statement, parameters = _build_paginated_query(table, skip, limit, cursor)
     with get_connection() as connection:
-        rows = connection.execute(
-            f"SELECT * FROM {table} ORDER BY id LIMIT ? OFFSET ?",
-            (limit, skip),
-        ).fetchall()
+        rows = connection.execute(statement, tuple(parameters)).fetchall()
     return _rows_to_dicts(rows)
 
 
+def get_next_page_cursor(table: str, rows: list[dict[str, Any]], limit: int) -> str | None:
+    """Return the cursor resuming an id-ordered listing after a full page, or None after a short."""
+    if limit <= 0 or len(rows) < limit:
+        return None
+    return encode_cursor(table, [rows[-1]["id"]])
+
+
 def _fetch_row_by_column(table: str, column: str, value: Any) -> dict[str, Any] | None:
     """Fetch a single row from a table using an equality filter."""
     with get_connection() as connection:
@@ -88,88 +200,181 @@ def _fetch_row_by_column(table: str, column: str, value: Any) -> dict[str, Any]
     return _row_to_dict(row)
 
 
-def _build_game_filters(
-    search: str | None = None,
-    game_type: str | None = None,
-    year: str | None = None,
-) -> tuple[str, list[Any]]:
-    """Build the SQL filter clause for paginated game queries."""
-    clauses, parameters = _build_game_filter_clauses(search=search, game_type=game_type, year=year)
-
-    if not clauses:
-        return "", parameters
-
-    return f" WHERE {' AND '.join(clauses)}", parameters
+def _build_game_search_query(search: str | None) -> str | None:
+    """Turn a search into an FTS5 query matching each word as a prefix, or None without words."""
+    # FTS5 folds case itself; lowering here lets equivalent searches share a cached total.
+    terms = _SEARCH_TERM.findall((search or "").lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _build_game_source(search: str | None = None, table_alias: str = "g") -> tuple[str, list[Any]]:
+    """Build the FROM clause for game queries, joined to ranked full-text matches when searching."""
+    search_query = _build_game_search_query(search)
+    if search_query is None:
+        if search and search.strip():
+            # A search made only of punctuation has no word to match, so it matches no game;
+            # the bound flag keeps it counted as a search rather than an unfiltered listing.
+            return (
+                f"games {table_alias} JOIN (SELECT NULL AS game_id, NULL AS search_rank WHERE ?) "
+                f"search_matches ON search_matches.game_id = {table_alias}.id",
+                [0],
+            )
+        return f"games {table_alias}", []
+
+    weights = ", ".join(str(weight) for weight in GAME_SEARCH_WEIGHTS)
+    return (
+        f"games {table_alias} JOIN ("
+        f"SELECT rowid AS game_id, bm25({GAME_SEARCH_TABLE}, {weights}) AS search_rank "
+        f"FROM {GAME_SEARCH_TABLE} WHERE {GAME_SEARCH_TABLE} MATCH ?"
+        f") search_matches ON search_matches.game_id = {table_alias}.id",
+        [search_query],
+    )
 
 
 def _build_game_filter_clauses(
-    search: str | None = None,
     game_type: str | None = None,
     year: str | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    players: int | None = None,
+    max_age: int | None = None,
+    max_duration: int | None = None,
     table_alias: str = "g",
 ) -> tuple[list[str], list[Any]]:
-    """Build SQL filter clauses and parameters for game queries."""
+    """Build SQL filter clauses and parameters for game queries; `_build_game_source` joins search.
+
+    Range filters compare the raw columns so the range indexes apply; games whose bound is
+    unknown (NULL) never match them.
+    """
     clauses: list[str] = []
     parameters: list[Any] = []
 
-    if search and search.strip():
-        pattern = f"%{search.strip().lower()}%"
-        clauses.append(f"LOWER({table_alias}.name) LIKE ?")
-        parameters.append(pattern)
-
     if game_type and game_type.strip():
         clauses.append(f"LOWER({table_alias}.type) = ?")
         parameters.append(game_type.strip().lower())
 
     if year and year.strip():
+        # Kept for older clients; prefer the indexed year_min/year_max range.
         clauses.append(f"CAST({table_alias}.creation_year AS TEXT) LIKE ?")
         parameters.append(f"%{year.strip()}%")
 
+    if year_min is not None:
+        clauses.append(f"{table_alias}.creation_year >= ?")
+        parameters.append(year_min)
+
+    if year_max is not None:
+        clauses.append(f"{table_alias}.creation_year <= ?")
+        parameters.append(year_max)
+
+    if players is not None:
+        clauses.append(f"{table_alias}.max_players >= ? AND {table_alias}.min_players <= ?")
+        parameters.extend([players, players])
+
+    if max_age is not None:
+        clauses.append(f"{table_alias}.min_age <= ?")
+        parameters.append(max_age)
+
+    if max_duration is not None:
+        clauses.append(f"{table_alias}.duration_minutes <= ?")
+        parameters.append(max_duration)
+
     return clauses, parameters
 
 
-def _build_game_order(sort_by: GameSortField = "name", sort_dir: GameSortDirection = "asc") -> str:
-    """Build a safe SQL ORDER BY clause for game pages."""
+def _build_game_order_terms(
+    sort_by: GameSortField = "name",
+    sort_dir: GameSortDirection = "asc",
+    ranked: bool = False,
+) -> list[OrderTerm]:
+    """Build the `(expression, direction)` terms ordering game pages.
+
+    Relevance needs `ranked` search matches and otherwise sorts by name.
+    """
     direction = "DESC" if sort_dir == "desc" else "ASC"
-    author_sort = (
-        "COALESCE(("
-        "SELECT MIN(LOWER(a.name)) "
-        "FROM game_authors ga "
-        "JOIN authors a ON a.id = ga.author_id "
-        "WHERE ga.game_id = g.id"
-        "), '')"
-    )
-    editor_sort = (
-        "COALESCE(("
-        "SELECT MIN(LOWER(e.name)) "
-        "FROM game_editors ge "
-        "JOIN editors e ON e.id = ge.editor_id "
-        "WHERE ge.game_id = g.id"
-        "), '')"
-    )
+    tie_breakers: list[OrderTerm] = [("LOWER(g.name)", "ASC"), ("g.id", "DESC")]
+
+    if sort_by == "relevance" and ranked:
+        # bm25 scores are lower for better matches, so the best matches always come first.
+        return [("search_matches.search_rank", "ASC"), *tie_breakers]
 
-    if sort_by == "name":
-        return f"LOWER(g.name) {direction}, g.id DESC"
+    if sort_by in ("relevance", "name"):
+        return [("LOWER(g.name)", direction), ("g.id", "DESC")]
 
     if sort_by == "type":
-        return f"LOWER(g.type) {direction}, LOWER(g.name) ASC, g.id DESC"
+        return [("LOWER(g.type)", direction), *tie_breakers]
 
     if sort_by == "creation_year":
-        return f"(g.creation_year IS NULL) ASC, g.creation_year {direction}, LOWER(g.name) ASC, g.id DESC"
+        return [("(g.creation_year IS NULL)", "ASC"), ("g.creation_year", direction), *tie_breakers]
 
     if sort_by == "players":
-        return (
-            f"(g.min_players IS NULL) ASC, g.min_players {direction}, "
-            f"(g.max_players IS NULL) ASC, g.max_players {direction}, LOWER(g.name) ASC, g.id DESC"
-        )
+        return [
+            ("(g.min_players IS NULL)", "ASC"),
+            ("g.min_players", direction),
+            ("(g.max_players IS NULL)", "ASC"),
+            ("g.max_players", direction),
+            *tie_breakers,
+        ]
 
     if sort_by == "duration_minutes":
-        return f"(g.duration_minutes IS NULL) ASC, g.duration_minutes {direction}, LOWER(g.name) ASC, g.id DESC"
+        return [
+            ("(g.duration_minutes IS NULL)", "ASC"),
+            ("g.duration_minutes", direction),
+            *tie_breakers,
+        ]
 
     if sort_by == "authors":
-        return f"{author_sort} {direction}, LOWER(g.name) ASC, g.id DESC"
+        return [("g.author_sort_key", direction), *tie_breakers]
+
+    return [("g.editor_sort_key", direction), *tie_breakers]
+
 
-    return f"{editor_sort} {direction}, LOWER(g.name) ASC, g.id DESC"
+def _build_game_order(order_terms: list[OrderTerm]) -> str:
+    """Build a safe SQL ORDER BY clause from game order terms."""
+    return ", ".join(f"{expression} {direction}" for expression, direction in order_terms)
+
+
+def _build_game_cursor_keys(order_terms: list[OrderTerm]) -> str:
+    """Select the order terms of each game row so the last one can become the next cursor."""
+    return "".join(
+        f", {expression} AS cursor_key_{index}" for index, (expression, _) in enumerate(order_terms)
+    )
+
+
+def _build_game_cursor_clauses(
+    cursor: str | None,
+    order_terms: list[OrderTerm],
+    ordering: str,
+) -> tuple[list[str], list[Any]]:
+    """Build the keyset clause resuming a game page after `cursor`, if any."""
+    if not cursor:
+        return [], []
+    condition, parameters = keyset_condition(
+        order_terms, _decode_cursor(cursor, ordering, len(order_terms))
+    )
+    return [condition], parameters
+
+
+def _paginate_game_rows(
+    game_rows: list[dict[str, Any]],
+    limit: int,
+    order_terms: list[OrderTerm],
+    ordering: str,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Trim the look-ahead row of a game page, returning the page and its next cursor."""
+    if limit <= 0:
+        return [], None
+    next_cursor = None
+    if len(game_rows) > limit:
+        game_rows = game_rows[:limit]
+        next_cursor = encode_cursor(
+            ordering, [game_rows[-1][f"cursor_key_{index}"] for index in range(len(order_terms))]
+        )
+    for row in game_rows:
+        for index in range(len(order_terms)):
+            row.pop(f"cursor_key_{index}")
+    return game_rows, next_cursor
 
 
 def _fetch_row(table: str, row_id: Any) -> dict[str, Any] | None:
@@ -187,8 +392,11 @@ def _delete_row(table: str, row_id: Any) -> dict[str, Any] | None:
     row = _fetch_row(table, row_id)
     if row is None:
         return None
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
+        # Deleting a contributor cascades to its join rows, so its games are looked up first.
+        game_ids = _contributor_game_ids(connection, table, row_id)
         connection.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+        _invalidate_game_fragments(connection, game_ids)
         connection.commit()
     return row
 
@@ -198,27 +406,32 @@ def _update_named_row(table: str, row_id: Any, name: str, duplicate_message: str
     if _fetch_row(table, row_id) is None:
         return None
 
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             connection.execute(
                 f"UPDATE {table} SET name = ? WHERE id = ?",
                 (name, row_id),
             )
+            _invalidate_game_fragments(connection, _contributor_game_ids(connection, table, row_id))
             connection.commit()
         except sqlite3.IntegrityError as exc:
             _raise_write_error(exc, duplicate_message)
     return _fetch_row(table, row_id)
 
 
+def _bind_id_set(ids: list[Any]) -> str:
+    """Encode an id set as the single JSON parameter read by `ID_SET_SUBQUERY`."""
+    return json.dumps([str(value) if isinstance(value, UUID) else value for value in ids])
+
+
 def _fetch_rows_by_ids(table: str, ids: list[Any]) -> list[dict[str, Any]]:
     """Fetch rows by a list of ids."""
     if not ids:
         return []
-    placeholders = ", ".join("?" for _ in ids)
     with get_connection() as connection:
         rows = connection.execute(
-            f"SELECT * FROM {table} WHERE id IN ({placeholders})",
-            tuple(ids),
+            f"SELECT * FROM {table} WHERE id IN ({ID_SET_SUBQUERY})",
+            (_bind_id_set(ids),),
         ).fetchall()
     return _rows_to_dicts(rows)
 
@@ -261,56 +474,123 @@ def _group_rows(rows: list[dict[str, Any]], key: str) -> dict[Any, list[dict[str
     return grouped
 
 
-def _load_game_relations(game_ids: list[int]) -> dict[str, dict[int, list[dict[str, Any]]]]:
-    """Load authors, artists, editors and distributors for a set of games."""
-    relations: dict[str, dict[int, list[dict[str, Any]]]] = {}
-    if not game_ids:
-        return relations
+def _build_game_contributors_column(table_alias: str = "g") -> str:
+    """Select a game's contributors as one JSON object of arrays, each ordered by id."""
+    relations = []
+    for relation_name, (table, join_table, relation_id_column) in GAME_RELATIONS.items():
+        relations.append(
+            f"'{relation_name}', json((SELECT json_group_array("
+            "json_object('id', related.id, 'name', related.name)) FROM ("
+            f"SELECT {table}.id, {table}.name FROM {join_table} "
+            f"JOIN {table} ON {table}.id = {join_table}.{relation_id_column} "
+            f"WHERE {join_table}.game_id = {table_alias}.id "
+            f"ORDER BY {join_table}.{relation_id_column}"
+            ") related))"
+        )
+    return f"json_object({', '.join(relations)}) AS {GAME_CONTRIBUTORS_COLUMN}"
 
-    placeholders = ", ".join("?" for _ in game_ids)
-    with get_connection() as connection:
-        for relation_name, (table, join_table, relation_id_column) in GAME_RELATIONS.items():
-            join_rows = _rows_to_dicts(
-                connection.execute(
-                    f"SELECT game_id, {relation_id_column} FROM {join_table} "
-                    f"WHERE game_id IN ({placeholders})",
-                    tuple(game_ids),
-                ).fetchall()
-            )
-            related_ids = sorted({row[relation_id_column] for row in join_rows})
-            related_rows = _fetch_rows_by_ids(table, related_ids)
-            related_by_id = {row["id"]: row for row in related_rows}
 
-            grouped: dict[int, list[dict[str, Any]]] = defaultdict(list)
-            for join_row in join_rows:
-                related_row = related_by_id.get(join_row[relation_id_column])
-                if related_row is not None:
-                    grouped[join_row["game_id"]].append(related_row)
-            relations[relation_name] = grouped
+def _serialize_game(game_row: dict[str, Any]) -> dict[str, Any]:
+    """Convert a hydrated game row, with its contributors as one JSON object, into the API shape."""
+    payload = {
+        key: value
+        for key, value in game_row.items()
+        if key not in GAME_SORT_KEYS and key != GAME_CONTRIBUTORS_COLUMN
+    }
+    payload.update(json.loads(game_row[GAME_CONTRIBUTORS_COLUMN]))
+    return payload
 
-    return relations
 
+def _encode_json(value: Any) -> bytes:
+    """Encode a payload as compact UTF-8 JSON."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _splice_json_object(payload: dict[str, Any], key: str, fragment: bytes) -> bytes:
+    """Encode `payload` as a JSON object whose `key` member is the already-encoded `fragment`."""
+    encoded = _encode_json(payload)
+    separator = b"," if payload else b""
+    return encoded[:-1] + separator + _encode_json(key) + b":" + fragment + b"}"
+
+
+def _join_json_array(fragments: list[bytes]) -> bytes:
+    """Join already-encoded JSON values into a JSON array."""
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def _load_game_fragments(connection: sqlite3.Connection, game_ids: list[int]) -> dict[int, bytes]:
+    """Return the encoded API payload of each existing game, hydrating only uncached games.
+
+    Fragments are dropped when a committed write touches their game and all at once when the
+    served files change. Connections holding uncommitted writes bypass the cache.
+    """
+    storage_generation = get_storage_generation()
+    snapshot_generation = connection.snapshot_generation
+    cacheable = not connection.has_pending_changes
+    fragments = _GAME_CACHE.get_many(game_ids, storage_generation) if cacheable else {}
+
+    missing = [game_id for game_id in game_ids if game_id not in fragments]
+    if not missing:
+        return fragments
+    rows = connection.execute(
+        f"SELECT g.*, {_build_game_contributors_column()} "
+        f"FROM games g WHERE g.id IN ({ID_SET_SUBQUERY})",
+        (_bind_id_set(missing),),
+    ).fetchall()
+    hydrated = {row["id"]: _encode_json(_serialize_game(dict(row))) for row in rows}
+    fragments.update(hydrated)
+    if cacheable and hydrated:
+        # Rows read from a snapshot older than the last commit may predate a finished invalidation.
+        _GAME_CACHE.put_many(
+            hydrated,
+            storage_generation,
+            is_current=lambda: get_data_generation() == snapshot_generation,
+        )
+    return fragments
 
-def _serialize_game(game_row: dict[str, Any], relations: dict[str, dict[int, list[dict[str, Any]]]]) -> dict[str, Any]:
-    """Convert a raw game row into the API response shape."""
-    payload = dict(game_row)
-    for relation_name in GAME_RELATIONS:
-        payload[relation_name] = relations.get(relation_name, {}).get(game_row["id"], [])
-    return payload
 
+def _decode_game_fragments(
+    game_ids: list[int], fragments: dict[int, bytes]
+) -> list[dict[str, Any]]:
+    """Decode the fragments of the listed games that still exist, in order, with a single parse."""
+    return json.loads(
+        _join_json_array([fragments[game_id] for game_id in game_ids if game_id in fragments])
+    )
 
-def _get_game_by_filters(**filters: Any) -> dict[str, Any] | None:
-    """Fetch a single game using arbitrary equality filters."""
-    where_clause = " AND ".join(f"{column} = ?" for column in filters)
-    with get_connection() as connection:
-        row = connection.execute(
-            f"SELECT * FROM games WHERE {where_clause} LIMIT 1",
-            tuple(filters.values()),
-        ).fetchone()
-    if row is None:
-        return None
-    relations = _load_game_relations([row["id"]])
-    return _serialize_game(dict(row), relations)
+
+def _build_game_page(
+    envelope: dict[str, Any],
+    game_ids: list[int],
+    fragments: dict[int, bytes],
+    as_json: bool,
+) -> dict[str, Any] | bytes:
+    """Return a game page, or with `as_json` its JSON spliced from the cached fragments."""
+    items = [fragments[game_id] for game_id in game_ids if game_id in fragments]
+    if as_json:
+        return _splice_json_object(envelope, "items", _join_json_array(items))
+    return {"items": json.loads(_join_json_array(items)), **envelope}
+
+
+def _invalidate_game_fragments(connection: sqlite3.Connection, game_ids: list[int]) -> None:
+    """Drop the cached fragments of games written in the current transaction once it commits.
+
+    Call it after the writes, so the transaction they opened is the one the invalidation waits for.
+    """
+    if game_ids:
+        connection.call_after_commit(partial(_GAME_CACHE.discard, list(game_ids)))
+
+
+def _contributor_game_ids(connection: sqlite3.Connection, table: str, row_id: Any) -> list[int]:
+    """Return the games crediting a contributor row; empty for tables that are not contributors."""
+    join = _CONTRIBUTOR_JOINS.get(table)
+    if join is None:
+        return []
+    join_table, relation_id_column = join
+    rows = connection.execute(
+        f"SELECT game_id FROM {join_table} WHERE {relation_id_column} = ?",
+        (row_id,),
+    ).fetchall()
+    return [row["game_id"] for row in rows]
 
 
 def _load_collection_relations(
@@ -323,18 +603,18 @@ def _load_collection_relations(
     if not collection_ids:
         return owner_map, {}, {}
 
-    placeholders = ", ".join("?" for _ in collection_ids)
+    collection_id_set = _bind_id_set(collection_ids)
     with get_connection() as connection:
         shares = _rows_to_dicts(
             connection.execute(
-                f"SELECT * FROM collection_shares WHERE collection_id IN ({placeholders})",
-                tuple(collection_ids),
+                f"SELECT * FROM collection_shares WHERE collection_id IN ({ID_SET_SUBQUERY})",
+                (collection_id_set,),
             ).fetchall()
         )
         games = _rows_to_dicts(
             connection.execute(
-                f"SELECT * FROM collection_games WHERE collection_id IN ({placeholders})",
-                tuple(collection_ids),
+                f"SELECT * FROM collection_games WHERE collection_id IN ({ID_SET_SUBQUERY})",
+                (collection_id_set,),
             ).fetchall()
         )
     return owner_map, _group_rows(shares, "collection_id"), _group_rows(games, "collection_id")
@@ -372,7 +652,7 @@ def _get_authenticated_user_profile(auth_user: dict[str, Any]) -> dict[str, str]
 
 def _sync_user_profile(user_id: str, email: str, username: str) -> dict[str, Any]:
     """Update the stored profile for an existing user."""
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         connection.execute(
             "UPDATE users SET email = ?, username = ? WHERE id = ?",
             (email, username, user_id),
@@ -381,6 +661,14 @@ def _sync_user_profile(user_id: str, email: str, username: str) -> dict[str, Any
     return get_user(user_id)
 
 
+def _user_profile_is_stale(user: dict[str, Any], profile: dict[str, str]) -> bool:
+    """Return whether a local user row no longer matches the authenticated profile."""
+    return (
+        str(user.get("email") or "").strip().lower() != profile["email"]
+        or str(user.get("username") or "").strip() != profile["username"]
+    )
+
+
 def _get_or_create_authenticated_user(auth_user: dict[str, Any]) -> dict[str, Any]:
     """Return the local user row matching the authenticated Google profile."""
     profile = _get_authenticated_user_profile(auth_user)
@@ -403,11 +691,7 @@ def _get_or_create_authenticated_user(auth_user: dict[str, Any]) -> dict[str, An
         )
         return created_user
 
-    needs_sync = (
-        str(existing_user.get("email") or "").strip().lower() != profile["email"]
-        or str(existing_user.get("username") or "").strip() != profile["username"]
-    )
-    if needs_sync:
+    if _user_profile_is_stale(existing_user, profile):
         synced_user = _sync_user_profile(existing_user["id"], profile["email"], profile["username"])
         logger.info(
             "auth.user_synced email=%s username=%s user_id=%s service=%s revision=%s hostname=%s sqlite_path=%s",
@@ -458,6 +742,28 @@ def _get_or_create_personal_collection(auth_user: dict[str, Any]) -> dict[str, A
     return collection
 
 
+def ensure_authenticated_user(auth_user: dict[str, Any], personal_collection: bool = False) -> None:
+    """Create or sync the authenticated user, and optionally their collection, in a write unit.
+
+    Read requests call it before opening their transaction: writing these rows from it would
+    upgrade a shared lock, which fails at once while another writer waits to commit.
+    """
+    profile = _get_authenticated_user_profile(auth_user)
+    user = get_user_by_username(profile["username"]) or get_user_by_email(profile["email"])
+    if (
+        user is not None
+        and not _user_profile_is_stale(user, profile)
+        and (not personal_collection or _get_collection_by_owner(user["id"]) is not None)
+    ):
+        return
+
+    with unit_of_work(write=True):
+        if personal_collection:
+            _get_or_create_personal_collection(auth_user)
+        else:
+            _get_or_create_authenticated_user(auth_user)
+
+
 def _create_share_token() -> str:
     """Return a URL-safe token used in collection share links."""
     return secrets.token_urlsafe(24)
@@ -532,8 +838,11 @@ def _list_collection_subscribers(collection_id: int) -> list[dict[str, Any]]:
     ]
 
 
-def _build_collection_board_payload(collection: dict[str, Any], owner: dict[str, Any]) -> dict[str, Any]:
-    """Return collection locations and game rows grouped for board views."""
+def _load_collection_board(
+    collection: dict[str, Any],
+    owner: dict[str, Any],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], dict[int, bytes]]:
+    """Load the owner's locations, the collection rows of existing games and their fragments."""
     with get_connection() as connection:
         location_rows = _rows_to_dicts(
             connection.execute(
@@ -557,24 +866,50 @@ def _build_collection_board_payload(collection: dict[str, Any], owner: dict[str,
                 (collection["id"],),
             ).fetchall()
         )
+        fragments = _load_game_fragments(
+            connection, sorted({row["game_id"] for row in collection_game_rows})
+        )
 
-    game_ids = [row["game_id"] for row in collection_game_rows]
-    game_rows = _fetch_rows_by_ids("games", game_ids)
-    relations = _load_game_relations([row["id"] for row in game_rows])
-    games_by_id = {row["id"]: _serialize_game(row, relations) for row in game_rows}
+    return (
+        location_rows,
+        [row for row in collection_game_rows if row["game_id"] in fragments],
+        fragments,
+    )
 
-    items = [
+
+def _build_board_items(
+    collection_game_rows: list[dict[str, Any]], fragments: dict[int, bytes]
+) -> list[dict[str, Any]]:
+    """Attach its decoded game to each collection game row."""
+    game_ids = list(fragments)
+    games_by_id = dict(zip(game_ids, _decode_game_fragments(game_ids, fragments)))
+    return [
         {
             **row,
             "game": games_by_id[row["game_id"]],
         }
         for row in collection_game_rows
-        if row["game_id"] in games_by_id
     ]
 
+
+def _encode_board_items(
+    collection_game_rows: list[dict[str, Any]], fragments: dict[int, bytes]
+) -> bytes:
+    """Encode the collection game rows as a JSON array, splicing in the fragment of each game."""
+    return _join_json_array(
+        [
+            _splice_json_object(row, "game", fragments[row["game_id"]])
+            for row in collection_game_rows
+        ]
+    )
+
+
+def _build_collection_board_payload(collection: dict[str, Any], owner: dict[str, Any]) -> dict[str, Any]:
+    """Return collection locations and game rows grouped for board views."""
+    location_rows, collection_game_rows, fragments = _load_collection_board(collection, owner)
     return {
         "locations": location_rows,
-        "items": items,
+        "items": _build_board_items(collection_game_rows, fragments),
     }
 
 
@@ -675,11 +1010,63 @@ def _count_collection_games(connection: sqlite3.Connection, collection_id: int)
     return int(row["total"] if row is not None else 0)
 
 
-def get_games(skip: int = 0, limit: int = 100):
+def _count_games_cached(
+    connection: sqlite3.Connection, statement: str, parameters: list[Any]
+) -> int:
+    """Run a game COUNT query, reusing the total of the same filters until the served data changes.
+
+    Connections holding uncommitted writes see rows other requests cannot, so they bypass the cache.
+    """
+    key = (statement, *parameters)
+    generation = connection.snapshot_generation
+    cacheable = not connection.has_pending_changes
+    totals = _GAME_TOTALS.value
+    if cacheable:
+        with _GAME_TOTALS.lock:
+            if _GAME_TOTALS.generation == generation and key in totals:
+                totals.move_to_end(key)
+                return totals[key]
+
+    total = connection.execute(statement, tuple(parameters)).fetchone()[0]
+    if cacheable:
+        with _GAME_TOTALS.lock:
+            # A total counted from a snapshot older than the last commit must not be cached.
+            if get_data_generation() == generation:
+                if _GAME_TOTALS.generation is None or _GAME_TOTALS.generation < generation:
+                    _GAME_TOTALS.generation = generation
+                    totals.clear()
+                totals[key] = total
+                if len(totals) > GAME_TOTAL_CACHE_SIZE:
+                    totals.popitem(last=False)
+    return total
+
+
+def _count_game_page(
+    connection: sqlite3.Connection,
+    statement: str,
+    parameters: list[Any],
+    include_total: bool,
+    estimate: tuple[str, list[Any]] | None,
+) -> tuple[int | None, bool]:
+    """Return a game page total and whether it is estimated; None when the caller skips it."""
+    if not include_total:
+        return None, False
+    if estimate is not None:
+        estimate_statement, estimate_parameters = estimate
+        row = connection.execute(estimate_statement, tuple(estimate_parameters)).fetchone()
+        return int(row[0] or 0), True
+    return _count_games_cached(connection, statement, parameters), False
+
+
+def get_games(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated games with their related contributors."""
-    game_rows = _fetch_paginated_rows("games", skip=skip, limit=limit)
-    relations = _load_game_relations([row["id"] for row in game_rows])
-    return [_serialize_game(row, relations) for row in game_rows]
+    if limit <= 0:
+        return []
+    statement, parameters = _build_paginated_query("games", skip, limit, cursor, columns="id")
+    with get_connection() as connection:
+        game_ids = [row["id"] for row in connection.execute(statement, tuple(parameters))]
+        fragments = _load_game_fragments(connection, game_ids)
+    return _decode_game_fragments(game_ids, fragments)
 
 
 def get_games_page(
@@ -688,38 +1075,147 @@ def get_games_page(
     search: str | None = None,
     game_type: str | None = None,
     year: str | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    players: int | None = None,
+    max_age: int | None = None,
+    max_duration: int | None = None,
     sort_by: GameSortField = "name",
     sort_dir: GameSortDirection = "asc",
+    cursor: str | None = None,
+    include_total: bool = True,
+    total_mode: GameTotalMode = "exact",
+    as_json: bool = False,
 ):
-    """Return a paginated and filterable game page."""
-    where_clause, parameters = _build_game_filters(search=search, game_type=game_type, year=year)
-    order_clause = _build_game_order(sort_by=sort_by, sort_dir=sort_dir)
+    """Return a paginated and filterable game page, resuming after `cursor` when given.
+
+    `include_total=False` skips the count and only reports `has_more`; `total_mode="estimate"`
+    reads the highest game id instead of counting when no filter applies. `as_json=True` returns
+    the encoded page, assembled from the cached game fragments.
+    """
+    source, source_parameters = _build_game_source(search)
+    filter_clauses, filter_parameters = _build_game_filter_clauses(
+        game_type=game_type,
+        year=year,
+        year_min=year_min,
+        year_max=year_max,
+        players=players,
+        max_age=max_age,
+        max_duration=max_duration,
+    )
+    ranked = bool(source_parameters)
+    order_terms = _build_game_order_terms(sort_by=sort_by, sort_dir=sort_dir, ranked=ranked)
+    ordering = f"games:{sort_by}:{sort_dir}:{int(ranked)}"
+    cursor_clauses, cursor_parameters = _build_game_cursor_clauses(cursor, order_terms, ordering)
+    parameters = [*source_parameters, *filter_parameters]
+    where_clause = f" WHERE {' AND '.join(filter_clauses)}" if filter_clauses else ""
+    page_clauses = [*filter_clauses, *cursor_clauses]
+    page_where_clause = f" WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+
+    unfiltered = not filter_clauses and not source_parameters
 
     with get_connection() as connection:
-        total = connection.execute(
-            f"SELECT COUNT(*) FROM games g{where_clause}",
-            tuple(parameters),
-        ).fetchone()[0]
+        total, total_is_estimate = _count_game_page(
+            connection,
+            f"SELECT COUNT(*) FROM {source}{where_clause}",
+            parameters,
+            include_total=include_total,
+            estimate=(
+                ("SELECT MAX(id) FROM games", [])
+                if total_mode == "estimate" and unfiltered
+                else None
+            ),
+        )
 
+        page_query = (
+            f"SELECT g.id{_build_game_cursor_keys(order_terms)} FROM {source}{page_where_clause} "
+            f"ORDER BY {_build_game_order(order_terms)} LIMIT ? OFFSET ?"
+        )
         game_rows = _rows_to_dicts(
             connection.execute(
-                f"SELECT * FROM games g{where_clause} ORDER BY {order_clause} LIMIT ? OFFSET ?",
-                tuple([*parameters, limit, skip]),
+                page_query, tuple([*parameters, *cursor_parameters, limit + 1, skip])
             ).fetchall()
         )
+        game_rows, next_cursor = _paginate_game_rows(game_rows, limit, order_terms, ordering)
+        game_ids = [row["id"] for row in game_rows]
+        fragments = _load_game_fragments(connection, game_ids)
 
-    relations = _load_game_relations([row["id"] for row in game_rows])
-    return {
-        "items": [_serialize_game(row, relations) for row in game_rows],
+    no_matches = total == 0 if total is not None else not game_ids and not skip and not cursor
+    envelope = {
         "total": total,
+        "total_is_estimate": total_is_estimate,
+        "has_more": next_cursor is not None,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
+        "suggestions": (
+            suggest_game_names(search) if no_matches and search and search.strip() else []
+        ),
     }
+    return _build_game_page(envelope, game_ids, fragments, as_json)
+
+
+def _invalidate_game_names(connection: sqlite3.Connection) -> None:
+    """Drop the suggestion index once the current transaction, which wrote game names, commits."""
 
+    def invalidate() -> None:
+        with _SUGGESTION_INDEX.lock:
+            _SUGGESTION_INDEX.index = None
+            _SUGGESTION_INDEX.names_changed_at = get_data_generation()
 
-def get_game(game_id: int):
-    """Return a single game by id."""
-    return _get_game_by_filters(id=game_id)
+    connection.call_after_commit(invalidate)
+
+
+def _get_suggestion_index() -> TrigramIndex:
+    """Return the trigram index of game names, rebuilt when names or the served files change."""
+    with get_connection() as connection:
+        storage_generation = get_storage_generation()
+        snapshot_generation = connection.snapshot_generation
+        cacheable = not connection.has_pending_changes
+        with _SUGGESTION_INDEX.lock:
+            cached = _SUGGESTION_INDEX.index
+            if (
+                cacheable
+                and cached is not None
+                and _SUGGESTION_INDEX.storage_generation == storage_generation
+            ):
+                return cached
+
+            rows = connection.execute("SELECT id, name FROM games").fetchall()
+            index = TrigramIndex((row["id"], row["name"]) for row in rows)
+            # An index built from a snapshot older than the last name change must not be served.
+            if (
+                cacheable
+                and snapshot_generation >= _SUGGESTION_INDEX.names_changed_at
+                and get_storage_generation() == storage_generation
+            ):
+                _SUGGESTION_INDEX.index = index
+                _SUGGESTION_INDEX.storage_generation = storage_generation
+    return index
+
+
+def suggest_game_names(query: str, limit: int = GAME_SUGGESTION_LIMIT) -> list[dict[str, Any]]:
+    """Return the game names closest to a search by trigram similarity."""
+    return _get_suggestion_index().suggest(query, limit=limit)
+
+
+def get_game(game_id: int, as_json: bool = False):
+    """Return a single game by id, or None; `as_json=True` returns its cached encoded payload."""
+    with get_connection() as connection:
+        fragment = _load_game_fragments(connection, [game_id]).get(game_id)
+    if fragment is None or as_json:
+        return fragment
+    return json.loads(fragment)
+
+
+def clear_game_cache() -> None:
+    """Drop every cached game payload, keeping the cache counters."""
+    _GAME_CACHE.clear()
+
+
+def get_game_cache_stats() -> dict[str, Any]:
+    """Return the size, bounds and hit, miss and eviction counters of the game cache."""
+    return _GAME_CACHE.stats()
 
 
 def create_game(game: schemas.GameCreate):
@@ -730,7 +1226,7 @@ def create_game(game: schemas.GameCreate):
         for relation_name in GAME_RELATIONS
     }
 
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         columns = ", ".join(game_data.keys())
         placeholders = ", ".join("?" for _ in game_data)
         try:
@@ -747,6 +1243,7 @@ def create_game(game: schemas.GameCreate):
                         f"INSERT INTO {join_table} (game_id, {relation_id_column}) VALUES (?, ?)",
                         (game_id, related_row["id"]),
                     )
+            _invalidate_game_names(connection)
             connection.commit()
         except sqlite3.IntegrityError as exc:
             connection.rollback()
@@ -756,13 +1253,27 @@ def create_game(game: schemas.GameCreate):
 
 
 def delete_game(game_id: int):
-    """Delete a game and its join-table records."""
-    return _delete_row("games", game_id)
+    """Delete a game, its join-table records and the collection entries that hold it."""
+    game = _fetch_row("games", game_id)
+    if game is None:
+        return None
+    with get_connection(write=True) as connection:
+        # Extensions lose their extension_of_id along with the game.
+        extension_rows = connection.execute(
+            "SELECT id FROM games WHERE extension_of_id = ?", (game_id,)
+        ).fetchall()
+        # A separate catalog file has no foreign key cascading from games to collection_games.
+        connection.execute("DELETE FROM collection_games WHERE game_id = ?", (game_id,))
+        connection.execute("DELETE FROM games WHERE id = ?", (game_id,))
+        _invalidate_game_fragments(connection, [game_id, *(row["id"] for row in extension_rows)])
+        _invalidate_game_names(connection)
+        connection.commit()
+    return game
 
 
-def get_authors(skip: int = 0, limit: int = 100):
+def get_authors(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated authors."""
-    return _fetch_paginated_rows("authors", skip=skip, limit=limit)
+    return _fetch_paginated_rows("authors", skip=skip, limit=limit, cursor=cursor)
 
 
 def get_author(author_id: int):
@@ -772,7 +1283,7 @@ def get_author(author_id: int):
 
 def create_author(author: schemas.AuthorCreate):
     """Create an author."""
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             cursor = connection.execute(
                 "INSERT INTO authors (name) VALUES (?)",
@@ -794,9 +1305,9 @@ def delete_author(author_id: int):
     return _delete_row("authors", author_id)
 
 
-def get_artists(skip: int = 0, limit: int = 100):
+def get_artists(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated artists."""
-    return _fetch_paginated_rows("artists", skip=skip, limit=limit)
+    return _fetch_paginated_rows("artists", skip=skip, limit=limit, cursor=cursor)
 
 
 def get_artist(artist_id: int):
@@ -806,7 +1317,7 @@ def get_artist(artist_id: int):
 
 def create_artist(artist: schemas.ArtistCreate):
     """Create an artist."""
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             cursor = connection.execute(
                 "INSERT INTO artists (name) VALUES (?)",
@@ -828,9 +1339,9 @@ def delete_artist(artist_id: int):
     return _delete_row("artists", artist_id)
 
 
-def get_editors(skip: int = 0, limit: int = 100):
+def get_editors(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated editors."""
-    return _fetch_paginated_rows("editors", skip=skip, limit=limit)
+    return _fetch_paginated_rows("editors", skip=skip, limit=limit, cursor=cursor)
 
 
 def get_editor(editor_id: int):
@@ -840,7 +1351,7 @@ def get_editor(editor_id: int):
 
 def create_editor(editor: schemas.EditorCreate):
     """Create an editor."""
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             cursor = connection.execute(
                 "INSERT INTO editors (name) VALUES (?)",
@@ -862,9 +1373,9 @@ def delete_editor(editor_id: int):
     return _delete_row("editors", editor_id)
 
 
-def get_distributors(skip: int = 0, limit: int = 100):
+def get_distributors(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated distributors."""
-    return _fetch_paginated_rows("distributors", skip=skip, limit=limit)
+    return _fetch_paginated_rows("distributors", skip=skip, limit=limit, cursor=cursor)
 
 
 def get_distributor(distributor_id: int):
@@ -874,7 +1385,7 @@ def get_distributor(distributor_id: int):
 
 def create_distributor(distributor: schemas.DistributorCreate):
     """Create a distributor."""
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             cursor = connection.execute(
                 "INSERT INTO distributors (name) VALUES (?)",
@@ -901,9 +1412,9 @@ def delete_distributor(distributor_id: int):
     return _delete_row("distributors", distributor_id)
 
 
-def get_users(skip: int = 0, limit: int = 100):
+def get_users(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated users."""
-    return _fetch_paginated_rows("users", skip=skip, limit=limit)
+    return _fetch_paginated_rows("users", skip=skip, limit=limit, cursor=cursor)
 
 
 def get_user(user_id: str | UUID):
@@ -928,7 +1439,7 @@ def create_user(user: schemas.UserCreate, user_id: UUID | None = None):
     """Create a user with an optional explicit id."""
     payload = user.model_dump()
     payload["id"] = str(user_id or uuid4())
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             connection.execute(
                 "INSERT INTO users (id, email, username) VALUES (?, ?, ?)",
@@ -945,9 +1456,9 @@ def delete_user(user_id: str | UUID):
     return _delete_row("users", str(user_id))
 
 
-def get_collections(skip: int = 0, limit: int = 100):
+def get_collections(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated collections with their owner, shares and games."""
-    collections = _fetch_paginated_rows("collections", skip=skip, limit=limit)
+    collections = _fetch_paginated_rows("collections", skip=skip, limit=limit, cursor=cursor)
     owner_ids = sorted({str(collection["owner_id"]) for collection in collections})
     owner_map, shares_by_collection, games_by_collection = _load_collection_relations(
         [collection["id"] for collection in collections],
@@ -976,7 +1487,7 @@ def create_collection(collection: schemas.CollectionCreate):
     """Create a collection."""
     payload = collection.model_dump()
     payload["owner_id"] = str(payload["owner_id"])
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             cursor = connection.execute(
                 "INSERT INTO collections (name, description, owner_id) VALUES (?, ?, ?)",
@@ -993,9 +1504,9 @@ def delete_collection(collection_id: int):
     return _delete_row("collections", collection_id)
 
 
-def get_collection_shares(skip: int = 0, limit: int = 100):
+def get_collection_shares(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated collection shares."""
-    return _fetch_paginated_rows("collection_shares", skip=skip, limit=limit)
+    return _fetch_paginated_rows("collection_shares", skip=skip, limit=limit, cursor=cursor)
 
 
 def get_collection_share(share_id: int):
@@ -1028,7 +1539,7 @@ def update_personal_collection_share_settings(
     if regenerate_link or (next_share_enabled and not next_share_token):
         next_share_token = _create_share_token()
 
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             connection.execute(
                 """
@@ -1184,7 +1695,7 @@ def unsubscribe_from_shared_collection(auth_user: dict[str, Any], collection_id:
 def create_collection_share(share: schemas.CollectionShareCreate, collection_id: int):
     """Create a collection share."""
     payload = share.model_dump()
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             cursor = connection.execute(
                 "INSERT INTO collection_shares (collection_id, shared_with, permission) VALUES (?, ?, ?)",
@@ -1206,9 +1717,9 @@ def delete_collection_share(share_id: int):
     return _delete_row("collection_shares", share_id)
 
 
-def get_user_locations(skip: int = 0, limit: int = 100):
+def get_user_locations(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated user locations."""
-    return _fetch_paginated_rows("user_locations", skip=skip, limit=limit)
+    return _fetch_paginated_rows("user_locations", skip=skip, limit=limit, cursor=cursor)
 
 
 def get_user_location(location_id: int):
@@ -1220,7 +1731,7 @@ def create_user_location(location: schemas.UserLocationCreate):
     """Create a location for a user."""
     payload = location.model_dump()
     payload["user_id"] = str(payload["user_id"])
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             cursor = connection.execute(
                 "INSERT INTO user_locations (user_id, name) VALUES (?, ?)",
@@ -1237,9 +1748,9 @@ def delete_user_location(location_id: int):
     return _delete_row("user_locations", location_id)
 
 
-def get_collection_games(skip: int = 0, limit: int = 100):
+def get_collection_games(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """Return paginated collection games."""
-    return _fetch_paginated_rows("collection_games", skip=skip, limit=limit)
+    return _fetch_paginated_rows("collection_games", skip=skip, limit=limit, cursor=cursor)
 
 
 def get_personal_collection_games(
@@ -1249,60 +1760,103 @@ def get_personal_collection_games(
     search: str | None = None,
     game_type: str | None = None,
     year: str | None = None,
+    year_min: int | None = None,
+    year_max: int | None = None,
+    players: int | None = None,
+    max_age: int | None = None,
+    max_duration: int | None = None,
     sort_by: GameSortField = "name",
     sort_dir: GameSortDirection = "asc",
+    cursor: str | None = None,
+    include_total: bool = True,
+    total_mode: GameTotalMode = "exact",
+    as_json: bool = False,
 ):
-    """Return a paginated and filterable page for the authenticated user's collection."""
+    """Return a paginated and filterable page of the authenticated user's collection.
+
+    `include_total=False` skips the count and only reports `has_more`; `total_mode="estimate"`
+    counts the collection rows without the distinct join when no filter applies. `as_json=True`
+    returns the encoded page, assembled from the cached game fragments.
+    """
     collection = _get_or_create_personal_collection(auth_user)
+    source, source_parameters = _build_game_source(search)
     game_filter_clauses, game_filter_params = _build_game_filter_clauses(
-        search=search,
         game_type=game_type,
         year=year,
+        year_min=year_min,
+        year_max=year_max,
+        players=players,
+        max_age=max_age,
+        max_duration=max_duration,
     )
     where_clauses = ["cg.collection_id = ?", *game_filter_clauses]
     where_clause = f" WHERE {' AND '.join(where_clauses)}"
-    parameters = [collection["id"], *game_filter_params]
-    order_clause = _build_game_order(sort_by=sort_by, sort_dir=sort_dir)
+    parameters = [*source_parameters, collection["id"], *game_filter_params]
+    ranked = bool(source_parameters)
+    order_terms = _build_game_order_terms(sort_by=sort_by, sort_dir=sort_dir, ranked=ranked)
+    ordering = f"games:{sort_by}:{sort_dir}:{int(ranked)}"
+    cursor_clauses, cursor_parameters = _build_game_cursor_clauses(cursor, order_terms, ordering)
+    page_where_clause = f" WHERE {' AND '.join([*where_clauses, *cursor_clauses])}"
+
+    unfiltered = not game_filter_clauses and not source_parameters
 
     with get_connection() as connection:
-        total = connection.execute(
-            f"""
-            SELECT COUNT(DISTINCT g.id)
-            FROM games g
-            JOIN collection_games cg ON cg.game_id = g.id
-            {where_clause}
-            """,
-            tuple(parameters),
-        ).fetchone()[0]
+        total, total_is_estimate = _count_game_page(
+            connection,
+            f"SELECT COUNT(DISTINCT g.id) FROM {source} "
+            f"JOIN collection_games cg ON cg.game_id = g.id{where_clause}",
+            parameters,
+            include_total=include_total,
+            estimate=(
+                # A game stored at several locations has one row per location but is listed once.
+                (
+                    "SELECT COUNT(DISTINCT game_id) FROM collection_games WHERE collection_id = ?",
+                    [collection["id"]],
+                )
+                if total_mode == "estimate" and unfiltered
+                else None
+            ),
+        )
 
+        page_query = f"""
+            SELECT DISTINCT g.id{_build_game_cursor_keys(order_terms)}
+            FROM {source}
+            JOIN collection_games cg ON cg.game_id = g.id
+            {page_where_clause}
+            ORDER BY {_build_game_order(order_terms)}
+            LIMIT ? OFFSET ?
+        """
         game_rows = _rows_to_dicts(
             connection.execute(
-                f"""
-                SELECT DISTINCT g.*
-                FROM games g
-                JOIN collection_games cg ON cg.game_id = g.id
-                {where_clause}
-                ORDER BY {order_clause}
-                LIMIT ? OFFSET ?
-                """,
-                tuple([*parameters, limit, skip]),
+                page_query, tuple([*parameters, *cursor_parameters, limit + 1, skip])
             ).fetchall()
         )
+        game_rows, next_cursor = _paginate_game_rows(game_rows, limit, order_terms, ordering)
+        game_ids = [row["id"] for row in game_rows]
+        fragments = _load_game_fragments(connection, game_ids)
 
-    relations = _load_game_relations([row["id"] for row in game_rows])
-    return {
-        "items": [_serialize_game(row, relations) for row in game_rows],
+    envelope = {
         "total": total,
+        "total_is_estimate": total_is_estimate,
+        "has_more": next_cursor is not None,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
+        "suggestions": [],
     }
+    return _build_game_page(envelope, game_ids, fragments, as_json)
+
 
+def get_personal_collection_board(
+    auth_user: dict[str, Any], as_json: bool = False
+) -> dict[str, Any] | bytes:
+    """Return the authenticated user's collection board with locations and game rows.
 
-def get_personal_collection_board(auth_user: dict[str, Any]) -> dict[str, Any]:
-    """Return the authenticated user's collection board with locations and game rows."""
+    `as_json=True` returns the encoded board, assembled from the cached game fragments.
+    """
     user = _get_or_create_authenticated_user(auth_user)
     collection = _get_or_create_personal_collection(auth_user)
-    board = _build_collection_board_payload(collection, user)
+    location_rows, collection_game_rows, fragments = _load_collection_board(collection, user)
     user_context = _auth_user_log_context(auth_user)
     runtime = _runtime_log_context()
 
@@ -1312,18 +1866,23 @@ def get_personal_collection_board(auth_user: dict[str, Any]) -> dict[str, Any]:
         user_context["name"],
         user["id"],
         collection["id"],
-        len(board["items"]),
-        len(board["locations"]),
+        len(collection_game_rows),
+        len(location_rows),
         runtime["service"],
         runtime["revision"],
         runtime["hostname"],
         runtime["sqlite_path"] or "-",
     )
 
-    return {
+    envelope = {
         "collection_id": collection["id"],
-        **board,
+        "locations": location_rows,
     }
+    if as_json:
+        return _splice_json_object(
+            envelope, "items", _encode_board_items(collection_game_rows, fragments)
+        )
+    return {**envelope, "items": _build_board_items(collection_game_rows, fragments)}
 
 
 def get_collection_game(collection_game_id: int):
@@ -1429,7 +1988,7 @@ def update_personal_location(auth_user: dict[str, Any], location_id: int, name:
     if _get_user_location_for_user(str(user["id"]), location_id) is None:
         raise HTTPException(status_code=404, detail="User location not found")
 
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         try:
             connection.execute(
                 "UPDATE user_locations SET name = ? WHERE id = ? AND user_id = ?",
@@ -1478,7 +2037,7 @@ def move_personal_collection_game(
     if existing is not None and existing["id"] != collection_game_id:
         raise HTTPException(status_code=409, detail="Game is already present in the target location")
 
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
         connection.execute(
             "UPDATE collection_games SET location_id = ? WHERE id = ?",
             (location_id, collection_game_id),
@@ -1511,7 +2070,8 @@ def remove_game_from_personal_collection(
 def create_collection_game(collection_game: schemas.CollectionGameCreate):
     """Create a collection game row."""
     payload = collection_game.model_dump()
-    with get_connection() as connection:
+    with get_connection(write=True) as connection:
+        _require_game(connection, payload["game_id"])
         try:
             cursor = connection.execute(
                 """
@@ -1,21 +1,113 @@
 """SQLite helpers used by the backend."""
 
+import gzip
+import hashlib
+import json
 import logging
+import re
 import sqlite3
 import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Any
+from typing import Any, Callable, Iterator
 
-from .config import SQLITE_GCS_BUCKET, SQLITE_GCS_OBJECT, SQLITE_PATH
+from .config import (
+    SQLITE_CATALOG_GCS_OBJECT,
+    SQLITE_CATALOG_MMAP_BYTES,
+    SQLITE_CATALOG_PATH,
+    SQLITE_CATALOG_SYNC_INTERVAL_SECONDS,
+    SQLITE_DOWNLOAD_CHUNK_BYTES,
+    SQLITE_DOWNLOAD_PARALLELISM,
+    SQLITE_GCS_BUCKET,
+    SQLITE_GCS_OBJECT,
+    SQLITE_GCS_SYNC_INTERVAL_SECONDS,
+    SQLITE_GCS_SYNC_MAX_BACKOFF_SECONDS,
+    SQLITE_GROUP_COMMIT_MAX_BATCH,
+    SQLITE_GROUP_COMMIT_WINDOW_MS,
+    SQLITE_HYDRATE_IN_BACKGROUND,
+    SQLITE_INSTANCE_ROLE,
+    SQLITE_PATH,
+    SQLITE_POOL_SIZE,
+    SQLITE_POOL_TIMEOUT_SECONDS,
+    SQLITE_REPLICA_POLL_INTERVAL_SECONDS,
+    SQLITE_REPLICATION_BASE_INTERVAL,
+    SQLITE_REPLICATION_MODE,
+    SQLITE_SEED_PATH,
+    SQLITE_SNAPSHOT_FORMAT,
+    SQLITE_STATEMENT_CACHE_SIZE,
+    SQLITE_STORAGE_DIR,
+    SQLITE_STORAGE_LATENCY_MS,
+    SQLITE_STORAGE_MODE,
+)
+from .changelog import ensure_change_log, rebase_onto_snapshot, strip_change_log, trim_change_log
+from .replication import PageReplicator
+from .storage import (
+    GCSReplicaStore,
+    GCSSnapshotStore,
+    LocalDirectoryReplicaStore,
+    LocalDirectorySnapshotStore,
+    ReplicaStore,
+    SnapshotStore,
+    StorageConflict,
+)
 
 
 logger = logging.getLogger("ludostock.backend.sqlite")
 _DB_INIT_LOCK = threading.RLock()
 _DB_SYNC_LOCK = threading.RLock()
+_DB_POOL_LOCK = threading.Lock()
 _DB_INITIALIZED = False
-_REMOTE_GENERATION: int | None = None
-_HAS_UNSYNCED_LOCAL_CHANGES = False
+# Remote generation each database was last synced with, and databases whose last sync failed.
+_REMOTE_GENERATIONS: dict[str, int | None] = {}
+_UNSYNCED_DATABASES: set[str] = set()
+_SNAPSHOT_SYNCER_LOCK = threading.Lock()
+_STORAGE_LOCK = threading.Lock()
+_REPLICA_SERVING_PATHS: dict[str, Path] = {}
+_RETIRED_REPLICA_PATHS: dict[str, Path] = {}
+_LOCAL_SNAPSHOT_STORES: dict[str, tuple[tuple[Any, ...], LocalDirectorySnapshotStore]] = {}
+DEFAULT_SNAPSHOT_OBJECT = "ludostock.db"
+MAIN_DATABASE = "main"
+CATALOG_DATABASE = "catalog"
+_CURRENT_UNIT_OF_WORK: ContextVar["UnitOfWork | None"] = ContextVar(
+    "ludostock_sqlite_unit_of_work",
+    default=None,
+)
+POOL_CHECKOUT_WARNING_SECONDS = 0.1
+GROUP_COMMIT_SAVEPOINT = "unit_of_work"
+SNAPSHOT_MAGIC = b"LDSTGZ01"
+SNAPSHOT_CHUNK_SIZE = 1024 * 1024
+CHANGE_LOG_MAX_REBASES = 3
+
+
+class _DataGenerations:
+    """Counters that caches compare to detect changes to the rows, or files, this process serves."""
+
+    def __init__(self):
+        self.data = 0
+        self.storage = 0
+        self.lock = threading.Lock()
+
+
+class _ProcessResources:
+    """Process-wide SQLite resources, created on first use and replaced or released by helpers."""
+
+    def __init__(self):
+        self.connection_pool: "SQLiteConnectionPool | None" = None
+        self.writer_queue: "SQLiteWriterQueue | None" = None
+        self.statement_trace: Callable[[str], None] | None = None
+        self.snapshot_syncers: dict[str, "SnapshotSyncer"] = {}
+        self.snapshot_poller: "SnapshotPoller | None" = None
+        self.page_replicator: PageReplicator | None = None
+        self.storage_bucket: tuple[Any, str, Any] | None = None
+        self.seed_serving_path: Path | None = None
+
+
+_GENERATIONS = _DataGenerations()
+_RESOURCES = _ProcessResources()
 
 
 SCHEMA_STATEMENTS = (
@@ -63,6 +155,8 @@ SCHEMA_STATEMENTS = (
         duration_minutes INTEGER,
         url TEXT,
         image_url TEXT,
+        author_sort_key TEXT NOT NULL DEFAULT '',
+        editor_sort_key TEXT NOT NULL DEFAULT '',
         FOREIGN KEY(extension_of_id) REFERENCES games(id) ON DELETE SET NULL
     )
     """,
@@ -149,15 +243,780 @@ SCHEMA_STATEMENTS = (
 )
 
 
+CHANGE_LOGGED_TABLES = (
+    "authors",
+    "artists",
+    "editors",
+    "distributors",
+    "users",
+    "games",
+    "game_authors",
+    "game_artists",
+    "game_editors",
+    "game_distributors",
+    "collections",
+    "collection_shares",
+    "user_locations",
+    "collection_games",
+)
+CATALOG_TABLES = (
+    "authors",
+    "artists",
+    "editors",
+    "distributors",
+    "games",
+    "game_authors",
+    "game_artists",
+    "game_editors",
+    "game_distributors",
+)
+USER_DATA_TABLES = tuple(table for table in CHANGE_LOGGED_TABLES if table not in CATALOG_TABLES)
+# Secondary indexes, one tuple of (table, statement) per index version recorded in
+# PRAGMA user_version. Append a new version rather than editing a released one, so existing
+# files only build what they are missing. Expression indexes must repeat the exact
+# expressions crud filters and sorts on, e.g. LOWER(name), or the planner will not use them.
+INDEX_MIGRATIONS: tuple[tuple[tuple[str, str], ...], ...] = (
+    (
+        (
+            "game_authors",
+            "CREATE INDEX IF NOT EXISTS idx_game_authors_author_id ON game_authors (author_id)",
+        ),
+        (
+            "game_artists",
+            "CREATE INDEX IF NOT EXISTS idx_game_artists_artist_id ON game_artists (artist_id)",
+        ),
+        (
+            "game_editors",
+            "CREATE INDEX IF NOT EXISTS idx_game_editors_editor_id ON game_editors (editor_id)",
+        ),
+        (
+            "game_distributors",
+            "CREATE INDEX IF NOT EXISTS idx_game_distributors_distributor_id "
+            "ON game_distributors (distributor_id)",
+        ),
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_extension_of_id ON games (extension_of_id)",
+        ),
+        ("games", "CREATE INDEX IF NOT EXISTS idx_games_name_lower ON games (LOWER(name))"),
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_type_lower ON games (LOWER(type), LOWER(name))",
+        ),
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_creation_year "
+            "ON games ((creation_year IS NULL), creation_year, LOWER(name))",
+        ),
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_players "
+            "ON games ((min_players IS NULL), min_players, (max_players IS NULL), max_players, "
+            "LOWER(name))",
+        ),
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_duration_minutes "
+            "ON games ((duration_minutes IS NULL), duration_minutes, LOWER(name))",
+        ),
+        ("users", "CREATE INDEX IF NOT EXISTS idx_users_username ON users (username)"),
+        (
+            "collections",
+            "CREATE INDEX IF NOT EXISTS idx_collections_owner_id ON collections (owner_id)",
+        ),
+        (
+            "collection_shares",
+            "CREATE INDEX IF NOT EXISTS idx_collection_shares_shared_with "
+            "ON collection_shares (shared_with)",
+        ),
+        (
+            "collection_games",
+            "CREATE INDEX IF NOT EXISTS idx_collection_games_game_id ON collection_games (game_id)",
+        ),
+        (
+            "collection_games",
+            "CREATE INDEX IF NOT EXISTS idx_collection_games_location_id "
+            "ON collection_games (location_id)",
+        ),
+    ),
+    (
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_author_sort_key "
+            "ON games (author_sort_key, LOWER(name))",
+        ),
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_editor_sort_key "
+            "ON games (editor_sort_key, LOWER(name))",
+        ),
+    ),
+    (
+        # Range filters: the leading column takes the range, the others are checked before the read.
+        ("games", "CREATE INDEX IF NOT EXISTS idx_games_year_range ON games (creation_year)"),
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_player_range "
+            "ON games (max_players, min_players, duration_minutes)",
+        ),
+        (
+            "games",
+            "CREATE INDEX IF NOT EXISTS idx_games_duration_range "
+            "ON games (duration_minutes, min_players, max_players)",
+        ),
+        ("games", "CREATE INDEX IF NOT EXISTS idx_games_age_range ON games (min_age)"),
+    ),
+)
+INDEX_VERSION = len(INDEX_MIGRATIONS)
+# Denormalized contributor sort keys on games: the lowest lower-cased contributor name, or ''
+# without contributors. Triggers keep them current, so sorting by contributor reads an index
+# instead of running a subquery per game.
+GAME_CONTRIBUTOR_RELATIONS = (
+    ("authors", "game_authors", "author_id"),
+    ("artists", "game_artists", "artist_id"),
+    ("editors", "game_editors", "editor_id"),
+    ("distributors", "game_distributors", "distributor_id"),
+)
+GAME_SORT_KEYS = {
+    "author_sort_key": GAME_CONTRIBUTOR_RELATIONS[0],
+    "editor_sort_key": GAME_CONTRIBUTOR_RELATIONS[2],
+}
+DERIVED_COLUMNS = {"games": tuple(GAME_SORT_KEYS)}
+# Full-text index over game names and contributor names, folded for accents and case, with
+# prefix indexes so incremental searches stay fast. Triggers keep it in step with the catalog.
+GAME_SEARCH_TABLE = "games_search"
+GAME_SEARCH_STATEMENT = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {GAME_SEARCH_TABLE} USING fts5("
+    "name, contributors, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+_CREATE_TABLE_NAME = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)")
+_CATALOG_REFERENCE = re.compile(
+    r"\n\s*FOREIGN KEY\(\w+\) REFERENCES (?:" + "|".join(CATALOG_TABLES) + r")\(id\)[^,\n]*,?"
+)
+
+
+def get_data_generation() -> int:
+    """Return a counter bumped whenever the rows served by this process may have changed.
+
+    Write commits, connection pool swaps (seed, replica snapshot) or closes and change-log
+    rebases bump it. Caches read it before querying and drop entries built under an older value.
+    """
+    return _GENERATIONS.data
+
+
+def get_storage_generation() -> int:
+    """Return a counter bumped whenever the served database files are swapped or rewritten.
+
+    Connection pool swaps or closes and change-log rebases bump it, but write commits made
+    through this process do not: caches that invalidate precisely on those commits only need
+    to drop everything when it moves.
+    """
+    return _GENERATIONS.storage
+
+
+def _bump_data_generation(storage: bool = False) -> None:
+    """Invalidate caches keyed on the data generation, and the storage one with `storage=True`."""
+    with _GENERATIONS.lock:
+        _GENERATIONS.data += 1
+        if storage:
+            _GENERATIONS.storage += 1
+
+
+class DatabaseReadOnlyError(sqlite3.OperationalError):
+    """Raised when a write reaches an instance that currently serves reads only."""
+
+    retry_after_seconds: int | None = None
+
+
+class DatabaseHydratingError(DatabaseReadOnlyError):
+    """Raised for writes while reads are served from the seed database during startup hydration."""
+
+    retry_after_seconds = 1
+
+
+class ReplicaWriteRejectedError(DatabaseReadOnlyError):
+    """Raised for writes sent to a read replica; they must go to the primary instance."""
+
+
 class SyncedSQLiteConnection(sqlite3.Connection):
-    """SQLite connection that republishes a snapshot to GCS after each write commit."""
+    """SQLite connection that republishes a snapshot to GCS after each write commit.
+
+    With a separate catalog file, temporary triggers count the rows changed in each database,
+    so a commit only republishes the files it touched.
+    """
+
+    _changes_at_last_commit: int = 0
+    _row_changes: dict[str, int] | None = None
+    _row_changes_at_last_commit: dict[str, int] | None = None
+    _generation_at_begin: int = 0
+    _after_commit: list[Callable[[], None]] | None = None
+
+    def begin(self, immediate: bool = False) -> None:
+        """Begin an explicit transaction, remembering the generation its snapshot cannot predate."""
+        self._generation_at_begin = get_data_generation()
+        self.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+
+    @property
+    def snapshot_generation(self) -> int:
+        """Return a data generation no newer than the rows the next statement will read.
+
+        Caches compare it with `get_data_generation()` before storing what they read: a commit
+        since then may have changed those rows after the caches dropped them.
+        """
+        if self.in_transaction:
+            return self._generation_at_begin
+        return get_data_generation()
+
+    def call_after_commit(self, callback: Callable[[], None]) -> None:
+        """Run `callback` once the current transaction is committed; a rollback drops it."""
+        if not self.in_transaction:
+            callback()
+            return
+        if self._after_commit is None:
+            self._after_commit = []
+        self._after_commit.append(callback)
+
+    def track_row_changes(self) -> None:
+        """Count changed rows per attached database, so commits only republish the files touched."""
+        self._row_changes = {MAIN_DATABASE: 0, CATALOG_DATABASE: 0}
+        self._row_changes_at_last_commit = dict(self._row_changes)
+
+    def count_row_change(self, database: str) -> None:
+        """Record one changed row in `database`; called by the temporary change triggers."""
+        self._row_changes[database] += 1
 
     def commit(self) -> None:
-        """Commit the current transaction and upload the new snapshot when needed."""
+        """Commit the current transaction and request a snapshot upload when rows changed."""
         had_transaction = self.in_transaction
         super().commit()
-        if had_transaction:
-            sync_sqlite_to_gcs(reason="commit")
+        changes = self.total_changes
+        if had_transaction and changes != self._changes_at_last_commit:
+            _bump_data_generation()
+            if self._row_changes is None:
+                request_sqlite_sync(reason="commit")
+            else:
+                for database, count in self._row_changes.items():
+                    if count != self._row_changes_at_last_commit[database]:
+                        request_sqlite_sync(reason="commit", database=database)
+        self._changes_at_last_commit = changes
+        if self._row_changes is not None:
+            self._row_changes_at_last_commit = dict(self._row_changes)
+        # Callbacks run after the generation bump, so earlier readers cannot store what they drop.
+        callbacks, self._after_commit = self._after_commit, None
+        for callback in callbacks or ():
+            callback()
+
+    def rollback(self) -> None:
+        """Roll back the current transaction; its discarded changes are never published."""
+        super().rollback()
+        self._after_commit = None
+        self._changes_at_last_commit = self.total_changes
+        if self._row_changes is not None:
+            self._row_changes_at_last_commit = dict(self._row_changes)
+
+    @property
+    def has_pending_changes(self) -> bool:
+        """Return whether the open transaction changed rows other connections cannot see yet."""
+        return self.in_transaction and self.total_changes != self._changes_at_last_commit
+
+
+class PooledSQLiteConnection(SyncedSQLiteConnection):
+    """Synced SQLite connection checked out from a pool on behalf of a unit of work."""
+
+    # Set by the pool that opened the connection and by the unit of work or writer queue holding it.
+    pool: "SQLiteConnectionPool | SQLiteWriterQueue"
+    unit: "UnitOfWork | None" = None
+    changes_at_checkout: int = 0
+    savepoint_open: bool = False
+
+    def commit(self) -> None:
+        """Commit now, or leave the transaction open until the unit of work or batch completes."""
+        unit = self.unit
+        if self.savepoint_open or (unit is not None and unit.defers_commits):
+            return
+        super().commit()
+
+    def rollback(self) -> None:
+        """Roll back, limited to the current unit's savepoint when group-committed."""
+        if self.savepoint_open:
+            self.execute(f"ROLLBACK TO SAVEPOINT {GROUP_COMMIT_SAVEPOINT}")
+            return
+        super().rollback()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """Leave a `with` block; the owning unit commits and releases at the outermost one."""
+        unit = self.unit
+        if unit is None:
+            return super().__exit__(exc_type, exc_value, traceback)
+        unit.leave(failed=exc_type is not None)
+        return False
+
+
+def _open_pooled_connection(
+    database_path: Path,
+    pool: "SQLiteConnectionPool | SQLiteWriterQueue",
+    read_only: bool = False,
+) -> PooledSQLiteConnection:
+    """Open a connection with its row factory and pragmas already applied."""
+    if read_only:
+        connection = sqlite3.connect(
+            f"{database_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+            factory=PooledSQLiteConnection,
+        )
+        connection.execute("PRAGMA query_only = ON")
+    else:
+        connection = sqlite3.connect(
+            database_path,
+            check_same_thread=False,
+            cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+            factory=PooledSQLiteConnection,
+        )
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA foreign_keys = ON")
+    if pool.catalog_path is not None:
+        _attach_catalog(
+            connection, pool.catalog_path, read_only=read_only, immutable=pool.catalog_immutable
+        )
+    connection.pool = pool
+    if _RESOURCES.statement_trace is not None:
+        connection.set_trace_callback(_RESOURCES.statement_trace)
+    return connection
+
+
+def _attach_catalog(
+    connection: PooledSQLiteConnection,
+    catalog_path: Path,
+    read_only: bool = False,
+    immutable: bool = False,
+) -> None:
+    """Attach the catalog file as `catalog`; writable connections also count changes per file."""
+    if read_only:
+        # Read-only connections are opened with URI filenames; immutable skips locking entirely.
+        options = "mode=ro&immutable=1" if immutable else "mode=ro"
+        connection.execute(
+            "ATTACH DATABASE ? AS catalog", (f"{catalog_path.resolve().as_uri()}?{options}",)
+        )
+    else:
+        connection.execute("ATTACH DATABASE ? AS catalog", (str(catalog_path),))
+    connection.execute(f"PRAGMA catalog.mmap_size = {int(SQLITE_CATALOG_MMAP_BYTES)}")
+    if read_only:
+        return
+
+    connection.track_row_changes()
+    connection.create_function("ludostock_row_changed", 1, connection.count_row_change)
+    for database, tables in ((MAIN_DATABASE, USER_DATA_TABLES), (CATALOG_DATABASE, CATALOG_TABLES)):
+        for table in tables:
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                connection.execute(
+                    f"CREATE TEMP TRIGGER row_changed_{table}_{operation.lower()} "
+                    f"AFTER {operation} ON {database}.{table} "
+                    f"BEGIN SELECT ludostock_row_changed('{database}'); END"
+                )
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of pre-configured SQLite connections for one database file."""
+
+    def __init__(
+        self,
+        database_path: Path,
+        size: int,
+        timeout_seconds: float,
+        read_only: bool = False,
+        catalog_path: Path | None = None,
+        catalog_immutable: bool = False,
+    ):
+        self.database_path = database_path
+        self.size = max(1, size)
+        self.timeout_seconds = timeout_seconds
+        self.read_only = read_only
+        self.catalog_path = catalog_path
+        self.catalog_immutable = catalog_immutable
+        self._condition = threading.Condition()
+        self._idle: list[PooledSQLiteConnection] = []
+        self._opened = 0
+        self._in_use = 0
+        self._closed = False
+        self._checkouts = 0
+        self._waited_checkouts = 0
+        self._timeouts = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def acquire(self) -> PooledSQLiteConnection:
+        """Check out an idle connection, opening one while the pool is below its size."""
+        started_at = time.perf_counter()
+        deadline = started_at + self.timeout_seconds
+        must_open = False
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise sqlite3.OperationalError("SQLite connection pool is closed")
+                if self._idle:
+                    connection = self._idle.pop()
+                    break
+                if self._opened < self.size:
+                    self._opened += 1
+                    must_open = True
+                    break
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    logger.error(
+                        "sqlite.pool_checkout_timeout local_path=%s size=%s in_use=%s "
+                        "timeout_seconds=%s",
+                        self.database_path,
+                        self.size,
+                        self._in_use,
+                        self.timeout_seconds,
+                    )
+                    raise sqlite3.OperationalError(
+                        "Timed out waiting for a pooled SQLite connection"
+                    )
+                self._condition.wait(remaining)
+            self._in_use += 1
+
+        if must_open:
+            try:
+                connection = _open_pooled_connection(
+                    self.database_path, self, read_only=self.read_only
+                )
+            except Exception:
+                with self._condition:
+                    self._opened -= 1
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+
+        waited_seconds = time.perf_counter() - started_at
+        with self._condition:
+            self._checkouts += 1
+            self._total_wait_seconds += waited_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, waited_seconds)
+            if waited_seconds >= POOL_CHECKOUT_WARNING_SECONDS:
+                self._waited_checkouts += 1
+                in_use = self._in_use
+            else:
+                in_use = None
+
+        if in_use is not None:
+            logger.warning(
+                "sqlite.pool_checkout_waited wait_ms=%.1f local_path=%s size=%s in_use=%s",
+                waited_seconds * 1000,
+                self.database_path,
+                self.size,
+                in_use,
+            )
+        return connection
+
+    def release(self, connection: PooledSQLiteConnection) -> None:
+        """Return a connection to the pool, discarding it when the pool has been closed."""
+        if connection.in_transaction:
+            connection.rollback()
+
+        with self._condition:
+            self._in_use -= 1
+            if self._closed:
+                self._opened -= 1
+                connection.close()
+            else:
+                self._idle.append(connection)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Close idle connections now and in-use connections when they are released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._condition.notify_all()
+
+        for connection in idle:
+            connection.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Return occupancy and checkout wait statistics for the pool."""
+        with self._condition:
+            return {
+                "local_path": str(self.database_path),
+                "read_only": self.read_only,
+                "size": self.size,
+                "open": self._opened,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "waited_checkouts": self._waited_checkouts,
+                "timeouts": self._timeouts,
+                "wait_ms_total": round(self._total_wait_seconds * 1000, 3),
+                "wait_ms_max": round(self._max_wait_seconds * 1000, 3),
+                "wait_ms_avg": (
+                    round(self._total_wait_seconds * 1000 / self._checkouts, 3)
+                    if self._checkouts
+                    else 0.0
+                ),
+            }
+
+
+class _CommitBatch:
+    """Units of work whose writes share one group-commit transaction on the writer connection."""
+
+    def __init__(self):
+        self.opened_at = time.perf_counter()
+        self.members = 0
+        self.error: BaseException | None = None
+        self.durable = threading.Event()
+
+    def wait(self) -> None:
+        """Block until the batch is committed, re-raising the commit error when it failed."""
+        self.durable.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class SQLiteWriterQueue:
+    """Single dedicated writer connection handed out to callers in arrival order.
+
+    Used in WAL storage mode: every write goes through this connection while readers use the
+    read-only pool, so catalog reads never wait behind a write transaction.
+
+    With a group-commit window, consecutive units of work share one transaction: each unit
+    runs inside its own savepoint, so a failing unit only rolls back its own writes, and the
+    batch is committed (one fsync, one snapshot sync) when the window elapses or the batch is
+    full. Units that wrote, or read after other units' writes, wait for that commit before
+    returning.
+    """
+
+    def __init__(
+        self,
+        database_path: Path,
+        timeout_seconds: float,
+        group_commit_window_seconds: float = 0.0,
+        group_commit_max_batch: int = 64,
+        catalog_path: Path | None = None,
+    ):
+        self.database_path = database_path
+        self.timeout_seconds = timeout_seconds
+        self.catalog_path = catalog_path
+        self.catalog_immutable = False
+        self.group_commit_window_seconds = max(0.0, group_commit_window_seconds)
+        self.group_commit_max_batch = max(1, group_commit_max_batch)
+        self._batch: _CommitBatch | None = None
+        self._batches = 0
+        self._batched_units = 0
+        self._max_batch_size = 0
+        self._condition = threading.Condition()
+        self._waiting: deque[object] = deque()
+        self._busy = False
+        self._closed = False
+        self._acquisitions = 0
+        self._waited_acquisitions = 0
+        self._timeouts = 0
+        self._max_queue_depth = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._connection = _open_pooled_connection(database_path, self)
+        # WAL only needs the WAL file to reach disk at checkpoints to stay durable across
+        # application crashes, which keeps each commit to a single write.
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+
+    def acquire(self) -> PooledSQLiteConnection:
+        """Wait for every earlier caller to finish, then take the writer connection."""
+        started_at = time.perf_counter()
+        deadline = started_at + self.timeout_seconds
+        ticket = object()
+
+        with self._condition:
+            if self._closed:
+                raise sqlite3.OperationalError("SQLite writer queue is closed")
+            self._waiting.append(ticket)
+            queue_depth = len(self._waiting) - (0 if self._busy else 1)
+            self._max_queue_depth = max(self._max_queue_depth, queue_depth)
+
+            while self._busy or self._waiting[0] is not ticket:
+                remaining = deadline - time.perf_counter()
+                if self._closed or remaining <= 0:
+                    self._waiting.remove(ticket)
+                    self._condition.notify_all()
+                    if self._closed:
+                        raise sqlite3.OperationalError("SQLite writer queue is closed")
+                    self._timeouts += 1
+                    logger.error(
+                        "sqlite.writer_queue_timeout local_path=%s queue_depth=%s "
+                        "timeout_seconds=%s",
+                        self.database_path,
+                        len(self._waiting),
+                        self.timeout_seconds,
+                    )
+                    raise sqlite3.OperationalError(
+                        "Timed out waiting for the SQLite writer connection"
+                    )
+                self._condition.wait(remaining)
+
+            self._waiting.popleft()
+            self._busy = True
+            waited_seconds = time.perf_counter() - started_at
+            self._acquisitions += 1
+            self._total_wait_seconds += waited_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, waited_seconds)
+            if waited_seconds >= POOL_CHECKOUT_WARNING_SECONDS:
+                self._waited_acquisitions += 1
+            remaining_depth = len(self._waiting)
+
+        if waited_seconds >= POOL_CHECKOUT_WARNING_SECONDS:
+            logger.warning(
+                "sqlite.writer_queue_waited wait_ms=%.1f local_path=%s "
+                "queue_depth_on_arrival=%s queue_depth=%s",
+                waited_seconds * 1000,
+                self.database_path,
+                queue_depth,
+                remaining_depth,
+            )
+        return self._connection
+
+    @property
+    def groups_commits(self) -> bool:
+        """Return whether units of work are group-committed."""
+        return self.group_commit_window_seconds > 0
+
+    def begin_unit(self, connection: PooledSQLiteConnection, immediate: bool) -> None:
+        """Start a unit's work on the writer connection its caller just acquired."""
+        if not self.groups_commits:
+            if immediate:
+                connection.begin(immediate=True)
+            return
+
+        if self._batch is None:
+            connection.begin(immediate=True)
+            batch = self._batch = _CommitBatch()
+            timer = threading.Timer(
+                self.group_commit_window_seconds, self._flush_batch, args=(batch,)
+            )
+            timer.daemon = True
+            timer.start()
+        connection.execute(f"SAVEPOINT {GROUP_COMMIT_SAVEPOINT}")
+        connection.savepoint_open = True
+
+    def join_batch(self, connection: PooledSQLiteConnection) -> _CommitBatch | None:
+        """Keep a unit's writes in the open batch and return the batch it must wait for."""
+        connection.execute(f"RELEASE SAVEPOINT {GROUP_COMMIT_SAVEPOINT}")
+        connection.savepoint_open = False
+        batch = self._batch
+        if batch is None:
+            return None
+        if connection.total_changes == connection.changes_at_checkout:
+            # A read-only unit may have read earlier units' uncommitted writes, so it waits for
+            # their outcome too, without counting as a member of the batch.
+            return batch if batch.members else None
+
+        batch.members += 1
+        if batch.members >= self.group_commit_max_batch:
+            self._commit_batch(connection)
+        return batch
+
+    def rollback_unit(self, connection: PooledSQLiteConnection) -> None:
+        """Undo a unit's writes without touching the other units of the open batch."""
+        if not connection.savepoint_open:
+            connection.rollback()
+            return
+        connection.execute(f"ROLLBACK TO SAVEPOINT {GROUP_COMMIT_SAVEPOINT}")
+        connection.execute(f"RELEASE SAVEPOINT {GROUP_COMMIT_SAVEPOINT}")
+        connection.savepoint_open = False
+
+    def _commit_batch(self, connection: PooledSQLiteConnection) -> None:
+        """Commit the open batch once and wake every unit waiting for it."""
+        batch, self._batch = self._batch, None
+        if batch is None:
+            return
+
+        try:
+            if batch.members:
+                connection.commit()
+            else:
+                sqlite3.Connection.commit(connection)
+        except Exception as exc:
+            batch.error = exc
+            logger.exception(
+                "sqlite.group_commit_failed local_path=%s members=%s",
+                self.database_path,
+                batch.members,
+            )
+            sqlite3.Connection.rollback(connection)
+        finally:
+            self._batches += 1
+            self._batched_units += batch.members
+            self._max_batch_size = max(self._max_batch_size, batch.members)
+            batch.durable.set()
+
+    def _flush_batch(self, batch: _CommitBatch) -> None:
+        """Commit a batch once its group-commit window has elapsed."""
+        try:
+            connection = self.acquire()
+        except sqlite3.OperationalError:
+            # A closed queue flushes its open batch itself.
+            return
+        try:
+            if self._batch is batch:
+                self._commit_batch(connection)
+        finally:
+            self.release(connection)
+
+    def release(self, connection: PooledSQLiteConnection) -> None:
+        """Hand the writer connection to the next caller in the queue."""
+        if connection.savepoint_open:
+            self.rollback_unit(connection)
+        elif connection.in_transaction and self._batch is None:
+            connection.rollback()
+
+        with self._condition:
+            self._busy = False
+            closed = self._closed
+            if not closed:
+                self._condition.notify_all()
+
+        if closed:
+            self._commit_batch(connection)
+            connection.close()
+            with self._condition:
+                self._condition.notify_all()
+
+    def close(self) -> None:
+        """Close the writer connection now, or when its current holder releases it."""
+        with self._condition:
+            self._closed = True
+            busy = self._busy
+            self._condition.notify_all()
+
+        if not busy:
+            self._commit_batch(self._connection)
+            self._connection.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Return writer queue depth, queue wait and group-commit statistics."""
+        with self._condition:
+            return {
+                "busy": self._busy,
+                "group_commit_window_ms": round(self.group_commit_window_seconds * 1000, 3),
+                "batches": self._batches,
+                "batched_units": self._batched_units,
+                "max_batch_size": self._max_batch_size,
+                "queue_depth": len(self._waiting),
+                "max_queue_depth": self._max_queue_depth,
+                "acquisitions": self._acquisitions,
+                "waited_acquisitions": self._waited_acquisitions,
+                "timeouts": self._timeouts,
+                "wait_ms_total": round(self._total_wait_seconds * 1000, 3),
+                "wait_ms_max": round(self._max_wait_seconds * 1000, 3),
+                "wait_ms_avg": (
+                    round(self._total_wait_seconds * 1000 / self._acquisitions, 3)
+                    if self._acquisitions
+                    else 0.0
+                ),
+            }
 
 
 def _database_path() -> Path:
@@ -165,14 +1024,106 @@ def _database_path() -> Path:
     return Path(SQLITE_PATH)
 
 
+def _catalog_split_enabled() -> bool:
+    """Return whether the catalog tables live in their own file, attached as `catalog`."""
+    return bool(SQLITE_CATALOG_PATH)
+
+
+def _database_file(database: str = MAIN_DATABASE) -> Path:
+    """Return the local file of the user-data database or of the separate catalog."""
+    return Path(SQLITE_CATALOG_PATH) if database == CATALOG_DATABASE else _database_path()
+
+
+def _synced_databases() -> tuple[str, ...]:
+    """Return the databases published as separate snapshots."""
+    return (MAIN_DATABASE, CATALOG_DATABASE) if _catalog_split_enabled() else (MAIN_DATABASE,)
+
+
+def _database_tables(database: str = MAIN_DATABASE) -> tuple[str, ...]:
+    """Return the application tables stored in one database file."""
+    if not _catalog_split_enabled():
+        return CHANGE_LOGGED_TABLES
+    return CATALOG_TABLES if database == CATALOG_DATABASE else USER_DATA_TABLES
+
+
+def _schema_statements(database: str = MAIN_DATABASE) -> list[str]:
+    """Return the CREATE TABLE statements of one database file.
+
+    Foreign keys cannot cross database files, so split user-data tables drop their references
+    to catalog tables; crud checks those references instead.
+    """
+    tables = _database_tables(database)
+    statements = [
+        statement
+        for statement in SCHEMA_STATEMENTS
+        if _CREATE_TABLE_NAME.search(statement).group(1) in tables
+    ]
+    if database == MAIN_DATABASE and _catalog_split_enabled():
+        statements = [_CATALOG_REFERENCE.sub("", statement) for statement in statements]
+    return statements
+
+
+def _remote_generation(database: str = MAIN_DATABASE) -> int | None:
+    """Return the remote snapshot generation the local database was last synced with."""
+    return _REMOTE_GENERATIONS.get(database)
+
+
+def _set_remote_generation(database: str, generation: int | None) -> None:
+    """Remember the remote snapshot generation of a database."""
+    _REMOTE_GENERATIONS[database] = generation
+
+
+def _has_unsynced_changes(database: str = MAIN_DATABASE) -> bool:
+    """Return whether the last sync of a database failed and left changes unpublished."""
+    return database in _UNSYNCED_DATABASES
+
+
+def _set_unsynced_changes(database: str, unsynced: bool) -> None:
+    """Record whether a database still has changes waiting to be published."""
+    if unsynced:
+        _UNSYNCED_DATABASES.add(database)
+    else:
+        _UNSYNCED_DATABASES.discard(database)
+
+
 def _sqlite_gcs_sync_enabled() -> bool:
     """Return whether SQLite snapshot sync to Google Cloud Storage is enabled."""
     return bool(SQLITE_GCS_BUCKET and SQLITE_GCS_OBJECT)
 
 
-def _temporary_database_copy_path(label: str) -> Path:
+def _snapshot_store_enabled() -> bool:
+    """Return whether snapshots are published to GCS or to a local directory standing in for it."""
+    return bool(SQLITE_STORAGE_DIR) or _sqlite_gcs_sync_enabled()
+
+
+def _page_replication_enabled() -> bool:
+    """Return whether the database is replicated as base snapshots plus page segments."""
+    if SQLITE_REPLICATION_MODE.strip().lower() != "pages":
+        return False
+    return _snapshot_store_enabled()
+
+
+def _remote_sync_enabled() -> bool:
+    """Return whether commits are published to a remote copy of the database."""
+    return _snapshot_store_enabled()
+
+
+def _replica_mode_enabled() -> bool:
+    """Return whether this instance is a read replica following the primary's snapshots."""
+    return SQLITE_INSTANCE_ROLE.strip().lower() == "replica"
+
+
+def _change_log_enabled(database: str = MAIN_DATABASE) -> bool:
+    """Return whether committed rows are logged so they can be replayed after an upload conflict."""
+    if not _snapshot_store_enabled() or _replica_mode_enabled():
+        return False
+    # The catalog is always published as whole snapshots, even in page replication mode.
+    return database == CATALOG_DATABASE or not _page_replication_enabled()
+
+
+def _temporary_database_copy_path(label: str, database: str = MAIN_DATABASE) -> Path:
     """Return a temporary path stored next to the live SQLite file."""
-    database_path = _database_path()
+    database_path = _database_file(database)
     database_path.parent.mkdir(parents=True, exist_ok=True)
     with NamedTemporaryFile(
         delete=False,
@@ -191,20 +1142,99 @@ def _get_storage_client_and_exceptions():
     return storage.Client, NotFound, PreconditionFailed
 
 
-def _read_blob_generation(blob: Any, not_found_exception: type[Exception]) -> int | None:
-    """Return the current GCS object generation when the snapshot exists."""
+def _get_storage_bucket() -> tuple[Any, type[Exception], type[Exception]]:
+    """Return the process-wide handle of the snapshot bucket and its storage exceptions."""
+    client_class, not_found_exception, precondition_failed_exception = _get_storage_client_and_exceptions()
+    with _STORAGE_LOCK:
+        cached = _RESOURCES.storage_bucket
+        if cached is None or cached[0] is not client_class or cached[1] != SQLITE_GCS_BUCKET:
+            # A single client keeps its authorized HTTP session and pooled connections across syncs.
+            cached = (client_class, SQLITE_GCS_BUCKET, client_class().bucket(SQLITE_GCS_BUCKET))
+            _RESOURCES.storage_bucket = cached
+    return cached[2], not_found_exception, precondition_failed_exception
+
+
+def _snapshot_object_name(database: str = MAIN_DATABASE) -> str:
+    """Return the name of a database's snapshot object in the configured store."""
+    object_name = SQLITE_GCS_OBJECT or DEFAULT_SNAPSHOT_OBJECT
+    if database != CATALOG_DATABASE:
+        return object_name
+    if SQLITE_CATALOG_GCS_OBJECT:
+        return SQLITE_CATALOG_GCS_OBJECT
+    base, dot, extension = object_name.rpartition(".")
+    return f"{base}.catalog.{extension}" if dot else f"{object_name}.catalog"
+
+
+def _get_snapshot_store(database: str = MAIN_DATABASE) -> SnapshotStore:
+    """Return the local-directory store when configured, else the GCS snapshot store."""
+    object_name = _snapshot_object_name(database)
+    download_options = {
+        "parallelism": SQLITE_DOWNLOAD_PARALLELISM,
+        "chunk_bytes": SQLITE_DOWNLOAD_CHUNK_BYTES,
+    }
+    if SQLITE_STORAGE_DIR:
+        key = (
+            SQLITE_STORAGE_DIR,
+            object_name,
+            SQLITE_STORAGE_LATENCY_MS,
+            *download_options.values(),
+        )
+        with _STORAGE_LOCK:
+            cached = _LOCAL_SNAPSHOT_STORES.get(database)
+            if cached is None or cached[0] != key:
+                # Cached so that concurrent conditional puts share the store's lock.
+                cached = _LOCAL_SNAPSHOT_STORES[database] = (
+                    key,
+                    LocalDirectorySnapshotStore(
+                        Path(SQLITE_STORAGE_DIR),
+                        object_name,
+                        latency_seconds=SQLITE_STORAGE_LATENCY_MS / 1000,
+                        **download_options,
+                    ),
+                )
+            return cached[1]
+
+    bucket, not_found_exception, precondition_failed_exception = _get_storage_bucket()
+    return GCSSnapshotStore(
+        bucket,
+        object_name,
+        not_found_exception,
+        precondition_failed_exception,
+        **download_options,
+    )
+
+
+def _get_replica_store() -> ReplicaStore:
+    """Return the store holding page replication objects, next to the snapshot object."""
+    prefix = f"{_snapshot_object_name()}.replica"
+    if SQLITE_STORAGE_DIR:
+        return LocalDirectoryReplicaStore(
+            Path(SQLITE_STORAGE_DIR) / prefix,
+            latency_seconds=SQLITE_STORAGE_LATENCY_MS / 1000,
+        )
+
+    bucket, _, precondition_failed_exception = _get_storage_bucket()
+    return GCSReplicaStore(bucket, f"{prefix}/", precondition_failed_exception)
+
+
+@contextmanager
+def _timed(timings: dict[str, float], key: str) -> Iterator[None]:
+    """Add the duration of the enclosed block, in milliseconds, to `timings[key]`."""
+    started = time.perf_counter()
     try:
-        blob.reload()
-    except not_found_exception:
-        return None
+        yield
+    finally:
+        timings[key] = timings.get(key, 0.0) + (time.perf_counter() - started) * 1000
+
 
-    generation = getattr(blob, "generation", None)
-    return int(generation) if generation is not None else None
+def _format_timings(timings: dict[str, float]) -> str:
+    """Return sync timings as `key=value` log fields."""
+    return " ".join(f"{key}={value:.1f}" for key, value in timings.items())
 
 
-def _create_database_snapshot(snapshot_path: Path) -> None:
-    """Create a consistent copy of the live SQLite database using SQLite backup."""
-    source = sqlite3.connect(_database_path(), check_same_thread=False)
+def _create_database_snapshot(snapshot_path: Path, database: str = MAIN_DATABASE) -> int:
+    """Copy the live SQLite database with SQLite backup; return its change-log watermark."""
+    source = sqlite3.connect(_database_file(database), check_same_thread=False)
     target = sqlite3.connect(snapshot_path, check_same_thread=False)
     try:
         source.backup(target)
@@ -212,87 +1242,384 @@ def _create_database_snapshot(snapshot_path: Path) -> None:
     finally:
         target.close()
         source.close()
+    return strip_change_log(snapshot_path) if _change_log_enabled(database) else 0
 
 
-def _download_database_from_gcs() -> bool:
-    """Download the latest SQLite snapshot from GCS when it exists."""
-    global _REMOTE_GENERATION
+def _compressed_snapshots_enabled() -> bool:
+    """Return whether snapshots are uploaded compacted and gzip-compressed."""
+    return SQLITE_SNAPSHOT_FORMAT.strip().lower() == "gzip"
 
-    if not _sqlite_gcs_sync_enabled():
-        return False
 
-    client_class, not_found_exception, _ = _get_storage_client_and_exceptions()
-    blob = client_class().bucket(SQLITE_GCS_BUCKET).blob(SQLITE_GCS_OBJECT)
-    generation = _read_blob_generation(blob, not_found_exception)
+def _create_compressed_snapshot(snapshot_path: Path, database: str = MAIN_DATABASE) -> int:
+    """Write a compacted gzip copy of the live database after its SHA-256; return its watermark."""
+    compact_path = _temporary_database_copy_path("compact", database)
+    compact_path.unlink()
+    source = sqlite3.connect(_database_file(database), check_same_thread=False)
+    try:
+        # VACUUM INTO drops free pages and defragments, unlike a page-for-page backup.
+        source.execute("VACUUM INTO ?", (str(compact_path),))
+    finally:
+        source.close()
+    # Published snapshots never carry a writer's change log; it only describes unsynced local rows.
+    watermark = strip_change_log(compact_path) if _change_log_enabled(database) else 0
+
+    digest = hashlib.sha256()
+    try:
+        with compact_path.open("rb") as compact, snapshot_path.open("wb") as target:
+            target.write(SNAPSHOT_MAGIC)
+            target.write(bytes(digest.digest_size))
+            with gzip.GzipFile(fileobj=target, mode="wb", compresslevel=6, mtime=0) as compressed:
+                while chunk := compact.read(SNAPSHOT_CHUNK_SIZE):
+                    digest.update(chunk)
+                    compressed.write(chunk)
+            target.seek(len(SNAPSHOT_MAGIC))
+            target.write(digest.digest())
+    finally:
+        compact_path.unlink(missing_ok=True)
+    return watermark
+
+
+def _replace_database_file(source_path: Path, target_path: Path) -> None:
+    """Move a complete database file over `target_path`, removing the replaced file's journals.
+
+    A leftover WAL or hot rollback journal would otherwise be replayed onto the new file.
+    """
+    for suffix in ("-wal", "-shm", "-journal"):
+        target_path.with_name(f"{target_path.name}{suffix}").unlink(missing_ok=True)
+    target_path.unlink(missing_ok=True)
+    source_path.replace(target_path)
+
+
+def _restore_snapshot_file(
+    snapshot_path: Path, target_path: Path, database: str = MAIN_DATABASE
+) -> str:
+    """Move a downloaded snapshot to the target, unpacking the gzip format; return the format."""
+    with snapshot_path.open("rb") as source:
+        magic = source.read(len(SNAPSHOT_MAGIC))
+        if magic != SNAPSHOT_MAGIC:
+            # Raw SQLite files predate compressed snapshots and are used as-is.
+            _replace_database_file(snapshot_path, target_path)
+            return "raw"
+
+        expected_digest = source.read(hashlib.sha256().digest_size)
+        digest = hashlib.sha256()
+        decoded_path = _temporary_database_copy_path("decode", database)
+        try:
+            with gzip.GzipFile(fileobj=source, mode="rb") as compressed:
+                with decoded_path.open("wb") as target:
+                    while chunk := compressed.read(SNAPSHOT_CHUNK_SIZE):
+                        digest.update(chunk)
+                        target.write(chunk)
+            if digest.digest() != expected_digest:
+                raise ValueError(f"Snapshot checksum mismatch for {snapshot_path}")
+            _replace_database_file(decoded_path, target_path)
+        finally:
+            decoded_path.unlink(missing_ok=True)
+    return "gzip"
+
+
+def _sync_state_path(database: str = MAIN_DATABASE) -> Path:
+    """Return the sidecar file recording which remote generation the local database matches."""
+    database_path = _database_file(database)
+    return database_path.with_name(f"{database_path.name}.sync.json")
+
+
+def _file_signature(path: Path) -> dict[str, int]:
+    """Return the size and modification time identifying a local file version."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _record_synced_generation(
+    generation: int | None, signature: dict[str, int], database: str = MAIN_DATABASE
+) -> None:
+    """Remember that the local file with this signature matches a remote generation."""
+    state_path = _sync_state_path(database)
     if generation is None:
-        logger.info(
-            "sqlite.remote_snapshot_missing bucket=%s object=%s local_path=%s",
-            SQLITE_GCS_BUCKET,
-            SQLITE_GCS_OBJECT,
-            _database_path(),
-        )
+        state_path.unlink(missing_ok=True)
+        return
+    state_path.write_text(json.dumps({"generation": generation, **signature}), encoding="utf-8")
+
+
+def _local_synced_generation(database: str = MAIN_DATABASE) -> int | None:
+    """Return the remote generation the unchanged local file matches, according to its sidecar."""
+    database_path = _database_file(database)
+    wal_path = database_path.with_name(f"{database_path.name}-wal")
+    if not database_path.exists() or (wal_path.exists() and wal_path.stat().st_size > 0):
+        return None
+    try:
+        state = json.loads(_sync_state_path(database).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    recorded_signature = {"size": state.get("size"), "mtime_ns": state.get("mtime_ns")}
+    if recorded_signature != _file_signature(database_path):
+        return None
+    return int(state["generation"])
+
+
+def _local_database_matches_remote(database: str = MAIN_DATABASE) -> bool:
+    """Return whether the local file is still the current remote generation, needing no download."""
+    if not _snapshot_store_enabled():
+        return False
+    local_generation = _local_synced_generation(database)
+    if local_generation is None:
+        return False
+    if _get_snapshot_store(database).get_generation() != local_generation:
+        return False
+
+    _set_remote_generation(database, local_generation)
+    logger.info(
+        "sqlite.remote_snapshot_download_skipped reason=matches_remote_generation "
+        "generation=%s local_path=%s",
+        local_generation,
+        _database_file(database),
+    )
+    return True
+
+
+def _download_database_from_gcs(database: str = MAIN_DATABASE) -> bool:
+    """Download the latest SQLite snapshot from the snapshot store when it exists."""
+    if not _snapshot_store_enabled():
         return False
 
-    temporary_path = _temporary_database_copy_path("download")
+    store = _get_snapshot_store(database)
+    timings: dict[str, float] = {}
+    temporary_path = _temporary_database_copy_path("download", database)
     try:
-        blob.download_to_filename(temporary_path)
-        temporary_path.replace(_database_path())
+        with _timed(timings, "download_ms"):
+            generation = store.download(temporary_path)
+        if generation is None:
+            logger.info(
+                "sqlite.remote_snapshot_missing bucket=%s object=%s local_path=%s",
+                SQLITE_GCS_BUCKET or SQLITE_STORAGE_DIR,
+                _snapshot_object_name(database),
+                _database_file(database),
+            )
+            return False
+        downloaded_bytes = temporary_path.stat().st_size
+        with _timed(timings, "restore_ms"):
+            snapshot_format = _restore_snapshot_file(
+                temporary_path, _database_file(database), database
+            )
     finally:
         temporary_path.unlink(missing_ok=True)
 
-    _REMOTE_GENERATION = generation
+    _set_remote_generation(database, generation)
     logger.info(
-        "sqlite.remote_snapshot_downloaded bucket=%s object=%s generation=%s local_path=%s",
-        SQLITE_GCS_BUCKET,
-        SQLITE_GCS_OBJECT,
+        "sqlite.remote_snapshot_downloaded bucket=%s object=%s generation=%s format=%s "
+        "bytes=%s local_path=%s %s",
+        SQLITE_GCS_BUCKET or SQLITE_STORAGE_DIR,
+        _snapshot_object_name(database),
         generation,
-        _database_path(),
+        snapshot_format,
+        downloaded_bytes,
+        _database_file(database),
+        _format_timings(timings),
     )
     return True
 
 
-def _upload_database_to_gcs(reason: str) -> bool:
-    """Upload a consistent SQLite snapshot to GCS using optimistic concurrency."""
-    global _REMOTE_GENERATION
+def _rebase_on_remote_snapshot(
+    store: SnapshotStore, timings: dict[str, float], database: str = MAIN_DATABASE
+) -> int | None:
+    """Download the newer remote snapshot, replay the change log on it; return its generation."""
+    download_path = _temporary_database_copy_path("rebase-download", database)
+    remote_path = _temporary_database_copy_path("rebase", database)
+    try:
+        with _timed(timings, "download_ms"):
+            generation = store.download(download_path)
+        if generation is None:
+            return None
+        _restore_snapshot_file(download_path, remote_path, database)
+
+        connection = sqlite3.connect(
+            _database_file(database),
+            timeout=SQLITE_POOL_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            with _timed(timings, "rebase_ms"):
+                stats = rebase_onto_snapshot(connection, remote_path, _database_tables(database))
+            _bump_data_generation(storage=True)
+        finally:
+            connection.close()
+    finally:
+        download_path.unlink(missing_ok=True)
+        remote_path.unlink(missing_ok=True)
+
+    logger.warning(
+        "sqlite.change_log_rebased generation=%s %s local_path=%s",
+        generation,
+        " ".join(f"{key}={value}" for key, value in stats.items()),
+        _database_file(database),
+    )
+    return generation
+
+
+def _trim_published_changes(watermark: int, database: str = MAIN_DATABASE) -> bool:
+    """Forget the change-log entries in an uploaded snapshot; return whether none remain."""
+    connection = sqlite3.connect(
+        _database_file(database), timeout=SQLITE_POOL_TIMEOUT_SECONDS, check_same_thread=False
+    )
+    try:
+        remaining = trim_change_log(connection, watermark)
+        connection.commit()
+    finally:
+        connection.close()
+    return remaining == 0
 
-    if not _sqlite_gcs_sync_enabled() or not _database_path().exists():
+
+def _upload_database_to_gcs(reason: str, database: str = MAIN_DATABASE) -> bool:
+    """Upload a consistent SQLite snapshot to the snapshot store using optimistic concurrency.
+
+    When another writer published first, the newer snapshot is downloaded, the local change log
+    is replayed on top of it and the upload is retried, up to `CHANGE_LOG_MAX_REBASES` times.
+    """
+    database_path = _database_file(database)
+    if not _snapshot_store_enabled() or not database_path.exists():
         return False
 
-    client_class, not_found_exception, precondition_failed_exception = _get_storage_client_and_exceptions()
-    blob = client_class().bucket(SQLITE_GCS_BUCKET).blob(SQLITE_GCS_OBJECT)
-    expected_generation = _REMOTE_GENERATION
+    store = _get_snapshot_store(database)
+    timings: dict[str, float] = {}
+    expected_generation = _remote_generation(database)
     if expected_generation is None:
-        expected_generation = _read_blob_generation(blob, not_found_exception)
+        with _timed(timings, "metadata_ms"):
+            expected_generation = store.get_generation()
 
-    temporary_path = _temporary_database_copy_path("upload")
-    try:
-        _create_database_snapshot(temporary_path)
-        blob.upload_from_filename(
-            temporary_path,
-            if_generation_match=expected_generation if expected_generation is not None else 0,
+    snapshot_format = "gzip" if _compressed_snapshots_enabled() else "raw"
+    rebases = 0
+    while True:
+        temporary_path = _temporary_database_copy_path("upload", database)
+        signature = _file_signature(database_path)
+        try:
+            with _timed(timings, "snapshot_ms"):
+                if snapshot_format == "gzip":
+                    watermark = _create_compressed_snapshot(temporary_path, database)
+                else:
+                    watermark = _create_database_snapshot(temporary_path, database)
+            uploaded_bytes = temporary_path.stat().st_size
+            with _timed(timings, "upload_ms"):
+                generation = store.put(
+                    temporary_path,
+                    if_generation_match=expected_generation if expected_generation is not None else 0,
+                )
+            _set_remote_generation(database, generation)
+            break
+        except StorageConflict:
+            if _change_log_enabled(database) and rebases < CHANGE_LOG_MAX_REBASES:
+                rebases += 1
+                rebased_generation = _rebase_on_remote_snapshot(store, timings, database)
+                if rebased_generation is not None:
+                    expected_generation = rebased_generation
+                    continue
+            with _timed(timings, "metadata_ms"):
+                generation = store.get_generation()
+            _set_remote_generation(database, generation)
+            logger.error(
+                "sqlite.remote_snapshot_conflict reason=%s bucket=%s object=%s local_path=%s "
+                "expected_generation=%s remote_generation=%s rebases=%s %s",
+                reason,
+                SQLITE_GCS_BUCKET or SQLITE_STORAGE_DIR,
+                _snapshot_object_name(database),
+                database_path,
+                expected_generation if expected_generation is not None else 0,
+                generation if generation is not None else "-",
+                rebases,
+                _format_timings(timings),
+            )
+            return False
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+    if watermark and _trim_published_changes(watermark, database):
+        # Trimming rewrote the file; with nothing left to replay it matches the upload again.
+        signature = _file_signature(database_path)
+    _record_synced_generation(generation, signature, database)
+    logger.info(
+        "sqlite.remote_snapshot_uploaded reason=%s bucket=%s object=%s generation=%s format=%s "
+        "bytes=%s rebases=%s local_path=%s %s",
+        reason,
+        SQLITE_GCS_BUCKET or SQLITE_STORAGE_DIR,
+        _snapshot_object_name(database),
+        generation if generation is not None else "-",
+        snapshot_format,
+        uploaded_bytes,
+        rebases,
+        database_path,
+        _format_timings(timings),
+    )
+    return True
+
+
+def _get_page_replicator() -> PageReplicator:
+    """Return the process-wide page replicator bound to the configured replica store."""
+    if _RESOURCES.page_replicator is None:
+        _RESOURCES.page_replicator = PageReplicator(
+            _get_replica_store(), SQLITE_REPLICATION_BASE_INTERVAL
         )
-        _REMOTE_GENERATION = _read_blob_generation(blob, not_found_exception)
-    except precondition_failed_exception:
-        _REMOTE_GENERATION = _read_blob_generation(blob, not_found_exception)
+    return _RESOURCES.page_replicator
+
+
+def _restore_database_from_replica() -> bool:
+    """Rebuild the local database from the latest replica base and its page segments."""
+    target_path = _temporary_database_copy_path("restore")
+    segment_path = _temporary_database_copy_path("segment")
+    try:
+        restored = _get_page_replicator().restore(target_path, segment_path)
+        if restored is None:
+            logger.info("sqlite.replica_missing local_path=%s", _database_path())
+            return False
+        _replace_database_file(target_path, _database_path())
+    finally:
+        target_path.unlink(missing_ok=True)
+        segment_path.unlink(missing_ok=True)
+
+    logger.info(
+        "sqlite.replica_restored base=%s segments=%s local_path=%s",
+        restored["base"],
+        restored["segments"],
+        _database_path(),
+    )
+    return True
+
+
+def _replicate_database_pages(reason: str) -> bool:
+    """Publish the pages changed since the last replication, or a new base snapshot."""
+    if not _database_path().exists():
+        return False
+
+    replicator = _get_page_replicator()
+    snapshot_path = _temporary_database_copy_path("replica")
+    segment_path = _temporary_database_copy_path("segment")
+    try:
+        _create_database_snapshot(snapshot_path)
+        published = replicator.publish(snapshot_path, segment_path)
+    except StorageConflict as exc:
+        # Another writer published this name first; start over from a fresh base.
+        replicator.reset()
         logger.error(
-            "sqlite.remote_snapshot_conflict reason=%s bucket=%s object=%s local_path=%s expected_generation=%s remote_generation=%s",
+            "sqlite.replica_conflict reason=%s object=%s local_path=%s",
             reason,
-            SQLITE_GCS_BUCKET,
-            SQLITE_GCS_OBJECT,
+            exc,
             _database_path(),
-            expected_generation if expected_generation is not None else 0,
-            _REMOTE_GENERATION if _REMOTE_GENERATION is not None else "-",
         )
         return False
     finally:
-        temporary_path.unlink(missing_ok=True)
+        snapshot_path.unlink(missing_ok=True)
+        segment_path.unlink(missing_ok=True)
+
+    if published is None:
+        logger.info("sqlite.replica_unchanged reason=%s local_path=%s", reason, _database_path())
+        return True
 
     logger.info(
-        "sqlite.remote_snapshot_uploaded reason=%s bucket=%s object=%s generation=%s local_path=%s",
+        "sqlite.replica_%s_uploaded reason=%s object=%s pages=%s bytes=%s local_path=%s",
+        published["kind"],
         reason,
-        SQLITE_GCS_BUCKET,
-        SQLITE_GCS_OBJECT,
-        _REMOTE_GENERATION if _REMOTE_GENERATION is not None else "-",
+        published["name"],
+        published["pages"],
+        published["bytes"],
         _database_path(),
     )
     return True
@@ -304,50 +1631,525 @@ def _table_has_column(connection: sqlite3.Connection, table: str, column: str) -
     return any(row[1] == column for row in rows)
 
 
-def _ensure_schema_migrations(connection: sqlite3.Connection) -> None:
-    """Apply lightweight SQLite migrations required by newer app versions."""
-    if not _table_has_column(connection, "collections", "share_token"):
-        connection.execute("ALTER TABLE collections ADD COLUMN share_token TEXT")
+def _ensure_indexes(connection: sqlite3.Connection) -> None:
+    """Build the index versions newer than the file's user_version, skipping tables elsewhere."""
+    current_version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if current_version >= INDEX_VERSION:
+        return
+
+    for statements in INDEX_MIGRATIONS[current_version:]:
+        for table, statement in statements:
+            if _table_exists(connection, table):
+                connection.execute(statement)
+    connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+    logger.info(
+        "sqlite.indexes_migrated from_version=%s to_version=%s",
+        current_version,
+        INDEX_VERSION,
+    )
+
+
+def _contributor_trigger_statements(
+    label: str, table: str, join_table: str, relation_id_column: str, refresh: str
+) -> dict[str, str]:
+    """Return the CREATE TRIGGER statements running `refresh` whenever a game's contributors change.
+
+    `refresh` is an UPDATE whose WHERE clause ends with the game id operand to compare.
+    """
+    return {
+        f"{join_table}_{label}_insert": (
+            f"CREATE TRIGGER IF NOT EXISTS {join_table}_{label}_insert "
+            f"AFTER INSERT ON {join_table} "
+            f"BEGIN {refresh} = NEW.game_id; END"
+        ),
+        f"{join_table}_{label}_update": (
+            f"CREATE TRIGGER IF NOT EXISTS {join_table}_{label}_update "
+            f"AFTER UPDATE ON {join_table} "
+            f"BEGIN {refresh} IN (OLD.game_id, NEW.game_id); END"
+        ),
+        f"{join_table}_{label}_delete": (
+            f"CREATE TRIGGER IF NOT EXISTS {join_table}_{label}_delete "
+            f"AFTER DELETE ON {join_table} "
+            f"BEGIN {refresh} = OLD.game_id; END"
+        ),
+        f"{table}_{label}_rename": (
+            f"CREATE TRIGGER IF NOT EXISTS {table}_{label}_rename AFTER UPDATE OF name ON {table} "
+            f"BEGIN {refresh} IN "
+            f"(SELECT game_id FROM {join_table} WHERE {relation_id_column} = NEW.id); END"
+        ),
+    }
+
+
+def _triggers_missing(connection: sqlite3.Connection, statements: dict[str, str]) -> bool:
+    """Return whether any of the named triggers does not exist yet."""
+    existing = {
+        row[0]
+        for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN "
+            f"({', '.join('?' for _ in statements)})",
+            tuple(statements),
+        )
+    }
+    return existing != set(statements)
+
+
+def _sort_key_value_sql(sort_key: str) -> str:
+    """Return the SQL expression computing one contributor sort key of the `games` row in scope."""
+    table, join_table, relation_id_column = GAME_SORT_KEYS[sort_key]
+    return (
+        f"COALESCE((SELECT MIN(LOWER(r.name)) FROM {join_table} j "
+        f"JOIN {table} r ON r.id = j.{relation_id_column} "
+        "WHERE j.game_id = games.id), '')"
+    )
+
+
+def _ensure_game_sort_keys(connection: sqlite3.Connection) -> None:
+    """Add the contributor sort-key columns and triggers, backfilling games if they were missing."""
+    for sort_key, relation in GAME_SORT_KEYS.items():
+        if not _table_has_column(connection, "games", sort_key):
+            connection.execute(f"ALTER TABLE games ADD COLUMN {sort_key} TEXT NOT NULL DEFAULT ''")
+
+        value = _sort_key_value_sql(sort_key)
+        statements = _contributor_trigger_statements(
+            sort_key,
+            *relation,
+            refresh=f"UPDATE games SET {sort_key} = {value} WHERE {sort_key} IS NOT {value} AND id",
+        )
+        if not _triggers_missing(connection, statements):
+            continue
+        for statement in statements.values():
+            connection.execute(statement)
+        # Files created by the importer or before this column existed have no maintained keys yet.
+        connection.execute(f"UPDATE games SET {sort_key} = {value}")
+
+
+def _game_contributors_sql(game_id: str) -> str:
+    """Return the SQL expression listing every contributor name of a game, separated by spaces."""
+    names = " UNION ALL ".join(
+        f"SELECT r.name FROM {join_table} j JOIN {table} r ON r.id = j.{relation_id_column} "
+        f"WHERE j.game_id = {game_id}"
+        for table, join_table, relation_id_column in GAME_CONTRIBUTOR_RELATIONS
+    )
+    return f"COALESCE((SELECT group_concat(name, ' ') FROM ({names})), '')"
+
+
+def _game_search_trigger_statements() -> dict[str, str]:
+    """Return the CREATE TRIGGER statements keeping the full-text index in step with the catalog."""
+    statements = {
+        "games_search_insert": (
+            "CREATE TRIGGER IF NOT EXISTS games_search_insert AFTER INSERT ON games BEGIN "
+            f"INSERT INTO {GAME_SEARCH_TABLE} (rowid, name, contributors) "
+            f"VALUES (NEW.id, NEW.name, {_game_contributors_sql('NEW.id')}); END"
+        ),
+        "games_search_update": (
+            "CREATE TRIGGER IF NOT EXISTS games_search_update "
+            "AFTER UPDATE OF id, name ON games BEGIN "
+            f"UPDATE {GAME_SEARCH_TABLE} SET rowid = NEW.id, name = NEW.name "
+            "WHERE rowid = OLD.id; END"
+        ),
+        "games_search_delete": (
+            "CREATE TRIGGER IF NOT EXISTS games_search_delete AFTER DELETE ON games BEGIN "
+            f"DELETE FROM {GAME_SEARCH_TABLE} WHERE rowid = OLD.id; END"
+        ),
+    }
+    contributors = _game_contributors_sql(f"{GAME_SEARCH_TABLE}.rowid")
+    refresh = f"UPDATE {GAME_SEARCH_TABLE} SET contributors = {contributors} WHERE rowid"
+    for relation in GAME_CONTRIBUTOR_RELATIONS:
+        statements.update(
+            _contributor_trigger_statements(GAME_SEARCH_TABLE, *relation, refresh=refresh)
+        )
+    return statements
+
 
-    if not _table_has_column(connection, "collections", "share_enabled"):
-        connection.execute("ALTER TABLE collections ADD COLUMN share_enabled INTEGER NOT NULL DEFAULT 0")
+def _ensure_game_search(connection: sqlite3.Connection) -> None:
+    """Create the full-text game index and its triggers, rebuilding it if either was missing."""
+    statements = _game_search_trigger_statements()
+    index_exists = _table_exists(connection, GAME_SEARCH_TABLE)
+    if index_exists and not _triggers_missing(connection, statements):
+        return
 
+    connection.execute(GAME_SEARCH_STATEMENT)
+    for statement in statements.values():
+        connection.execute(statement)
+    connection.execute(f"DELETE FROM {GAME_SEARCH_TABLE}")
     connection.execute(
-        """
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_collections_share_token
-        ON collections (share_token)
-        WHERE share_token IS NOT NULL
-        """
+        f"INSERT INTO {GAME_SEARCH_TABLE} (rowid, name, contributors) "
+        f"SELECT id, name, {_game_contributors_sql('games.id')} FROM games"
     )
 
 
-def sync_sqlite_to_gcs(reason: str = "manual") -> bool:
-    """Upload the local SQLite file to GCS when snapshot sync is enabled."""
-    global _HAS_UNSYNCED_LOCAL_CHANGES
+def _ensure_schema_migrations(connection: sqlite3.Connection) -> None:
+    """Apply lightweight SQLite migrations required by newer app versions."""
+    if _table_exists(connection, "collections"):
+        if not _table_has_column(connection, "collections", "share_token"):
+            connection.execute("ALTER TABLE collections ADD COLUMN share_token TEXT")
+
+        if not _table_has_column(connection, "collections", "share_enabled"):
+            connection.execute("ALTER TABLE collections ADD COLUMN share_enabled INTEGER NOT NULL DEFAULT 0")
+
+        connection.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_collections_share_token
+            ON collections (share_token)
+            WHERE share_token IS NOT NULL
+            """
+        )
+
+    if _table_exists(connection, "games"):
+        _ensure_game_sort_keys(connection)
+        _ensure_game_search(connection)
+
+    _ensure_indexes(connection)
 
-    if not _sqlite_gcs_sync_enabled():
+
+def sync_sqlite_to_gcs(reason: str = "manual", database: str = MAIN_DATABASE) -> bool:
+    """Publish a local SQLite file as a GCS snapshot or page replica when sync is enabled."""
+    if not _remote_sync_enabled() or _replica_mode_enabled():
         return False
 
     with _DB_SYNC_LOCK:
         try:
-            synced = _upload_database_to_gcs(reason=reason)
+            if database == MAIN_DATABASE and _page_replication_enabled():
+                synced = _replicate_database_pages(reason=reason)
+            else:
+                synced = _upload_database_to_gcs(reason=reason, database=database)
         except Exception:
-            _HAS_UNSYNCED_LOCAL_CHANGES = True
+            _set_unsynced_changes(database, True)
             logger.exception(
                 "sqlite.remote_snapshot_upload_failed reason=%s bucket=%s object=%s local_path=%s",
                 reason,
                 SQLITE_GCS_BUCKET,
-                SQLITE_GCS_OBJECT,
-                _database_path(),
+                _snapshot_object_name(database),
+                _database_file(database),
             )
             return False
 
-        _HAS_UNSYNCED_LOCAL_CHANGES = not synced
+        _set_unsynced_changes(database, not synced)
         return synced
 
 
+class SnapshotSyncer:
+    """Background worker that turns commit notifications into debounced snapshot uploads.
+
+    Commits only mark the database dirty; the worker uploads at most once per interval, so a
+    burst of writes costs one backup and one upload off the request threads. Failed uploads
+    are retried with exponential backoff.
+    """
+
+    def __init__(
+        self, interval_seconds: float, max_backoff_seconds: float, database: str = MAIN_DATABASE
+    ):
+        self.interval_seconds = interval_seconds
+        self.database = database
+        self.max_backoff_seconds = max(interval_seconds, max_backoff_seconds)
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._reason = "commit"
+        self._dirty_since: float | None = None
+        self._pending_commits = 0
+        self._uploading = False
+        self._retry_at = 0.0
+        self._attempts = 0
+        self._consecutive_failures = 0
+        self._uploads = 0
+        self._failed_uploads = 0
+        self._coalesced_commits = 0
+
+    def mark_dirty(self, reason: str = "commit") -> None:
+        """Schedule an upload covering the latest committed changes."""
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                self._reason = reason
+                self._pending_commits += 1
+                if self._dirty_since is None:
+                    self._dirty_since = time.monotonic()
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="sqlite-snapshot-sync", daemon=True
+                    )
+                    self._thread.start()
+                self._condition.notify_all()
+
+        if closed:
+            sync_sqlite_to_gcs(reason=reason, database=self.database)
+
+    def _next_batch(self) -> tuple[str, int] | None:
+        """Wait until the pending changes are due and claim them, or return None once closed."""
+        with self._condition:
+            while True:
+                if self._dirty_since is None:
+                    if self._closed:
+                        return None
+                    self._condition.wait()
+                    continue
+
+                due_at = max(self._dirty_since + self.interval_seconds, self._retry_at)
+                remaining = due_at - time.monotonic()
+                if self._closed or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            commits = self._pending_commits
+            self._dirty_since = None
+            self._pending_commits = 0
+            self._uploading = True
+            return self._reason, commits
+
+    def _run(self) -> None:
+        """Upload due snapshots until the syncer is closed and has nothing left to publish."""
+        while (batch := self._next_batch()) is not None:
+            reason, commits = batch
+            synced = sync_sqlite_to_gcs(reason=reason, database=self.database)
+            failed = not synced and _has_unsynced_changes(self.database)
+            with self._condition:
+                self._uploading = False
+                self._attempts += 1
+                if not failed:
+                    self._uploads += int(synced)
+                    self._coalesced_commits += commits
+                    self._consecutive_failures = 0
+                    self._retry_at = 0.0
+                else:
+                    self._failed_uploads += 1
+                    self._consecutive_failures += 1
+                    if not self._closed:
+                        delay = min(
+                            self.max_backoff_seconds,
+                            self.interval_seconds * 2**self._consecutive_failures,
+                        )
+                        self._retry_at = time.monotonic() + delay
+                        self._pending_commits += commits
+                        if self._dirty_since is None:
+                            self._dirty_since = time.monotonic()
+                        logger.warning(
+                            "sqlite.remote_snapshot_retry_scheduled attempt=%s "
+                            "delay_seconds=%.3f pending_commits=%s",
+                            self._consecutive_failures,
+                            delay,
+                            self._pending_commits,
+                        )
+                self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Upload pending changes now and wait for the attempt; return whether all is synced."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if self._dirty_since is None and not self._uploading:
+                return not _has_unsynced_changes(self.database)
+
+            attempts = self._attempts + (1 if self._uploading else 0)
+            if self._dirty_since is not None:
+                self._dirty_since = time.monotonic() - self.interval_seconds
+                self._retry_at = 0.0
+                attempts += 1
+            self._condition.notify_all()
+            while self._attempts < attempts:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return self._dirty_since is None and not _has_unsynced_changes(self.database)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush pending changes, then stop the worker; later commits upload inline."""
+        with self._condition:
+            self._closed = True
+            thread = self._thread
+            self._condition.notify_all()
+
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Return pending-change and upload statistics."""
+        with self._condition:
+            return {
+                "interval_seconds": self.interval_seconds,
+                "dirty": self._dirty_since is not None,
+                "pending_commits": self._pending_commits,
+                "uploading": self._uploading,
+                "uploads": self._uploads,
+                "failed_uploads": self._failed_uploads,
+                "consecutive_failures": self._consecutive_failures,
+                "coalesced_commits": self._coalesced_commits,
+            }
+
+
+def _get_snapshot_syncer(database: str = MAIN_DATABASE) -> SnapshotSyncer:
+    """Return the process-wide background snapshot syncer of a database."""
+    with _SNAPSHOT_SYNCER_LOCK:
+        syncer = _RESOURCES.snapshot_syncers.get(database)
+        if syncer is None:
+            interval_seconds = (
+                SQLITE_CATALOG_SYNC_INTERVAL_SECONDS
+                if database == CATALOG_DATABASE
+                else SQLITE_GCS_SYNC_INTERVAL_SECONDS
+            )
+            syncer = SnapshotSyncer(
+                interval_seconds, SQLITE_GCS_SYNC_MAX_BACKOFF_SECONDS, database=database
+            )
+            _RESOURCES.snapshot_syncers[database] = syncer
+        return syncer
+
+
+def get_sqlite_syncer_stats(database: str = MAIN_DATABASE) -> dict[str, Any] | None:
+    """Return the stats of a database's snapshot syncer, or None before its first sync."""
+    with _SNAPSHOT_SYNCER_LOCK:
+        syncer = _RESOURCES.snapshot_syncers.get(database)
+    return syncer.stats() if syncer is not None else None
+
+
+def request_sqlite_sync(reason: str = "commit", database: str = MAIN_DATABASE) -> None:
+    """Publish committed changes to GCS, inline or through the debounced background syncer."""
+    if not _remote_sync_enabled() or _replica_mode_enabled():
+        return
+
+    interval_seconds = (
+        SQLITE_CATALOG_SYNC_INTERVAL_SECONDS
+        if database == CATALOG_DATABASE
+        else SQLITE_GCS_SYNC_INTERVAL_SECONDS
+    )
+    if interval_seconds <= 0:
+        sync_sqlite_to_gcs(reason=reason, database=database)
+        return
+
+    _get_snapshot_syncer(database).mark_dirty(reason=reason)
+
+
+def flush_sqlite_sync(timeout: float | None = None) -> bool:
+    """Upload changes still waiting in the background syncers and return whether all are synced."""
+    with _SNAPSHOT_SYNCER_LOCK:
+        syncers = {
+            database: _RESOURCES.snapshot_syncers.get(database)
+            for database in (MAIN_DATABASE, CATALOG_DATABASE)
+        }
+    synced = True
+    for database, syncer in syncers.items():
+        if syncer is None:
+            synced = synced and not _has_unsynced_changes(database)
+        else:
+            synced = syncer.flush(timeout) and synced
+    return synced
+
+
+def stop_sqlite_syncer(timeout: float | None = None) -> None:
+    """Flush and stop the background syncers, typically on application shutdown."""
+    with _SNAPSHOT_SYNCER_LOCK:
+        syncers = list(_RESOURCES.snapshot_syncers.values())
+        _RESOURCES.snapshot_syncers.clear()
+
+    for syncer in syncers:
+        syncer.close(timeout)
+        stats = syncer.stats()
+        logger.info(
+            "sqlite.snapshot_syncer_stopped database=%s %s",
+            syncer.database,
+            " ".join(f"{key}={value}" for key, value in stats.items()),
+        )
+        if stats["dirty"] or _has_unsynced_changes(syncer.database):
+            logger.error(
+                "sqlite.remote_snapshot_unsynced_on_shutdown bucket=%s object=%s local_path=%s",
+                SQLITE_GCS_BUCKET,
+                _snapshot_object_name(syncer.database),
+                _database_file(syncer.database),
+            )
+
+
+def _table_exists(connection: sqlite3.Connection, table: str, schema: str = "main") -> bool:
+    """Return whether a table exists in one of the connection's databases."""
+    return connection.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?",
+        (table,),
+    ).fetchone() is not None
+
+
+def _split_catalog_tables(connection: sqlite3.Connection) -> None:
+    """Move the catalog tables of a single-file database into the separate catalog file.
+
+    The catalog file wins when it already holds games, e.g. restored from its own snapshot.
+    `collection_games` is rebuilt without its foreign key to `games`, which cannot cross files.
+    """
+    legacy_tables = [table for table in CATALOG_TABLES if _table_exists(connection, table)]
+    if not legacy_tables:
+        return
+
+    connection.execute("ATTACH DATABASE ? AS catalog", (str(_database_file(CATALOG_DATABASE)),))
+    try:
+        copy_rows = connection.execute(
+            "SELECT NOT EXISTS (SELECT 1 FROM catalog.games)"
+        ).fetchone()[0]
+        if copy_rows:
+            for table in legacy_tables:
+                legacy_columns = {
+                    row[1] for row in connection.execute(f"PRAGMA main.table_info({table})")
+                }
+                columns = ", ".join(
+                    row[1]
+                    for row in connection.execute(f"PRAGMA catalog.table_info({table})")
+                    if row[1] in legacy_columns
+                )
+                connection.execute(
+                    f"INSERT INTO catalog.{table} ({columns}) SELECT {columns} FROM main.{table}"
+                )
+
+        if _table_exists(connection, "collection_games"):
+            connection.execute("ALTER TABLE collection_games RENAME TO collection_games_legacy")
+            for statement in _schema_statements(MAIN_DATABASE):
+                if _CREATE_TABLE_NAME.search(statement).group(1) == "collection_games":
+                    connection.execute(statement)
+            connection.execute(
+                """
+                INSERT INTO collection_games (id, collection_id, game_id, location_id, quantity)
+                SELECT id, collection_id, game_id, location_id, quantity
+                FROM collection_games_legacy
+                """
+            )
+            connection.execute("DROP TABLE collection_games_legacy")
+            # The rebuilt table lost its indexes; rebuild them with the other migrations.
+            connection.execute("PRAGMA user_version = 0")
+        for table in reversed(legacy_tables):
+            connection.execute(f"DROP TABLE main.{table}")
+        connection.execute(f"DROP TABLE IF EXISTS main.{GAME_SEARCH_TABLE}")
+        connection.commit()
+    finally:
+        connection.execute("DETACH DATABASE catalog")
+
+    logger.info(
+        "sqlite.catalog_split_migrated tables=%s copied_rows=%s local_path=%s catalog_path=%s",
+        ",".join(legacy_tables),
+        bool(copy_rows),
+        _database_path(),
+        _database_file(CATALOG_DATABASE),
+    )
+
+
+def _initialize_database_file(database: str = MAIN_DATABASE) -> bool:
+    """Create the tables of one database file and apply its migrations; return if any changed."""
+    with sqlite3.connect(_database_file(database)) as connection:
+        schema_version = connection.execute("PRAGMA schema_version").fetchone()[0]
+        if database == MAIN_DATABASE and _catalog_split_enabled():
+            # Runs before foreign keys are enabled, so dropping the old tables cascades nowhere.
+            _split_catalog_tables(connection)
+        connection.execute("PRAGMA foreign_keys = ON")
+        for statement in _schema_statements(database):
+            connection.execute(statement)
+        _ensure_schema_migrations(connection)
+        ensure_change_log(
+            connection,
+            _database_tables(database),
+            enabled=_change_log_enabled(database),
+            derived_columns=DERIVED_COLUMNS,
+        )
+        connection.commit()
+        schema_changed = connection.execute("PRAGMA schema_version").fetchone()[0] != schema_version
+        connection.execute(f"PRAGMA journal_mode = {'WAL' if _wal_storage_enabled() else 'DELETE'}")
+    return schema_changed
+
+
 def init_db() -> None:
-    """Create the SQLite database, optionally hydrate it from GCS, and apply schema migrations."""
+    """Create the SQLite databases, optionally hydrate them from GCS, and apply migrations."""
     global _DB_INITIALIZED
 
     if _DB_INITIALIZED:
@@ -357,44 +2159,571 @@ def init_db() -> None:
         if _DB_INITIALIZED:
             return
 
-        database_path = _database_path()
-        database_path.parent.mkdir(parents=True, exist_ok=True)
+        databases = _synced_databases()
         download_failed = False
-        downloaded = False
-
-        if _sqlite_gcs_sync_enabled():
+        downloaded = dict.fromkeys(databases, False)
+        for database in databases:
+            _database_file(database).parent.mkdir(parents=True, exist_ok=True)
+            if not _remote_sync_enabled():
+                continue
             try:
-                downloaded = _download_database_from_gcs()
+                downloaded[database] = (
+                    database == MAIN_DATABASE
+                    and _page_replication_enabled()
+                    and _restore_database_from_replica()
+                )
+                if not downloaded[database]:
+                    downloaded[database] = (
+                        _local_database_matches_remote(database)
+                        or _download_database_from_gcs(database)
+                    )
             except Exception:
                 download_failed = True
                 logger.exception(
                     "sqlite.remote_snapshot_download_failed bucket=%s object=%s local_path=%s",
                     SQLITE_GCS_BUCKET,
-                    SQLITE_GCS_OBJECT,
-                    database_path,
+                    _snapshot_object_name(database),
+                    _database_file(database),
                 )
 
-        with sqlite3.connect(database_path) as connection:
-            connection.execute("PRAGMA foreign_keys = ON")
-            for statement in SCHEMA_STATEMENTS:
-                connection.execute(statement)
-            _ensure_schema_migrations(connection)
-            connection.commit()
+        # The catalog goes first so a single-file database can move its catalog tables into it.
+        schema_changed = {
+            database: _initialize_database_file(database) for database in reversed(databases)
+        }
 
-        if _sqlite_gcs_sync_enabled() and not download_failed:
-            sync_sqlite_to_gcs(reason="startup" if downloaded else "bootstrap")
+        if _remote_sync_enabled() and not download_failed and not _replica_mode_enabled():
+            for database in databases:
+                if downloaded[database] and not schema_changed[database]:
+                    # The local file is the remote generation it came from; no need to upload it.
+                    logger.info(
+                        "sqlite.startup_upload_skipped reason=matches_remote_generation "
+                        "generation=%s local_path=%s",
+                        (
+                            _remote_generation(database)
+                            if _remote_generation(database) is not None
+                            else "-"
+                        ),
+                        _database_file(database),
+                    )
+                    if database == CATALOG_DATABASE or not _page_replication_enabled():
+                        _record_synced_generation(
+                            _remote_generation(database),
+                            _file_signature(_database_file(database)),
+                            database,
+                        )
+                else:
+                    sync_sqlite_to_gcs(
+                        reason="startup" if downloaded[database] else "bootstrap", database=database
+                    )
 
         _DB_INITIALIZED = True
 
 
-def get_connection() -> sqlite3.Connection:
-    """Return a SQLite connection configured for row access and GCS snapshot sync."""
-    init_db()
-    connection = sqlite3.connect(
+def _serving_database_path() -> Path:
+    """Return the file pooled connections open: seed, replica snapshot, or live database."""
+    serving_path = _RESOURCES.seed_serving_path or _REPLICA_SERVING_PATHS.get(MAIN_DATABASE)
+    return serving_path if serving_path is not None else _database_path()
+
+
+def _serving_catalog_path() -> Path | None:
+    """Return the catalog file pooled connections attach, or None if unsplit or on the seed."""
+    if not _catalog_split_enabled() or _RESOURCES.seed_serving_path is not None:
+        return None
+    return _REPLICA_SERVING_PATHS.get(CATALOG_DATABASE, _database_file(CATALOG_DATABASE))
+
+
+def _hydrate_database(seed_path: Path) -> None:
+    """Initialize the live database, then switch pooled connections from the seed over to it."""
+    started = time.perf_counter()
+    try:
+        init_db()
+    except Exception:
+        logger.exception(
+            "sqlite.hydration_failed seed_path=%s local_path=%s", seed_path, _database_path()
+        )
+    finally:
+        _RESOURCES.seed_serving_path = None
+
+    logger.info(
+        "sqlite.hydration_finished duration_ms=%.1f seed_path=%s local_path=%s",
+        (time.perf_counter() - started) * 1000,
+        seed_path,
         _database_path(),
-        check_same_thread=False,
-        factory=SyncedSQLiteConnection,
     )
-    connection.row_factory = sqlite3.Row
-    connection.execute("PRAGMA foreign_keys = ON")
-    return connection
+
+
+def start_database_hydration() -> bool:
+    """Initialize the database, in the background while serving reads from the seed when enabled.
+
+    Return whether hydration continues in the background.
+    """
+    seed_path = Path(SQLITE_SEED_PATH) if SQLITE_SEED_PATH else None
+    if (
+        _DB_INITIALIZED
+        or not SQLITE_HYDRATE_IN_BACKGROUND
+        or seed_path is None
+        or not seed_path.is_file()
+        or not _remote_sync_enabled()
+    ):
+        init_db()
+        return False
+
+    _RESOURCES.seed_serving_path = seed_path
+    logger.info(
+        "sqlite.serving_seed_read_only seed_path=%s local_path=%s", seed_path, _database_path()
+    )
+    threading.Thread(
+        target=_hydrate_database, args=(seed_path,), name="sqlite-hydration", daemon=True
+    ).start()
+    return True
+
+
+def _replica_snapshot_path(generation: int, database: str = MAIN_DATABASE) -> Path:
+    """Return the side file holding one downloaded snapshot generation on a replica."""
+    database_path = _database_file(database)
+    return database_path.with_name(f"{database_path.name}.generation-{generation}")
+
+
+def _poll_remote_database(database: str = MAIN_DATABASE) -> bool:
+    """Switch one database's reads to its remote snapshot if its generation moved; return if so."""
+    store = _get_snapshot_store(database)
+    remote_generation = store.get_generation()
+    previous_generation = _remote_generation(database)
+    if remote_generation is None or remote_generation == previous_generation:
+        return False
+
+    started = time.perf_counter()
+    download_path = _temporary_database_copy_path("poll", database)
+    try:
+        generation = store.download(download_path)
+        if generation is None:
+            return False
+        snapshot_path = _replica_snapshot_path(generation, database)
+        _restore_snapshot_file(download_path, snapshot_path, database)
+    finally:
+        download_path.unlink(missing_ok=True)
+
+    with _DB_POOL_LOCK:
+        # New checkouts open the new file; the previous pool is closed as its readers release it.
+        retired_path = _RETIRED_REPLICA_PATHS.pop(database, None)
+        if database in _REPLICA_SERVING_PATHS:
+            _RETIRED_REPLICA_PATHS[database] = _REPLICA_SERVING_PATHS[database]
+        _REPLICA_SERVING_PATHS[database] = snapshot_path
+        _set_remote_generation(database, generation)
+    if retired_path is not None:
+        retired_path.unlink(missing_ok=True)
+
+    logger.info(
+        "sqlite.replica_snapshot_swapped generation=%s previous_generation=%s duration_ms=%.1f "
+        "serving_path=%s",
+        generation,
+        previous_generation if previous_generation is not None else "-",
+        (time.perf_counter() - started) * 1000,
+        snapshot_path,
+    )
+    return True
+
+
+def poll_remote_snapshot() -> bool:
+    """On a replica, switch reads to remote snapshots whose generation moved; return if any did."""
+    swapped = False
+    for database in _synced_databases():
+        swapped = _poll_remote_database(database) or swapped
+    return swapped
+
+
+class SnapshotPoller:
+    """Background thread polling the remote snapshot generation on a read replica."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="sqlite-snapshot-poller", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start polling."""
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Poll until stopped, keeping the current snapshot when a poll fails."""
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                poll_remote_snapshot()
+            except Exception:
+                logger.exception(
+                    "sqlite.replica_poll_failed bucket=%s object=%s local_path=%s",
+                    SQLITE_GCS_BUCKET or SQLITE_STORAGE_DIR,
+                    _snapshot_object_name(),
+                    _database_path(),
+                )
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop polling and wait for an in-flight poll to finish."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+
+def start_snapshot_poller() -> bool:
+    """Start polling the remote snapshot on a read replica; return whether it started."""
+    if (
+        not _replica_mode_enabled()
+        or not _snapshot_store_enabled()
+        or _RESOURCES.snapshot_poller is not None
+    ):
+        return False
+    if _page_replication_enabled():
+        logger.warning("sqlite.replica_poll_unsupported reason=requires_snapshot_replication_mode")
+        return False
+
+    _RESOURCES.snapshot_poller = SnapshotPoller(SQLITE_REPLICA_POLL_INTERVAL_SECONDS)
+    _RESOURCES.snapshot_poller.start()
+    return True
+
+
+def stop_snapshot_poller() -> None:
+    """Stop the replica snapshot poller, typically on application shutdown."""
+    poller, _RESOURCES.snapshot_poller = _RESOURCES.snapshot_poller, None
+    if poller is not None:
+        poller.stop()
+
+
+def _wal_storage_enabled() -> bool:
+    """Return whether the live database runs in WAL mode with a dedicated writer connection."""
+    return SQLITE_STORAGE_MODE.strip().lower() == "wal"
+
+
+def _get_connection_pools() -> tuple[SQLiteConnectionPool, SQLiteWriterQueue | None]:
+    """Return the reader pool and, in WAL mode, the writer queue of the configured database."""
+    database_path = _serving_database_path()
+    catalog_path = _serving_catalog_path()
+    pool, writer = _RESOURCES.connection_pool, _RESOURCES.writer_queue
+    if (
+        pool is not None
+        and pool.database_path == database_path
+        and pool.catalog_path == catalog_path
+    ):
+        return pool, writer
+
+    with _DB_POOL_LOCK:
+        pool, writer = _RESOURCES.connection_pool, _RESOURCES.writer_queue
+        if (
+            pool is not None
+            and pool.database_path == database_path
+            and pool.catalog_path == catalog_path
+        ):
+            return pool, writer
+
+        # Swapping pools closes the old connections as their units release them.
+        if pool is not None:
+            pool.close()
+        if writer is not None:
+            writer.close()
+        _bump_data_generation(storage=True)
+
+        if database_path == _database_path():
+            init_db()
+
+        # Seed files and replica snapshots are served read-only, without a writer.
+        if database_path != _database_path() or _replica_mode_enabled():
+            _RESOURCES.writer_queue = None
+            _RESOURCES.connection_pool = SQLiteConnectionPool(
+                database_path,
+                size=SQLITE_POOL_SIZE,
+                timeout_seconds=SQLITE_POOL_TIMEOUT_SECONDS,
+                read_only=True,
+                catalog_path=catalog_path,
+                # Replica catalogs are never written once downloaded, so readers can skip locking.
+                catalog_immutable=_replica_mode_enabled(),
+            )
+            return _RESOURCES.connection_pool, _RESOURCES.writer_queue
+
+        wal_enabled = _wal_storage_enabled()
+        if SQLITE_GROUP_COMMIT_WINDOW_MS > 0 and not wal_enabled:
+            logger.warning(
+                "sqlite.group_commit_ignored reason=requires_wal_storage_mode storage_mode=%s",
+                SQLITE_STORAGE_MODE,
+            )
+        # The writer opens first so the WAL index exists before read-only connections attach.
+        _RESOURCES.writer_queue = (
+            SQLiteWriterQueue(
+                database_path,
+                SQLITE_POOL_TIMEOUT_SECONDS,
+                group_commit_window_seconds=SQLITE_GROUP_COMMIT_WINDOW_MS / 1000,
+                group_commit_max_batch=SQLITE_GROUP_COMMIT_MAX_BATCH,
+                catalog_path=catalog_path,
+            )
+            if wal_enabled
+            else None
+        )
+        _RESOURCES.connection_pool = SQLiteConnectionPool(
+            database_path,
+            size=SQLITE_POOL_SIZE,
+            timeout_seconds=SQLITE_POOL_TIMEOUT_SECONDS,
+            read_only=wal_enabled,
+            catalog_path=catalog_path,
+        )
+        return _RESOURCES.connection_pool, _RESOURCES.writer_queue
+
+
+def set_statement_trace_callback(callback: Callable[[str], None] | None) -> None:
+    """Pass each statement of pooled connections opened from now on to `callback` (None stops)."""
+    _RESOURCES.statement_trace = callback
+
+
+def is_serving_seed_database() -> bool:
+    """Return whether reads are still served from the seed while the live database is hydrated."""
+    return _RESOURCES.seed_serving_path is not None
+
+
+def get_connection_pool_stats() -> dict[str, Any] | None:
+    """Return the current connection pool statistics, or None before the first checkout."""
+    pool, writer = _RESOURCES.connection_pool, _RESOURCES.writer_queue
+    if pool is None:
+        return None
+    stats = pool.stats()
+    if writer is not None:
+        stats["writer"] = writer.stats()
+    return stats
+
+
+def close_connection_pool() -> None:
+    """Close the pooled SQLite connections, typically on application shutdown."""
+    with _DB_POOL_LOCK:
+        stats = get_connection_pool_stats()
+        pool, _RESOURCES.connection_pool = _RESOURCES.connection_pool, None
+        writer, _RESOURCES.writer_queue = _RESOURCES.writer_queue, None
+
+    if stats is not None:
+        writer_stats = stats.pop("writer", {})
+        logger.info(
+            "sqlite.pool_closed %s",
+            " ".join(
+                [
+                    *(f"{key}={value}" for key, value in stats.items()),
+                    *(f"writer_{key}={value}" for key, value in writer_stats.items()),
+                ]
+            ),
+        )
+    if pool is not None:
+        pool.close()
+    if writer is not None:
+        writer.close()
+    # The next pool may open another file.
+    _bump_data_generation(storage=True)
+
+
+class UnitOfWork:
+    """Pooled SQLite connections shared by every helper that runs in one context.
+
+    A unit of work checks out at most one reader and one writer connection. In the default
+    rollback-journal mode both are the same pooled connection; in WAL mode reads use a
+    read-only pooled connection until the first write, after which everything goes through the
+    dedicated writer so later reads see the unit's own changes.
+
+    An explicit unit (a request) begins its transaction up front and defers the `commit()`
+    calls made by CRUD helpers, so the request commits and republishes its snapshot once.
+    Opening and closing block on the pool and on the commit, so async callers should run
+    them in a worker thread and only call `activate()`/`deactivate()` from the request
+    context. `get_connection()` creates implicit units outside requests; those keep the
+    plain sqlite3 behaviour and end with their outermost `with` block.
+    """
+
+    def __init__(self, write: bool = False, defer_commits: bool = True):
+        self.write = write
+        self.defers_commits = defer_commits
+        self._implicit = not defer_commits
+        self._reader: PooledSQLiteConnection | None = None
+        self._writer: PooledSQLiteConnection | None = None
+        self._depth = 0
+        self._token: Token | None = None
+
+    @property
+    def connection(self) -> PooledSQLiteConnection | None:
+        """Return the connection that currently serves both reads and writes of the unit."""
+        return self._writer or self._reader
+
+    def _connections(self) -> list[PooledSQLiteConnection]:
+        """Return the distinct connections checked out by the unit."""
+        connections = [
+            connection for connection in (self._reader, self._writer) if connection is not None
+        ]
+        if len(connections) == 2 and connections[0] is connections[1]:
+            return connections[:1]
+        return connections
+
+    def _claim(self, connection: PooledSQLiteConnection) -> PooledSQLiteConnection:
+        """Attach a freshly checked-out connection to the unit."""
+        connection.unit = self
+        connection.changes_at_checkout = connection.total_changes
+        return connection
+
+    def _checkout(self, write: bool) -> PooledSQLiteConnection:
+        """Return the unit's connection for a read or a write, checking one out when needed."""
+        if self._writer is not None:
+            return self._writer
+        if not write and self._reader is not None:
+            return self._reader
+
+        pool, writer_queue = _get_connection_pools()
+        if write and _replica_mode_enabled():
+            raise ReplicaWriteRejectedError(
+                "This instance is a read replica; send writes to the primary instance"
+            )
+        if write and pool.database_path != _database_path():
+            raise DatabaseHydratingError(
+                "The database is still being restored; writes are not available yet"
+            )
+        if writer_queue is None:
+            if self._reader is None:
+                self._reader = self._claim(pool.acquire())
+            if write:
+                self._writer = self._reader
+            return self._reader
+
+        if not write:
+            self._reader = self._claim(pool.acquire())
+            return self._reader
+
+        connection = self._claim(writer_queue.acquire())
+        self._writer = connection
+        try:
+            writer_queue.begin_unit(connection, immediate=not self._implicit)
+        except Exception:
+            self._writer = None
+            connection.unit = None
+            writer_queue.release(connection)
+            raise
+        return connection
+
+    def open(self) -> "UnitOfWork":
+        """Check out a connection and start the transaction that every helper will share."""
+        connection = self._checkout(write=self.write)
+        if not connection.in_transaction:
+            try:
+                # Writers take the write lock up front so concurrent write requests queue on the
+                # busy timeout instead of failing to upgrade a shared lock half-way through.
+                connection.begin(immediate=self.write)
+            except Exception:
+                self.close()
+                raise
+        self._depth = 1
+        return self
+
+    def enter(self, write: bool = False) -> PooledSQLiteConnection:
+        """Enter a `with get_connection()` block and return the connection it should use."""
+        self._depth += 1
+        try:
+            return self._checkout(write=write)
+        except Exception:
+            self.leave(failed=True)
+            raise
+
+    def leave(self, failed: bool = False) -> None:
+        """Leave a `with` block, finishing an implicit unit when its outermost block exits."""
+        self._depth -= 1
+        if self._depth > 0 or not self._implicit:
+            return
+
+        try:
+            if failed:
+                self.rollback()
+            else:
+                self.commit()
+        finally:
+            self.deactivate()
+            self.close()
+
+    def activate(self) -> None:
+        """Route the `get_connection()` calls of the current context to this unit."""
+        self._token = _CURRENT_UNIT_OF_WORK.set(self)
+
+    def deactivate(self) -> None:
+        """Stop routing `get_connection()` calls of this context to the unit."""
+        if self._token is not None:
+            _CURRENT_UNIT_OF_WORK.reset(self._token)
+            self._token = None
+
+    def commit(self) -> None:
+        """Commit the unit and publish the snapshot when it changed any rows.
+
+        Group-committed units hand the writer to the next caller first, then block until
+        their batch is durable.
+        """
+        self.defers_commits = False
+        batch = None
+        for connection in self._connections():
+            if connection.savepoint_open:
+                batch = connection.pool.join_batch(connection)
+            elif connection.total_changes != connection.changes_at_checkout:
+                connection.commit()
+            else:
+                # Read-only work only ends its snapshot; there is nothing to republish.
+                sqlite3.Connection.commit(connection)
+
+        if batch is not None:
+            self.close()
+            batch.wait()
+
+    def rollback(self) -> None:
+        """Discard everything written through the unit of work."""
+        self.defers_commits = False
+        for connection in self._connections():
+            if connection.savepoint_open:
+                connection.pool.rollback_unit(connection)
+            else:
+                connection.rollback()
+
+    def close(self) -> None:
+        """Return the unit's connections to their pools, rolling back anything left uncommitted."""
+        connections = self._connections()
+        self._reader = self._writer = None
+        self._depth = 0
+        for connection in connections:
+            connection.unit = None
+            connection.pool.release(connection)
+
+
+def open_unit_of_work(write: bool = False) -> UnitOfWork:
+    """Check out a connection and begin a unit of work without activating it."""
+    return UnitOfWork(write=write).open()
+
+
+@contextmanager
+def unit_of_work(write: bool = False) -> Iterator[sqlite3.Connection]:
+    """Run the enclosed CRUD calls on shared connections and commit them as a single transaction."""
+    if _CURRENT_UNIT_OF_WORK.get() is not None:
+        with get_connection(write=write) as connection:
+            yield connection
+        return
+
+    unit = open_unit_of_work(write=write)
+    unit.activate()
+    try:
+        yield unit.connection
+    except BaseException:
+        unit.rollback()
+        raise
+    else:
+        unit.commit()
+    finally:
+        unit.deactivate()
+        unit.close()
+
+
+def get_connection(write: bool = False) -> sqlite3.Connection:
+    """Return a pooled SQLite connection configured for row access and GCS snapshot sync.
+
+    Pass `write=True` for connections that modify data: in WAL mode reads use read-only
+    connections and writes go through the dedicated writer queue. The connection must be
+    used as a context manager. Nested calls in the same context, and calls made while a unit
+    of work is active, reuse the connections that are already checked out; the outermost
+    `with` block of an implicit unit commits like sqlite3 and returns them to the pool.
+    """
+    unit = _CURRENT_UNIT_OF_WORK.get()
+    if unit is None:
+        unit = UnitOfWork(defer_commits=False)
+        unit.activate()
+    return unit.enter(write=write)
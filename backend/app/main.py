@@ -3,19 +3,34 @@
 from contextlib import asynccontextmanager
 import logging
 import os
-from typing import List, Literal
+from typing import Any, List, Literal
 
-from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 
 from . import __version__, crud, schemas
 from .auth import AUTH_EXEMPT_PATHS, get_authenticated_session, is_admin_user, requires_admin_access
 from .config import ALLOW_ORIGINS, ENVIRONMENT, SQLITE_PATH
-from .database import init_db
+from .database import (
+    DatabaseReadOnlyError,
+    close_connection_pool,
+    open_unit_of_work,
+    start_database_hydration,
+    start_snapshot_poller,
+    stop_snapshot_poller,
+    stop_sqlite_syncer,
+)
 
 
 logger = logging.getLogger("ludostock.backend")
+READ_ONLY_HTTP_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+PERSONAL_API_PREFIX = "/api/me/"
+PERSONAL_COLLECTION_API_PREFIX = "/api/me/collection/"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+_TRUSTED_PAYLOAD_JSON = TypeAdapter(Any)
 
 
 def _runtime_log_context() -> dict[str, str]:
@@ -32,8 +47,9 @@ def _runtime_log_context() -> dict[str, str]:
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    """Initialize the SQLite database on startup."""
-    init_db()
+    """Initialize the database and replica polling; on shutdown, release it and flush uploads."""
+    start_database_hydration()
+    start_snapshot_poller()
     runtime = _runtime_log_context()
     logger.info(
         "backend.startup environment=%s service=%s revision=%s hostname=%s sqlite_path=%s sqlite_seed_path=%s allow_origins=%s",
@@ -54,18 +70,89 @@ async def lifespan(_: FastAPI):
             runtime["sqlite_path"],
         )
     yield
-
-
-app = FastAPI(lifespan=lifespan)
+    stop_snapshot_poller()
+    logger.info(
+        "backend.game_cache_stats %s",
+        " ".join(f"{key}={value}" for key, value in crud.get_game_cache_stats().items()),
+    )
+    close_connection_pool()
+    stop_sqlite_syncer()
+
+
+async def database_unit_of_work(request: Request):
+    """Run each API request on one pooled SQLite connection and commit it once at the end.
+
+    Personal reads first create the user and collection rows they may need in a short write unit.
+    """
+    write = request.method not in READ_ONLY_HTTP_METHODS
+    path = request.url.path
+    if not write and request.method != "OPTIONS" and path.startswith(PERSONAL_API_PREFIX):
+        await run_in_threadpool(
+            crud.ensure_authenticated_user,
+            request.state.user,
+            path.startswith(PERSONAL_COLLECTION_API_PREFIX),
+        )
+    unit = await run_in_threadpool(open_unit_of_work, write)
+    unit.activate()
+    try:
+        yield unit
+    except Exception:
+        await run_in_threadpool(unit.rollback)
+        raise
+    else:
+        await run_in_threadpool(unit.commit)
+    finally:
+        unit.deactivate()
+        await run_in_threadpool(unit.close)
+
+
+# The unit of work must finish before the response is sent so that commit failures (and
+# group-commit durability waits) are reflected in the response.
+app = FastAPI(lifespan=lifespan, dependencies=[Depends(database_unit_of_work, scope="function")])
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
+def _next_cursor_headers(table: str, rows: list[dict], limit: int) -> dict[str, str]:
+    """Return the header exposing the cursor of the next page of an id-ordered listing, if any."""
+    next_cursor = crud.get_next_page_cursor(table, rows, limit)
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else {}
+
+
+def _with_next_cursor(response: Response, table: str, rows: list[dict], limit: int) -> list[dict]:
+    """Expose the cursor of the next page of an id-ordered listing in a response header."""
+    response.headers.update(_next_cursor_headers(table, rows, limit))
+    return rows
+
+
+def _trusted_json_response(payload: Any, headers: dict[str, str] | None = None) -> Response:
+    """Encode a crud payload straight to JSON bytes, skipping FastAPI's response-model validation.
+
+    Only for read endpoints whose payload already has exactly the shape of their response_model,
+    which test_main checks for each of them; the response_model still documents the endpoint.
+    Payloads crud already encoded as bytes are sent as they are.
+    """
+    content = payload if isinstance(payload, bytes) else _TRUSTED_PAYLOAD_JSON.dump_json(payload)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@app.exception_handler(DatabaseReadOnlyError)
+async def database_read_only_handler(_request: Request, exc: DatabaseReadOnlyError):
+    """Reject writes received while restoring the database or on a read replica."""
+    headers = (
+        {"Retry-After": str(exc.retry_after_seconds)}
+        if exc.retry_after_seconds is not None
+        else None
+    )
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers=headers)
+
+
 @app.middleware("http")
 async def require_authentication(request: Request, call_next):
     """Require a valid Better Auth session for every protected API route."""
@@ -117,28 +204,64 @@ def get_games(
     search: str | None = None,
     game_type: str | None = Query(default=None, alias="type"),
     year: str | None = None,
-    sort_by: Literal["name", "type", "creation_year", "players", "duration_minutes", "authors", "editors"] = "name",
+    year_min: int | None = None,
+    year_max: int | None = None,
+    players: int | None = Query(default=None, ge=1),
+    max_age: int | None = Query(default=None, ge=0),
+    max_duration: int | None = Query(default=None, ge=1),
+    sort_by: Literal[
+        "relevance",
+        "name",
+        "type",
+        "creation_year",
+        "players",
+        "duration_minutes",
+        "authors",
+        "editors",
+    ] = "name",
     sort_dir: Literal["asc", "desc"] = "asc",
+    cursor: str | None = None,
+    include_total: bool = True,
+    total_mode: Literal["exact", "estimate"] = Query(default="exact", alias="total"),
 ):
     """List games with pagination and optional filters."""
-    return crud.get_games_page(
+    page = crud.get_games_page(
         skip=skip,
         limit=limit,
         search=search,
         game_type=game_type,
         year=year,
+        year_min=year_min,
+        year_max=year_max,
+        players=players,
+        max_age=max_age,
+        max_duration=max_duration,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        cursor=cursor,
+        include_total=include_total,
+        total_mode=total_mode,
+        as_json=True,
     )
+    return _trusted_json_response(page)
+
+
+@app.get("/api/games/suggestions/", response_model=List[schemas.GameSuggestion], tags=["Games"])
+def get_game_suggestions(
+    q: str = Query(min_length=1),
+    limit: int = Query(default=crud.GAME_SUGGESTION_LIMIT, ge=1, le=20),
+):
+    """Suggest the game names closest to a search, tolerating typos."""
+    return crud.suggest_game_names(q, limit=limit)
 
 
 @app.get("/api/games/{game_id}", response_model=schemas.Game, tags=["Games"])
 def get_game(game_id: int):
     """Get a game by id."""
-    db_game = crud.get_game(game_id=game_id)
+    db_game = crud.get_game(game_id=game_id, as_json=True)
     if db_game is None:
         raise HTTPException(status_code=404, detail="Game not found")
-    return db_game
+    return _trusted_json_response(db_game)
 
 
 @app.delete("/api/games/{game_id}", response_model=schemas.Game, tags=["Games"])
@@ -157,9 +280,10 @@ def create_author(author: schemas.AuthorCreate):
 
 
 @app.get("/api/authors/", response_model=List[schemas.Author], tags=["Authors"])
-def get_authors(skip: int = 0, limit: int = 100):
+def get_authors(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """List authors."""
-    return crud.get_authors(skip=skip, limit=limit)
+    rows = crud.get_authors(skip=skip, limit=limit, cursor=cursor)
+    return _trusted_json_response(rows, headers=_next_cursor_headers("authors", rows, limit))
 
 
 @app.get("/api/authors/{author_id}", response_model=schemas.Author, tags=["Authors"])
@@ -196,9 +320,10 @@ def create_artist(artist: schemas.ArtistCreate):
 
 
 @app.get("/api/artists/", response_model=List[schemas.Artist], tags=["Artists"])
-def get_artists(skip: int = 0, limit: int = 100):
+def get_artists(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """List artists."""
-    return crud.get_artists(skip=skip, limit=limit)
+    rows = crud.get_artists(skip=skip, limit=limit, cursor=cursor)
+    return _trusted_json_response(rows, headers=_next_cursor_headers("artists", rows, limit))
 
 
 @app.get("/api/artists/{artist_id}", response_model=schemas.Artist, tags=["Artists"])
@@ -235,9 +360,10 @@ def create_editor(editor: schemas.EditorCreate):
 
 
 @app.get("/api/editors/", response_model=List[schemas.Editor], tags=["Editors"])
-def get_editors(skip: int = 0, limit: int = 100):
+def get_editors(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """List editors."""
-    return crud.get_editors(skip=skip, limit=limit)
+    rows = crud.get_editors(skip=skip, limit=limit, cursor=cursor)
+    return _trusted_json_response(rows, headers=_next_cursor_headers("editors", rows, limit))
 
 
 @app.get("/api/editors/{editor_id}", response_model=schemas.Editor, tags=["Editors"])
@@ -274,9 +400,10 @@ def create_distributor(distributor: schemas.DistributorCreate):
 
 
 @app.get("/api/distributors/", response_model=List[schemas.Distributor], tags=["Distributors"])
-def get_distributors(skip: int = 0, limit: int = 100):
+def get_distributors(skip: int = 0, limit: int = 100, cursor: str | None = None):
     """List distributors."""
-    return crud.get_distributors(skip=skip, limit=limit)
+    rows = crud.get_distributors(skip=skip, limit=limit, cursor=cursor)
+    return _trusted_json_response(rows, headers=_next_cursor_headers("distributors", rows, limit))
 
 
 @app.get("/api/distributors/{distributor_id}", response_model=schemas.Distributor, tags=["Distributors"])
@@ -313,9 +440,10 @@ def create_user(user: schemas.UserCreate):
 
 
 @app.get("/api/users/", response_model=List[schemas.User], tags=["Users"])
-def get_users(skip: int = 0, limit: int = 100):
+def get_users(response: Response, skip: int = 0, limit: int = 100, cursor: str | None = None):
     """List users."""
-    return crud.get_users(skip=skip, limit=limit)
+    rows = crud.get_users(skip=skip, limit=limit, cursor=cursor)
+    return _with_next_cursor(response, "users", rows, limit)
 
 
 @app.get("/api/users/{user_id}", response_model=schemas.User, tags=["Users"])
@@ -343,9 +471,10 @@ def create_collection(collection: schemas.CollectionCreate):
 
 
 @app.get("/api/collections/", response_model=List[schemas.Collection], tags=["Collections"])
-def get_collections(skip: int = 0, limit: int = 100):
+def get_collections(response: Response, skip: int = 0, limit: int = 100, cursor: str | None = None):
     """List collections."""
-    return crud.get_collections(skip=skip, limit=limit)
+    rows = crud.get_collections(skip=skip, limit=limit, cursor=cursor)
+    return _with_next_cursor(response, "collections", rows, limit)
 
 
 @app.get("/api/me/collection/games/", response_model=schemas.GamePage, tags=["Collections"])
@@ -356,26 +485,55 @@ def get_my_collection_games(
     search: str | None = None,
     game_type: str | None = Query(default=None, alias="type"),
     year: str | None = None,
-    sort_by: Literal["name", "type", "creation_year", "players", "duration_minutes", "authors", "editors"] = "name",
+    year_min: int | None = None,
+    year_max: int | None = None,
+    players: int | None = Query(default=None, ge=1),
+    max_age: int | None = Query(default=None, ge=0),
+    max_duration: int | None = Query(default=None, ge=1),
+    sort_by: Literal[
+        "relevance",
+        "name",
+        "type",
+        "creation_year",
+        "players",
+        "duration_minutes",
+        "authors",
+        "editors",
+    ] = "name",
     sort_dir: Literal["asc", "desc"] = "asc",
+    cursor: str | None = None,
+    include_total: bool = True,
+    total_mode: Literal["exact", "estimate"] = Query(default="exact", alias="total"),
 ):
     """List the authenticated user's personal collection games."""
-    return crud.get_personal_collection_games(
+    page = crud.get_personal_collection_games(
         auth_user=request.state.user,
         skip=skip,
         limit=limit,
         search=search,
         game_type=game_type,
         year=year,
+        year_min=year_min,
+        year_max=year_max,
+        players=players,
+        max_age=max_age,
+        max_duration=max_duration,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        cursor=cursor,
+        include_total=include_total,
+        total_mode=total_mode,
+        as_json=True,
     )
+    return _trusted_json_response(page)
 
 
 @app.get("/api/me/collection/board/", response_model=schemas.PersonalCollectionBoard, tags=["Collections"])
 def get_my_collection_board(request: Request):
     """Return the authenticated user's collection board grouped by locations."""
-    return crud.get_personal_collection_board(auth_user=request.state.user)
+    return _trusted_json_response(
+        crud.get_personal_collection_board(auth_user=request.state.user, as_json=True)
+    )
 
 
 @app.get("/api/me/collection/share/", response_model=schemas.CollectionShareSettings, tags=["Collections"])
@@ -516,9 +674,12 @@ def create_collection_share(share: schemas.CollectionShareCreate, collection_id:
 
 
 @app.get("/api/collection_shares/", response_model=List[schemas.CollectionShare], tags=["CollectionShares"])
-def get_collection_shares(skip: int = 0, limit: int = 100):
+def get_collection_shares(
+    response: Response, skip: int = 0, limit: int = 100, cursor: str | None = None
+):
     """List collection shares."""
-    return crud.get_collection_shares(skip=skip, limit=limit)
+    rows = crud.get_collection_shares(skip=skip, limit=limit, cursor=cursor)
+    return _with_next_cursor(response, "collection_shares", rows, limit)
 
 
 @app.get("/api/collection_shares/{share_id}", response_model=schemas.CollectionShare, tags=["CollectionShares"])
@@ -546,9 +707,12 @@ def create_user_location(location: schemas.UserLocationCreate):
 
 
 @app.get("/api/user_locations/", response_model=List[schemas.UserLocation], tags=["UserLocations"])
-def get_user_locations(skip: int = 0, limit: int = 100):
+def get_user_locations(
+    response: Response, skip: int = 0, limit: int = 100, cursor: str | None = None
+):
     """List user locations."""
-    return crud.get_user_locations(skip=skip, limit=limit)
+    rows = crud.get_user_locations(skip=skip, limit=limit, cursor=cursor)
+    return _with_next_cursor(response, "user_locations", rows, limit)
 
 
 @app.get("/api/user_locations/{location_id}", response_model=schemas.UserLocation, tags=["UserLocations"])
@@ -576,9 +740,12 @@ def create_collection_game(collection_game: schemas.CollectionGameCreate):
 
 
 @app.get("/api/collection_games/", response_model=List[schemas.CollectionGame], tags=["CollectionGames"])
-def get_collection_games(skip: int = 0, limit: int = 100):
+def get_collection_games(
+    response: Response, skip: int = 0, limit: int = 100, cursor: str | None = None
+):
     """List collection games."""
-    return crud.get_collection_games(skip=skip, limit=limit)
+    rows = crud.get_collection_games(skip=skip, limit=limit, cursor=cursor)
+    return _with_next_cursor(response, "collection_games", rows, limit)
 
 
 @app.get("/api/collection_games/{collection_game_id}", response_model=schemas.CollectionGame, tags=["CollectionGames"])
@@ -0,0 +1,59 @@
+"""Opaque keyset cursors that let listings resume after the last row instead of using OFFSET."""
+
+import base64
+import json
+from collections.abc import Sequence
+from typing import Any
+
+
+OrderTerm = tuple[str, str]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or was issued for another ordering."""
+
+
+def encode_cursor(ordering: str, values: Sequence[Any]) -> str:
+    """Encode the sort key of the last returned row as a URL-safe token."""
+    payload = json.dumps([ordering, list(values)], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, ordering: str, size: int) -> list[Any]:
+    """Decode a cursor issued for `ordering`, returning its `size` sort key values."""
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        cursor_ordering, values = json.loads(payload.decode("utf-8"))
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+    if cursor_ordering != ordering or not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError("Cursor does not match this listing")
+    if any(
+        isinstance(value, bool) or not isinstance(value, (str, int, float, type(None)))
+        for value in values
+    ):
+        raise InvalidCursorError("Malformed cursor")
+    return values
+
+
+def keyset_condition(terms: Sequence[OrderTerm], values: Sequence[Any]) -> tuple[str, list[Any]]:
+    """Build the condition selecting rows strictly after `values` in the given order."""
+    branches: list[str] = []
+    parameters: list[Any] = []
+    for index, (expression, direction) in enumerate(terms):
+        # IS keeps NULL sort values comparable; the NULLs-last flag before them sets their position.
+        comparisons = [f"{previous} IS ?" for previous, _ in terms[:index]]
+        comparisons.append(f"{expression} {'<' if direction == 'DESC' else '>'} ?")
+        branches.append(f"({' AND '.join(comparisons)})")
+        parameters.extend(values[: index + 1])
+
+    condition = " OR ".join(branches)
+    first_expression, first_direction = terms[0]
+    if values[0] is not None:
+        # Redundant bound on the leading term so an index on it can seek to the cursor.
+        condition = (
+            f"{first_expression} {'<=' if first_direction == 'DESC' else '>='} ? AND ({condition})"
+        )
+        parameters.insert(0, values[0])
+    return f"({condition})", parameters
@@ -0,0 +1,187 @@
+"""Page-level replication of the SQLite database to object storage."""
+
+import hashlib
+import logging
+import re
+import struct
+from pathlib import Path
+from typing import Any
+
+from .storage import ReplicaStore
+
+
+logger = logging.getLogger("ludostock.backend.sqlite")
+SEGMENT_MAGIC = b"LDSTPGS1"
+_SEGMENT_HEADER = struct.Struct(">8sIII")
+_PAGE_NUMBER = struct.Struct(">I")
+_BASE_NAME = re.compile(r"^base-(\d{8})\.db$")
+_SEGMENT_NAME = re.compile(r"^base-(\d{8})\.segment-(\d{8})\.pages$")
+
+
+def base_name(base: int) -> str:
+    """Return the object name of a base snapshot."""
+    return f"base-{base:08d}.db"
+
+
+def segment_name(base: int, sequence: int) -> str:
+    """Return the object name of a page segment applied on top of a base snapshot."""
+    return f"base-{base:08d}.segment-{sequence:08d}.pages"
+
+
+def database_page_size(path: Path) -> int:
+    """Return the page size recorded in a SQLite database header."""
+    with path.open("rb") as handle:
+        handle.seek(16)
+        value = int.from_bytes(handle.read(2), "big")
+    return 65536 if value == 1 else value
+
+
+def read_page_digests(path: Path, page_size: int) -> list[bytes]:
+    """Return one digest per database page."""
+    digests = []
+    with path.open("rb") as handle:
+        while page := handle.read(page_size):
+            digests.append(hashlib.blake2b(page, digest_size=16).digest())
+    return digests
+
+
+def write_segment(
+    database_path: Path, segment_path: Path, page_size: int, page_numbers: list[int]
+) -> None:
+    """Write the listed pages of a database file as a replica segment."""
+    page_count = database_path.stat().st_size // page_size
+    with database_path.open("rb") as source, segment_path.open("wb") as target:
+        target.write(_SEGMENT_HEADER.pack(SEGMENT_MAGIC, page_size, page_count, len(page_numbers)))
+        for page_number in page_numbers:
+            source.seek((page_number - 1) * page_size)
+            target.write(_PAGE_NUMBER.pack(page_number))
+            target.write(source.read(page_size))
+
+
+def apply_segment(database_path: Path, segment_path: Path) -> int:
+    """Write a segment's pages into a database file and return how many pages changed."""
+    with segment_path.open("rb") as source, database_path.open("r+b") as target:
+        magic, page_size, page_count, changed = _SEGMENT_HEADER.unpack(
+            source.read(_SEGMENT_HEADER.size)
+        )
+        if magic != SEGMENT_MAGIC:
+            raise ValueError(f"{segment_path} is not a replica page segment")
+        for _ in range(changed):
+            (page_number,) = _PAGE_NUMBER.unpack(source.read(_PAGE_NUMBER.size))
+            target.seek((page_number - 1) * page_size)
+            target.write(source.read(page_size))
+        target.truncate(page_count * page_size)
+    return changed
+
+
+class PageReplicator:
+    """Publish a database as periodic base snapshots plus segments holding only changed pages.
+
+    The digests of the last published pages are kept in memory, so each publish uploads the
+    pages that differ from the previous one; a new base is written on first publish, after
+    `base_interval` segments, or when the page size changes.
+    """
+
+    def __init__(self, store: ReplicaStore, base_interval: int):
+        self.store = store
+        self.base_interval = max(1, base_interval)
+        self._base: int | None = None
+        self._next_segment = 1
+        self._page_size = 0
+        self._digests: list[bytes] = []
+
+    def reset(self) -> None:
+        """Forget the published state so the next publish starts a new base."""
+        self._base = None
+        self._next_segment = 1
+        self._page_size = 0
+        self._digests = []
+
+    def _latest_base(self, names: list[str]) -> int:
+        """Return the highest base number found in a listing, or 0."""
+        bases = [int(match.group(1)) for name in names if (match := _BASE_NAME.match(name))]
+        return max(bases, default=0)
+
+    def publish(self, snapshot_path: Path, scratch_path: Path) -> dict[str, Any] | None:
+        """Upload a snapshot as a base or segment; return what was sent, or None if unchanged."""
+        page_size = database_page_size(snapshot_path)
+        digests = read_page_digests(snapshot_path, page_size)
+        needs_base = (
+            self._base is None
+            or page_size != self._page_size
+            or self._next_segment > self.base_interval
+        )
+
+        if needs_base:
+            names = self.store.list_names()
+            base = self._latest_base(names) + 1
+            name = base_name(base)
+            self.store.upload(name, snapshot_path)
+            self._base, self._next_segment = base, 1
+            self._page_size, self._digests = page_size, digests
+            self._prune(names, keep_from=base - 1)
+            return {
+                "kind": "base",
+                "name": name,
+                "pages": len(digests),
+                "bytes": snapshot_path.stat().st_size,
+            }
+
+        changed = [
+            index + 1
+            for index, digest in enumerate(digests)
+            if index >= len(self._digests) or self._digests[index] != digest
+        ]
+        if not changed and len(digests) == len(self._digests):
+            return None
+
+        name = segment_name(self._base, self._next_segment)
+        write_segment(snapshot_path, scratch_path, page_size, changed)
+        self.store.upload(name, scratch_path)
+        self._next_segment += 1
+        self._digests = digests
+        return {
+            "kind": "segment",
+            "name": name,
+            "pages": len(changed),
+            "bytes": scratch_path.stat().st_size,
+        }
+
+    def _prune(self, names: list[str], keep_from: int) -> None:
+        """Delete bases and segments older than `keep_from`, keeping the previous base."""
+        for name in names:
+            match = _BASE_NAME.match(name) or _SEGMENT_NAME.match(name)
+            if match and int(match.group(1)) < keep_from:
+                self.store.delete(name)
+
+    def restore(self, target_path: Path, scratch_path: Path) -> dict[str, Any] | None:
+        """Rebuild the database from the latest base and its segments; return what was applied."""
+        names = self.store.list_names()
+        base = self._latest_base(names)
+        if not base:
+            return None
+
+        segments = sorted(
+            int(match.group(2))
+            for name in names
+            if (match := _SEGMENT_NAME.match(name)) and int(match.group(1)) == base
+        )
+        self.store.download(base_name(base), target_path)
+        applied = 0
+        for sequence in segments:
+            if sequence != applied + 1:
+                logger.warning(
+                    "sqlite.replica_segment_gap base=%s expected_segment=%s found_segment=%s",
+                    base,
+                    applied + 1,
+                    sequence,
+                )
+                break
+            self.store.download(segment_name(base, sequence), scratch_path)
+            apply_segment(target_path, scratch_path)
+            applied = sequence
+
+        self._base, self._next_segment = base, applied + 1
+        self._page_size = database_page_size(target_path)
+        self._digests = read_page_digests(target_path, self._page_size)
+        return {"base": base, "segments": applied}
@@ -126,13 +126,25 @@ class Game(GameBase):
     distributors: List[Distributor] = Field(default_factory=list)
 
 
+class GameSuggestion(OrmSchema):
+    """Game name close to a search that matched nothing."""
+
+    id: int
+    name: str
+    similarity: float
+
+
 class GamePage(OrmSchema):
     """Paginated game list response."""
 
     items: List[Game] = Field(default_factory=list)
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    has_more: bool = False
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+    suggestions: List[GameSuggestion] = Field(default_factory=list)
 
 
 class VersionInfo(OrmSchema):
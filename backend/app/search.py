@@ -0,0 +1,101 @@
+"""Name normalization and trigram similarity behind the fuzzy game-name suggestions."""
+
+import heapq
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+DEFAULT_SUGGESTION_BUDGET_SECONDS = 0.05
+
+
+def normalize_name_key(value: str | None) -> str:
+    """Normalize a game name to a fuzzy matching key."""
+    if not value:
+        return ""
+    lowered = value.casefold().replace("&", " et ")
+    normalized = unicodedata.normalize("NFKD", lowered)
+    stripped = "".join(
+        character for character in normalized if not unicodedata.combining(character)
+    )
+    return re.sub(r"[^a-z0-9]+", " ", stripped).strip()
+
+
+def name_trigrams(value: str | None) -> frozenset[str]:
+    """Return the trigrams of a normalized name, each word padded like PostgreSQL's pg_trgm."""
+    trigrams: set[str] = set()
+    for word in normalize_name_key(value).split():
+        padded = f"  {word} "
+        trigrams.update(padded[index : index + 3] for index in range(len(padded) - 2))
+    return frozenset(trigrams)
+
+
+class TrigramIndex:
+    """In-memory inverted index from name trigrams to game ids, ranked by Jaccard similarity."""
+
+    def __init__(self, rows: Iterable[tuple[int, str]]):
+        self._names: dict[int, str] = {}
+        self._sizes: dict[int, int] = {}
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        for game_id, name in rows:
+            trigrams = name_trigrams(name)
+            if not trigrams:
+                continue
+            self._names[game_id] = name
+            self._sizes[game_id] = len(trigrams)
+            for trigram in trigrams:
+                self._postings[trigram].append(game_id)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def suggest(
+        self,
+        query: str,
+        limit: int = 5,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        budget_seconds: float = DEFAULT_SUGGESTION_BUDGET_SECONDS,
+    ) -> list[dict[str, Any]]:
+        """Return up to `limit` distinct names closest to `query`, best first.
+
+        Postings are merged rarest trigram first and merging stops once the time budget is
+        spent, so a query made of very common trigrams returns the best matches found so far.
+        """
+        query_trigrams = name_trigrams(query)
+        if not query_trigrams or limit <= 0:
+            return []
+
+        deadline = time.monotonic() + budget_seconds
+        shared: Counter[int] = Counter()
+        for trigram in sorted(
+            query_trigrams, key=lambda trigram: len(self._postings.get(trigram, ()))
+        ):
+            shared.update(self._postings.get(trigram, ()))
+            if time.monotonic() > deadline:
+                break
+
+        scored = (
+            (count / (len(query_trigrams) + self._sizes[game_id] - count), game_id)
+            for game_id, count in shared.items()
+        )
+        candidates = heapq.nlargest(
+            limit * 4,
+            (item for item in scored if item[0] >= threshold),
+            key=lambda item: (item[0], -item[1]),
+        )
+
+        suggestions: list[dict[str, Any]] = []
+        seen_names: set[str] = set()
+        for similarity, game_id in candidates:
+            name = self._names[game_id]
+            if name in seen_names:
+                continue
+            seen_names.add(name)
+            suggestions.append({"id": game_id, "name": name, "similarity": round(similarity, 3)})
+            if len(suggestions) == limit:
+                break
+        return suggestions
@@ -0,0 +1,344 @@
+"""Object stores used to publish and restore the SQLite database."""
+
+import base64
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+
+DEFAULT_DOWNLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+class StorageConflict(Exception):
+    """Raised when a conditional write loses against a newer object or generation."""
+
+
+class SnapshotStore(Protocol):
+    """Single versioned object holding the latest database snapshot."""
+
+    def get_generation(self) -> int | None:
+        """Return the current snapshot generation, or None when there is no snapshot."""
+
+    def put(self, path: Path, if_generation_match: int) -> int | None:
+        """Upload a snapshot if the stored generation matches (0: absent); return the new one."""
+
+    def download(self, path: Path) -> int | None:
+        """Copy the snapshot to a local file; return its generation, or None when it is missing."""
+
+
+class ReplicaStore(Protocol):
+    """Object storage holding the replica base snapshots and page segments."""
+
+    def list_names(self) -> list[str]:
+        """Return the names of the stored replica objects."""
+
+    def upload(self, name: str, path: Path) -> None:
+        """Store a new object, raising StorageConflict when the name is already taken."""
+
+    def download(self, name: str, path: Path) -> None:
+        """Copy a stored object to a local file."""
+
+    def delete(self, name: str) -> None:
+        """Remove a stored object when it exists."""
+
+
+def download_ranges_in_parallel(
+    path: Path,
+    size: int,
+    read_range: Callable[[int, int], bytes],
+    parallelism: int,
+    chunk_bytes: int,
+) -> None:
+    """Fill a local file with `size` bytes fetched as concurrent `[start, end)` ranges."""
+    ranges = [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+    write_lock = threading.Lock()
+    with path.open("wb") as handle:
+        handle.truncate(size)
+
+        def fetch(start: int, end: int) -> None:
+            data = read_range(start, end)
+            if len(data) != end - start:
+                raise OSError(f"Short read for bytes {start}-{end} of {path.name}: got {len(data)}")
+            with write_lock:
+                handle.seek(start)
+                handle.write(data)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(ranges)))) as executor:
+            for future in [executor.submit(fetch, start, end) for start, end in ranges]:
+                future.result()
+
+
+def _verify_crc32c(path: Path, expected: str | None) -> None:
+    """Check a downloaded file against the base64 CRC32C reported by GCS."""
+    if not expected:
+        return
+    import google_crc32c
+
+    checksum = google_crc32c.Checksum()
+    with path.open("rb") as handle:
+        while chunk := handle.read(DEFAULT_DOWNLOAD_CHUNK_BYTES):
+            checksum.update(chunk)
+    if checksum.digest() != base64.b64decode(expected):
+        raise ValueError(f"CRC32C mismatch for downloaded {path.name}")
+
+
+def _blob_generation(blob: Any) -> int | None:
+    """Return the generation already known on a blob handle, without a metadata request."""
+    generation = getattr(blob, "generation", None)
+    return int(generation) if generation is not None else None
+
+
+class GCSSnapshotStore:
+    """Snapshot store backed by one Google Cloud Storage object."""
+
+    def __init__(
+        self,
+        bucket: Any,
+        object_name: str,
+        not_found_exception: type[Exception],
+        precondition_failed_exception: type[Exception],
+        parallelism: int = 1,
+        chunk_bytes: int = DEFAULT_DOWNLOAD_CHUNK_BYTES,
+    ):
+        self.bucket = bucket
+        self.object_name = object_name
+        self.not_found_exception = not_found_exception
+        self.precondition_failed_exception = precondition_failed_exception
+        self.parallelism = parallelism
+        self.chunk_bytes = max(1, chunk_bytes)
+
+    def get_generation(self) -> int | None:
+        """Return the current snapshot generation, or None when there is no snapshot."""
+        blob = self.bucket.blob(self.object_name)
+        try:
+            blob.reload()
+        except self.not_found_exception:
+            return None
+        return _blob_generation(blob)
+
+    def put(self, path: Path, if_generation_match: int) -> int | None:
+        """Upload a snapshot if the stored generation matches (0: absent); return the new one."""
+        blob = self.bucket.blob(self.object_name)
+        try:
+            blob.upload_from_filename(path, if_generation_match=if_generation_match)
+        except self.precondition_failed_exception as exc:
+            raise StorageConflict(self.object_name) from exc
+        # The upload response already holds the new object's metadata.
+        generation = _blob_generation(blob)
+        return generation if generation is not None else self.get_generation()
+
+    def download(self, path: Path) -> int | None:
+        """Copy the snapshot to a local file and return its generation, or None when it is missing.
+
+        Snapshots larger than one chunk are fetched as parallel ranged reads pinned to one
+        generation, then checked against the object's CRC32C.
+        """
+        blob = self.bucket.blob(self.object_name)
+        if self.parallelism > 1:
+            try:
+                blob.reload()
+            except self.not_found_exception:
+                return None
+            size = int(getattr(blob, "size", None) or 0)
+            generation = _blob_generation(blob)
+            if size > self.chunk_bytes and generation is not None:
+                download_ranges_in_parallel(
+                    path,
+                    size,
+                    lambda start, end: self.bucket.blob(self.object_name).download_as_bytes(
+                        start=start,
+                        end=end - 1,
+                        if_generation_match=generation,
+                    ),
+                    self.parallelism,
+                    self.chunk_bytes,
+                )
+                _verify_crc32c(path, getattr(blob, "crc32c", None))
+                return generation
+
+        try:
+            blob.download_to_filename(path)
+        except self.not_found_exception:
+            return None
+        # The download response carries the generation, so no separate metadata call is needed.
+        generation = _blob_generation(blob)
+        return generation if generation is not None else self.get_generation()
+
+
+class LocalDirectorySnapshotStore:
+    """Snapshot store backed by a local directory, with GCS generation-match semantics.
+
+    The generation lives in a sidecar file next to the snapshot. `latency_seconds` is added
+    to every call to approximate object-storage round trips offline.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        object_name: str,
+        latency_seconds: float = 0.0,
+        parallelism: int = 1,
+        chunk_bytes: int = DEFAULT_DOWNLOAD_CHUNK_BYTES,
+    ):
+        self.root = root
+        self.object_name = object_name
+        self.latency_seconds = latency_seconds
+        self.parallelism = parallelism
+        self.chunk_bytes = max(1, chunk_bytes)
+        self._lock = threading.Lock()
+
+    @property
+    def object_path(self) -> Path:
+        """Return the path of the stored snapshot."""
+        return self.root / self.object_name
+
+    @property
+    def generation_path(self) -> Path:
+        """Return the path of the sidecar file holding the snapshot generation."""
+        return self.root / f"{self.object_name}.generation"
+
+    def _simulate_latency(self) -> None:
+        """Sleep for the configured per-call latency."""
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+    def _read_generation(self) -> int | None:
+        """Return the stored generation without simulated latency."""
+        if not self.object_path.exists():
+            return None
+        try:
+            return int(self.generation_path.read_text(encoding="utf-8").strip())
+        except (FileNotFoundError, ValueError):
+            return 1
+
+    def get_generation(self) -> int | None:
+        """Return the current snapshot generation, or None when there is no snapshot."""
+        self._simulate_latency()
+        with self._lock:
+            return self._read_generation()
+
+    def put(self, path: Path, if_generation_match: int) -> int | None:
+        """Upload a snapshot if the stored generation matches (0: absent); return the new one."""
+        self._simulate_latency()
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            current_generation = self._read_generation()
+            if if_generation_match != (current_generation or 0):
+                raise StorageConflict(self.object_name)
+
+            partial = self.root / f".{self.object_name}.partial"
+            shutil.copyfile(path, partial)
+            partial.replace(self.object_path)
+            generation = (current_generation or 0) + 1
+            self.generation_path.write_text(str(generation), encoding="utf-8")
+            return generation
+
+    def download(self, path: Path) -> int | None:
+        """Copy the snapshot to a local file; return its generation, or None when it is missing."""
+        self._simulate_latency()
+        with self._lock:
+            generation = self._read_generation()
+            if generation is None:
+                return None
+            size = self.object_path.stat().st_size
+            if self.parallelism > 1 and size > self.chunk_bytes:
+                download_ranges_in_parallel(
+                    path, size, self._read_range, self.parallelism, self.chunk_bytes
+                )
+            else:
+                shutil.copyfile(self.object_path, path)
+            return generation
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        """Return the `[start, end)` bytes of the stored snapshot, like a ranged GET."""
+        self._simulate_latency()
+        with self.object_path.open("rb") as handle:
+            handle.seek(start)
+            return handle.read(end - start)
+
+
+class GCSReplicaStore:
+    """Replica store keeping objects under a prefix of a Google Cloud Storage bucket."""
+
+    def __init__(self, bucket: Any, prefix: str, precondition_failed_exception: type[Exception]):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.precondition_failed_exception = precondition_failed_exception
+
+    def list_names(self) -> list[str]:
+        """Return the names of the stored replica objects."""
+        return sorted(
+            blob.name[len(self.prefix) :] for blob in self.bucket.list_blobs(prefix=self.prefix)
+        )
+
+    def upload(self, name: str, path: Path) -> None:
+        """Store a new object, raising StorageConflict when the name is already taken."""
+        try:
+            self.bucket.blob(f"{self.prefix}{name}").upload_from_filename(
+                path, if_generation_match=0
+            )
+        except self.precondition_failed_exception as exc:
+            raise StorageConflict(name) from exc
+
+    def download(self, name: str, path: Path) -> None:
+        """Copy a stored object to a local file."""
+        self.bucket.blob(f"{self.prefix}{name}").download_to_filename(path)
+
+    def delete(self, name: str) -> None:
+        """Remove a stored object when it exists."""
+        blob = self.bucket.blob(f"{self.prefix}{name}")
+        if blob.exists():
+            blob.delete()
+
+
+class LocalDirectoryReplicaStore:
+    """Replica store backed by a local directory, standing in for a bucket prefix."""
+
+    def __init__(self, root: Path, latency_seconds: float = 0.0):
+        self.root = root
+        self.latency_seconds = latency_seconds
+
+    def _simulate_latency(self) -> None:
+        """Sleep for the configured per-call latency."""
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+    def list_names(self) -> list[str]:
+        """Return the names of the stored replica objects."""
+        self._simulate_latency()
+        if not self.root.exists():
+            return []
+        return sorted(
+            path.name
+            for path in self.root.iterdir()
+            if path.is_file() and not path.name.startswith(".")
+        )
+
+    def upload(self, name: str, path: Path) -> None:
+        """Store a new object, raising StorageConflict when the name is already taken."""
+        self._simulate_latency()
+        self.root.mkdir(parents=True, exist_ok=True)
+        target = self.root / name
+        partial = self.root / f".{name}.partial"
+        shutil.copyfile(path, partial)
+        try:
+            # A hard link only succeeds when the name is free, like if_generation_match=0.
+            os.link(partial, target)
+        except FileExistsError as exc:
+            raise StorageConflict(name) from exc
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def download(self, name: str, path: Path) -> None:
+        """Copy a stored object to a local file."""
+        self._simulate_latency()
+        shutil.copyfile(self.root / name, path)
+
+    def delete(self, name: str) -> None:
+        """Remove a stored object when it exists."""
+        self._simulate_latency()
+        (self.root / name).unlink(missing_ok=True)
@@ -0,0 +1,237 @@
+"""Benchmark game page hydration: per-relation queries, one JSON statement and cached fragments."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from backend.app import crud, database
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare la production du JSON d'une page de jeux avec ses auteurs, artistes, "
+            "editeurs et distributeurs : requete par relation (ancien chemin), une seule "
+            "requete agregee en JSON, "
+            "ou assemblage des fragments JSON deja en cache."
+        )
+    )
+    parser.add_argument("--games", type=int, default=20000, help="Nombre de jeux du catalogue.")
+    parser.add_argument(
+        "--contributors", type=int, default=3000, help="Nombre de contributeurs par table."
+    )
+    parser.add_argument(
+        "--links-per-relation", type=int, default=2, help="Contributeurs par jeu et par relation."
+    )
+    parser.add_argument("--page-size", type=int, default=50, help="Nombre de jeux par page.")
+    parser.add_argument("--pages", type=int, default=200, help="Nombre de pages lues par mode.")
+    parser.add_argument(
+        "--max-skip",
+        type=int,
+        default=2000,
+        help=(
+            "Decalage maximal des pages lues ; au-dela, le parcours de l'OFFSET domine "
+            "les deux chemins."
+        ),
+    )
+    parser.add_argument(
+        "--random-seed", type=int, default=42, help="Graine du generateur aleatoire."
+    )
+    return parser.parse_args()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def describe(label: str, values: list[float], statements: list[int]) -> str:
+    """Return a one-line latency and statement-count summary."""
+    return (
+        f"{label}: pages={len(values)} statements_per_page={statistics.fmean(statements):.1f} "
+        f"mean={statistics.fmean(values):.2f}ms p50={percentile(values, 0.50):.2f}ms "
+        f"p95={percentile(values, 0.95):.2f}ms max={max(values):.2f}ms"
+    )
+
+
+def configure_database(work_dir: Path) -> None:
+    """Point the database module at a temp database without any snapshot sync."""
+    database.SQLITE_PATH = str(work_dir / "benchmark.db")
+    database.SQLITE_CATALOG_PATH = ""
+    database.SQLITE_GCS_BUCKET = ""
+    database.SQLITE_GCS_OBJECT = ""
+    database.SQLITE_STORAGE_DIR = ""
+
+
+def seed_catalog(database_path: Path, args: argparse.Namespace, generator: random.Random) -> None:
+    """Insert games and their contributor links directly, like an import."""
+    with sqlite3.connect(database_path) as connection:
+        connection.executemany(
+            "INSERT INTO games (name, type, creation_year, min_players, max_players, "
+            "duration_minutes) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    f"Game {index:06d}",
+                    "jeu",
+                    1980 + index % 45,
+                    1 + index % 4,
+                    2 + index % 6,
+                    15 + index % 120,
+                )
+                for index in range(args.games)
+            ],
+        )
+        for relation_name, (table, join_table, relation_id_column) in crud.GAME_RELATIONS.items():
+            connection.executemany(
+                f"INSERT INTO {table} (name) VALUES (?)",
+                [(f"{relation_name} {index:06d}",) for index in range(args.contributors)],
+            )
+            connection.executemany(
+                f"INSERT OR IGNORE INTO {join_table} (game_id, {relation_id_column}) VALUES (?, ?)",
+                [
+                    (game_id, generator.randint(1, args.contributors))
+                    for game_id in range(1, args.games + 1)
+                    for _ in range(args.links_per_relation)
+                ],
+            )
+
+
+def load_relations_per_table(game_ids: list[int]) -> dict[str, dict[int, list[dict[str, Any]]]]:
+    """Load contributors the way game pages used to: a join query then an id lookup per relation."""
+    relations: dict[str, dict[int, list[dict[str, Any]]]] = {}
+    placeholders = ", ".join("?" for _ in game_ids)
+    with database.get_connection() as connection:
+        for relation_name, (table, join_table, relation_id_column) in crud.GAME_RELATIONS.items():
+            join_rows = connection.execute(
+                f"SELECT game_id, {relation_id_column} FROM {join_table} WHERE game_id IN "
+                f"({placeholders})",
+                tuple(game_ids),
+            ).fetchall()
+            related_ids = sorted({row[relation_id_column] for row in join_rows})
+            related_by_id = {
+                row["id"]: dict(row)
+                for row in connection.execute(
+                    f"SELECT * FROM {table} WHERE id IN ({', '.join('?' for _ in related_ids)})",
+                    tuple(related_ids),
+                ).fetchall()
+            }
+            grouped: dict[int, list[dict[str, Any]]] = defaultdict(list)
+            for join_row in join_rows:
+                grouped[join_row["game_id"]].append(related_by_id[join_row[relation_id_column]])
+            relations[relation_name] = grouped
+    return relations
+
+
+def read_page_per_table(skip: int, limit: int) -> list[dict[str, Any]]:
+    """Read a name-ordered game page, then its contributors relation by relation."""
+    with database.get_connection() as connection:
+        game_rows = [
+            dict(row)
+            for row in connection.execute(
+                "SELECT g.* FROM games g ORDER BY LOWER(g.name) ASC, g.id DESC LIMIT ? OFFSET ?",
+                (limit, skip),
+            ).fetchall()
+        ]
+    relations = load_relations_per_table([row["id"] for row in game_rows])
+    return [
+        {
+            **{key: value for key, value in row.items() if key not in database.GAME_SORT_KEYS},
+            **{name: relations[name].get(row["id"], []) for name in crud.GAME_RELATIONS},
+        }
+        for row in game_rows
+    ]
+
+
+def encode_page_per_table(skip: int, limit: int) -> bytes:
+    """Encode the per-relation page as JSON, as the response used to be."""
+    return json.dumps(read_page_per_table(skip, limit)).encode("utf-8")
+
+
+def read_page_hydrated(skip: int, limit: int) -> bytes:
+    """Read the same page as JSON through crud with an empty game cache, hydrating every game."""
+    crud.clear_game_cache()
+    return crud.get_games_page(
+        skip=skip, limit=limit, sort_by="name", include_total=False, as_json=True
+    )
+
+
+def read_page_cached(skip: int, limit: int) -> bytes:
+    """Read the same page as JSON through crud once its game fragments are cached."""
+    return crud.get_games_page(
+        skip=skip, limit=limit, sort_by="name", include_total=False, as_json=True
+    )
+
+
+def measure(
+    read_page, offsets: list[int], limit: int, statements: list[str]
+) -> tuple[list[float], list[int]]:
+    """Read one page per offset, returning latencies in milliseconds and statements per page."""
+    latencies: list[float] = []
+    counts: list[int] = []
+    for skip in offsets:
+        statements.clear()
+        started = time.perf_counter()
+        read_page(skip, limit)
+        latencies.append((time.perf_counter() - started) * 1000)
+        counts.append(
+            sum(1 for statement in statements if statement.lstrip().upper().startswith("SELECT"))
+        )
+    return latencies, counts
+
+
+def main() -> None:
+    """Seed a catalog, read the same pages through both paths and print the comparison."""
+    args = parse_arguments()
+    generator = random.Random(args.random_seed)
+    statements: list[str] = []
+
+    with tempfile.TemporaryDirectory(prefix="ludostock-hydration-benchmark-") as directory:
+        work_dir = Path(directory)
+        configure_database(work_dir)
+        database.init_db()
+        seed_catalog(work_dir / "benchmark.db", args, generator)
+        database.close_connection_pool()
+        database.set_statement_trace_callback(statements.append)
+        offsets = [
+            generator.randrange(0, max(1, min(args.max_skip, args.games - args.page_size)))
+            for _ in range(args.pages)
+        ]
+        try:
+            expected_items = read_page_per_table(0, args.page_size)
+            for read_page in (read_page_hydrated, read_page_cached):
+                if json.loads(read_page(0, args.page_size))["items"] != expected_items:
+                    raise SystemExit("Every path must return the same games and contributors")
+            per_table = measure(encode_page_per_table, offsets, args.page_size, statements)
+            hydrated = measure(read_page_hydrated, offsets, args.page_size, statements)
+            for skip in offsets:
+                read_page_cached(skip, args.page_size)
+            cached = measure(read_page_cached, offsets, args.page_size, statements)
+        finally:
+            database.close_connection_pool()
+            database.set_statement_trace_callback(None)
+
+    print(
+        f"games={args.games} page_size={args.page_size} "
+        f"links_per_relation={args.links_per_relation}"
+    )
+    print(describe("per_relation", *per_table))
+    print(describe("json_aggregation", *hydrated))
+    print(describe("cached_fragments", *cached))
+
+
+if __name__ == "__main__":
+    main()
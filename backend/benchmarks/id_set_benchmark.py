@@ -0,0 +1,187 @@
+"""Benchmark loading rows for large id sets: placeholder lists, temp tables and a JSON parameter."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from backend.app import crud, database
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare trois facons de charger les lignes d'un grand ensemble d'identifiants : "
+            "une liste IN (?, ?, ...), une table temporaire jointe, et un tableau JSON lu par "
+            "json_each."
+        )
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=60000,
+        help="Nombre d'utilisateurs (et de collections) en base.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000, 40000],
+        help="Tailles des ensembles d'identifiants mesures.",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=10, help="Nombre de mesures par strategie et par taille."
+    )
+    parser.add_argument(
+        "--random-seed", type=int, default=42, help="Graine du generateur aleatoire."
+    )
+    return parser.parse_args()
+
+
+def seed_database(database_path: Path, user_count: int) -> list[str]:
+    """Insert users, one collection each and a game per collection; return the user ids."""
+    user_ids = [str(uuid.UUID(int=index + 1)) for index in range(user_count)]
+    with sqlite3.connect(database_path) as connection:
+        connection.execute("INSERT INTO games (name, type) VALUES ('Azul', 'jeu')")
+        connection.executemany(
+            "INSERT INTO users (id, email, username) VALUES (?, ?, ?)",
+            [(user_id, f"{user_id}@example.com", user_id) for user_id in user_ids],
+        )
+        connection.executemany(
+            "INSERT INTO collections (name, owner_id) VALUES (?, ?)",
+            [(f"Collection {user_id}", user_id) for user_id in user_ids],
+        )
+        connection.executemany(
+            "INSERT INTO collection_games (collection_id, game_id) VALUES (?, 1)",
+            [(index + 1,) for index in range(user_count)],
+        )
+    return user_ids
+
+
+def load_with_placeholders(
+    connection: sqlite3.Connection, user_ids: list[str], collection_ids: list[int]
+) -> int:
+    """Load users and collection games with one placeholder per id, as the helpers used to."""
+    users = connection.execute(
+        f"SELECT * FROM users WHERE id IN ({', '.join('?' for _ in user_ids)})",
+        tuple(user_ids),
+    ).fetchall()
+    games = connection.execute(
+        "SELECT * FROM collection_games WHERE collection_id IN "
+        f"({', '.join('?' for _ in collection_ids)})",
+        tuple(collection_ids),
+    ).fetchall()
+    return len(users) + len(games)
+
+
+def load_with_temp_table(
+    connection: sqlite3.Connection, user_ids: list[str], collection_ids: list[int]
+) -> int:
+    """Load the same rows by filling connection-local temp tables and joining against them."""
+    loaded = 0
+    for values, statement in (
+        (
+            user_ids,
+            "SELECT users.* FROM temp.benchmark_ids JOIN users ON users.id = benchmark_ids.id",
+        ),
+        (
+            collection_ids,
+            "SELECT collection_games.* FROM temp.benchmark_ids "
+            "JOIN collection_games ON collection_games.collection_id = benchmark_ids.id",
+        ),
+    ):
+        connection.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS benchmark_ids (id PRIMARY KEY) WITHOUT ROWID"
+        )
+        connection.execute("DELETE FROM temp.benchmark_ids")
+        connection.executemany(
+            "INSERT OR IGNORE INTO temp.benchmark_ids (id) VALUES (?)",
+            ((value,) for value in values),
+        )
+        loaded += len(connection.execute(statement).fetchall())
+    return loaded
+
+
+def load_with_json_parameter(
+    connection: sqlite3.Connection, user_ids: list[str], collection_ids: list[int]
+) -> int:
+    """Load the same rows with the crud id-set subquery and a single JSON parameter per set."""
+    users = connection.execute(
+        f"SELECT * FROM users WHERE id IN ({crud.ID_SET_SUBQUERY})",
+        (json.dumps(user_ids),),
+    ).fetchall()
+    games = connection.execute(
+        f"SELECT * FROM collection_games WHERE collection_id IN ({crud.ID_SET_SUBQUERY})",
+        (json.dumps(collection_ids),),
+    ).fetchall()
+    return len(users) + len(games)
+
+
+STRATEGIES = {
+    "placeholders": load_with_placeholders,
+    "temp_table": load_with_temp_table,
+    "json_each": load_with_json_parameter,
+}
+
+
+def measure(
+    strategy,
+    connection: sqlite3.Connection,
+    user_ids: list[str],
+    collection_ids: list[int],
+    repeats: int,
+) -> str:
+    """Return the mean and best latency of a strategy, or the error that stopped it."""
+    latencies: list[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        try:
+            loaded = strategy(connection, user_ids, collection_ids)
+        except sqlite3.OperationalError as exc:
+            return f"error={str(exc).replace(' ', '_')}"
+        latencies.append((time.perf_counter() - started) * 1000)
+    return f"rows={loaded} mean={statistics.fmean(latencies):.2f}ms min={min(latencies):.2f}ms"
+
+
+def main() -> None:
+    """Seed users and collections, then time each strategy for every id-set size."""
+    args = parse_arguments()
+    generator = random.Random(args.random_seed)
+    with tempfile.TemporaryDirectory(prefix="ludostock-id-set-benchmark-") as directory:
+        database_path = Path(directory) / "benchmark.db"
+        database.SQLITE_PATH = str(database_path)
+        database.SQLITE_CATALOG_PATH = ""
+        database.SQLITE_GCS_BUCKET = ""
+        database.SQLITE_GCS_OBJECT = ""
+        database.init_db()
+        database.close_connection_pool()
+        user_ids = seed_database(database_path, args.users)
+
+        connection = sqlite3.connect(database_path)
+        try:
+            print(f"users={args.users} sqlite={sqlite3.sqlite_version}")
+            for size in args.sizes:
+                sampled_users = generator.sample(user_ids, min(size, len(user_ids)))
+                sampled_collections = generator.sample(
+                    range(1, args.users + 1), min(size, args.users)
+                )
+                for name, strategy in STRATEGIES.items():
+                    result: Any = measure(
+                        strategy, connection, sampled_users, sampled_collections, args.repeats
+                    )
+                    print(f"ids={size} strategy={name} {result}")
+        finally:
+            connection.close()
+
+
+if __name__ == "__main__":
+    main()
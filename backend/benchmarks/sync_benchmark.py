@@ -0,0 +1,181 @@
+"""Benchmark SQLite snapshot sync against a local-directory snapshot store."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from backend.app import database
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Rejoue N commits de taille variable via SyncedSQLiteConnection et mesure le debit "
+            "et la latence de synchronisation vers un store local simulant le bucket."
+        )
+    )
+    parser.add_argument("--commits", type=int, default=200, help="Nombre de commits a rejouer.")
+    parser.add_argument(
+        "--min-rows", type=int, default=1, help="Nombre minimal de lignes par commit."
+    )
+    parser.add_argument(
+        "--max-rows", type=int, default=50, help="Nombre maximal de lignes par commit."
+    )
+    parser.add_argument(
+        "--row-bytes", type=int, default=200, help="Taille approximative d'une ligne."
+    )
+    parser.add_argument(
+        "--seed-rows",
+        type=int,
+        default=20000,
+        help="Nombre de lignes inserees avant la mesure, pour simuler le catalogue.",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=30.0,
+        help="Latence injectee a chaque appel au store, en millisecondes.",
+    )
+    parser.add_argument(
+        "--sync-interval-seconds",
+        type=float,
+        default=0.0,
+        help="Intervalle du syncer en arriere-plan (0 : synchronisation a chaque commit).",
+    )
+    parser.add_argument(
+        "--replication-mode",
+        choices=("snapshot", "pages"),
+        default="snapshot",
+        help="Mode de publication : snapshot complet ou segments de pages.",
+    )
+    parser.add_argument(
+        "--snapshot-format",
+        choices=("gzip", "raw"),
+        default="gzip",
+        help="Format des snapshots complets.",
+    )
+    parser.add_argument(
+        "--random-seed", type=int, default=42, help="Graine du generateur aleatoire."
+    )
+    return parser.parse_args()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def describe(label: str, values: list[float]) -> str:
+    """Return a one-line latency summary in milliseconds."""
+    return (
+        f"{label}: n={len(values)} mean={statistics.fmean(values) if values else 0.0:.2f}ms "
+        f"p50={percentile(values, 0.50):.2f}ms p95={percentile(values, 0.95):.2f}ms "
+        f"p99={percentile(values, 0.99):.2f}ms max={max(values, default=0.0):.2f}ms"
+    )
+
+
+def configure_database(work_dir: Path, args: argparse.Namespace) -> None:
+    """Point the database module at a temp database and a local-directory snapshot store."""
+    database.SQLITE_PATH = str(work_dir / "benchmark.db")
+    database.SQLITE_GCS_BUCKET = ""
+    database.SQLITE_GCS_OBJECT = ""
+    database.SQLITE_STORAGE_DIR = str(work_dir / "bucket")
+    database.SQLITE_STORAGE_LATENCY_MS = args.latency_ms
+    database.SQLITE_GCS_SYNC_INTERVAL_SECONDS = args.sync_interval_seconds
+    database.SQLITE_REPLICATION_MODE = args.replication_mode
+    database.SQLITE_SNAPSHOT_FORMAT = args.snapshot_format
+
+
+def seed_catalog(database_path: Path, row_count: int, row_bytes: int) -> None:
+    """Insert catalog rows without triggering any sync."""
+    with sqlite3.connect(database_path) as connection:
+        connection.executemany(
+            "INSERT INTO authors (name) VALUES (?)",
+            [(f"seed-{index:08d}-" + "x" * row_bytes,) for index in range(row_count)],
+        )
+        connection.commit()
+
+
+def main() -> None:
+    """Replay the commits and print throughput and latency percentiles."""
+    args = parse_arguments()
+    generator = random.Random(args.random_seed)
+    sync_latencies: list[float] = []
+    commit_latencies: list[float] = []
+    synchronous_sync = database.sync_sqlite_to_gcs
+
+    def timed_sync(reason: str = "manual") -> bool:
+        started = time.perf_counter()
+        try:
+            return synchronous_sync(reason=reason)
+        finally:
+            sync_latencies.append((time.perf_counter() - started) * 1000)
+
+    with tempfile.TemporaryDirectory(prefix="ludostock-sync-benchmark-") as directory:
+        work_dir = Path(directory)
+        configure_database(work_dir, args)
+        database.init_db()
+        seed_catalog(work_dir / "benchmark.db", args.seed_rows, args.row_bytes)
+        database.sync_sqlite_to_gcs = timed_sync
+
+        connection = sqlite3.connect(
+            work_dir / "benchmark.db",
+            factory=database.SyncedSQLiteConnection,
+            check_same_thread=False,
+        )
+        rows_written = 0
+        started = time.perf_counter()
+        try:
+            for commit_index in range(args.commits):
+                row_count = generator.randint(args.min_rows, args.max_rows)
+                commit_started = time.perf_counter()
+                connection.executemany(
+                    "INSERT INTO authors (name) VALUES (?)",
+                    [
+                        (f"bench-{commit_index:06d}-{row:04d}-" + "y" * args.row_bytes,)
+                        for row in range(row_count)
+                    ],
+                )
+                connection.commit()
+                commit_latencies.append((time.perf_counter() - commit_started) * 1000)
+                rows_written += row_count
+            database.flush_sqlite_sync()
+            elapsed = time.perf_counter() - started
+        finally:
+            connection.close()
+            database.stop_sqlite_syncer()
+            database.sync_sqlite_to_gcs = synchronous_sync
+
+        stored_bytes = sum(
+            path.stat().st_size for path in (work_dir / "bucket").rglob("*") if path.is_file()
+        )
+
+    print(
+        f"mode={args.replication_mode} format={args.snapshot_format} latency_ms={args.latency_ms} "
+        f"sync_interval_seconds={args.sync_interval_seconds}"
+    )
+    print(
+        f"commits={args.commits} rows={rows_written} elapsed={elapsed:.2f}s "
+        f"throughput={args.commits / elapsed:.1f} commits/s"
+    )
+    print(
+        f"syncs={len(sync_latencies)} sync_throughput={len(sync_latencies) / elapsed:.1f} "
+        f"syncs/s stored_bytes={stored_bytes}"
+    )
+    print(describe("commit_latency", commit_latencies))
+    print(describe("sync_latency", sync_latencies))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from backend.app.cache import EncodedValueCache
+
+
+def test_encoded_value_cache_evicts_least_recently_used_values_beyond_its_bounds():
+    cache = EncodedValueCache(max_entries=2, max_bytes=8)
+
+    cache.put_many({1: b"aaa", 2: b"bbb"}, generation=0)
+    cache.get_many([1], generation=0)
+    cache.put_many({3: b"ccc"}, generation=0)
+    by_count = cache.get_many([1, 2, 3], generation=0)
+    cache.put_many({4: b"dddddd"}, generation=0)
+    by_size = cache.get_many([1, 3, 4], generation=0)
+    cache.put_many({5: b"too large"}, generation=0)
+
+    assert by_count == {1: b"aaa", 3: b"ccc"}
+    assert by_size == {4: b"dddddd"}
+    assert cache.stats() == {
+        "entries": 1,
+        "bytes": 6,
+        "max_entries": 2,
+        "max_bytes": 8,
+        "hits": 4,
+        "misses": 3,
+        "evictions": 3,
+        "invalidations": 0,
+        "resets": 0,
+    }
+
+
+def test_encoded_value_cache_drops_discarded_stale_and_older_generation_values():
+    cache = EncodedValueCache(max_entries=10, max_bytes=100)
+
+    cache.put_many({1: b"one", 2: b"two"}, generation=1)
+    cache.discard([1, 3])
+    cache.put_many({1: b"stale"}, generation=1, is_current=lambda: False)
+    kept = cache.get_many([1, 2], generation=1)
+    cache.put_many({1: b"older"}, generation=0)
+    swapped = cache.get_many([1, 2], generation=2)
+    stats = cache.stats()
+
+    assert kept == {2: b"two"}
+    assert swapped == {}
+    assert (stats["invalidations"], stats["resets"], stats["entries"]) == (1, 1, 0)
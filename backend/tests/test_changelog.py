@@ -0,0 +1,90 @@
+import shutil
+import sqlite3
+from pathlib import Path
+
+from backend.app import database
+from backend.app.changelog import ensure_change_log, rebase_onto_snapshot, strip_change_log
+
+
+def create_logged_database(path: Path) -> None:
+    """Create the application schema with change-log triggers enabled."""
+    with sqlite3.connect(path) as connection:
+        for statement in database.SCHEMA_STATEMENTS:
+            connection.execute(statement)
+        database._ensure_schema_migrations(connection)
+        ensure_change_log(
+            connection,
+            database.CHANGE_LOGGED_TABLES,
+            enabled=True,
+            derived_columns=database.DERIVED_COLUMNS,
+        )
+
+
+def open_autocommit(path: Path) -> sqlite3.Connection:
+    """Open a connection in autocommit mode, as the rebase expects."""
+    return sqlite3.connect(path, isolation_level=None)
+
+
+def test_rebase_remaps_colliding_ids_and_their_references(tmp_path):
+    local_path, remote_path = tmp_path / "local.db", tmp_path / "remote.db"
+    create_logged_database(local_path)
+    with open_autocommit(local_path) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES ('Shared Author')")
+        strip_change_log(local_path)
+    shutil.copyfile(local_path, remote_path)
+
+    with open_autocommit(remote_path) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES ('Remote Author')")
+        connection.execute("INSERT INTO games (name, type) VALUES ('Remote Game', 'game')")
+    with open_autocommit(local_path) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES ('Local Author')")
+        connection.execute("INSERT INTO games (name, type) VALUES ('Local Game', 'game')")
+        connection.execute("INSERT INTO game_authors (game_id, author_id) VALUES (1, 2)")
+
+    connection = open_autocommit(local_path)
+    stats = rebase_onto_snapshot(connection, remote_path, database.CHANGE_LOGGED_TABLES)
+    authors = connection.execute("SELECT id, name FROM authors ORDER BY id").fetchall()
+    links = connection.execute(
+        """
+        SELECT games.name, authors.name
+        FROM game_authors
+        JOIN games ON games.id = game_authors.game_id
+        JOIN authors ON authors.id = game_authors.author_id
+        """
+    ).fetchall()
+    logged = connection.execute(
+        "SELECT table_name, operation FROM change_log ORDER BY seq"
+    ).fetchall()
+    sort_keys = connection.execute("SELECT name, author_sort_key FROM games ORDER BY id").fetchall()
+    connection.close()
+
+    assert authors == [(1, "Shared Author"), (2, "Remote Author"), (3, "Local Author")]
+    assert links == [("Local Game", "Local Author")]
+    assert stats["remapped"] == 2
+    assert logged == [("authors", "insert"), ("games", "insert"), ("game_authors", "insert")]
+    assert sort_keys == [("Remote Game", ""), ("Local Game", "local author")]
+
+
+def test_rebase_keeps_remote_columns_and_lets_deletes_win(tmp_path):
+    local_path, remote_path = tmp_path / "local.db", tmp_path / "remote.db"
+    create_logged_database(local_path)
+    with open_autocommit(local_path) as connection:
+        connection.execute("INSERT INTO games (name, type, min_players) VALUES ('Game', 'game', 2)")
+        connection.execute("INSERT INTO games (name, type) VALUES ('Doomed Game', 'game')")
+        strip_change_log(local_path)
+    shutil.copyfile(local_path, remote_path)
+
+    with open_autocommit(remote_path) as connection:
+        connection.execute("UPDATE games SET min_players = 3 WHERE id = 1")
+        connection.execute("DELETE FROM games WHERE id = 2")
+    with open_autocommit(local_path) as connection:
+        connection.execute("UPDATE games SET name = 'Renamed Game' WHERE id = 1")
+        connection.execute("UPDATE games SET name = 'Edited Doomed Game' WHERE id = 2")
+
+    connection = open_autocommit(local_path)
+    stats = rebase_onto_snapshot(connection, remote_path, database.CHANGE_LOGGED_TABLES)
+    games = connection.execute("SELECT id, name, min_players FROM games ORDER BY id").fetchall()
+    connection.close()
+
+    assert games == [(1, "Renamed Game", 3)]
+    assert stats["skipped"] == 1
@@ -22,3 +22,11 @@ def test_settings_accepts_sqlite_gcs_snapshot_location():
 
     assert settings.sqlite_gcs_bucket == "ludostock-data"
     assert settings.sqlite_gcs_object == "ludostock.db"
+
+
+def test_settings_publish_snapshots_synchronously_by_default():
+    assert Settings.model_fields["sqlite_gcs_sync_interval_seconds"].default == 0.0
+
+
+def test_settings_write_raw_snapshots_by_default():
+    assert Settings.model_fields["sqlite_snapshot_format"].default == "raw"
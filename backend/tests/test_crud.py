@@ -1,4 +1,6 @@
+import json
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from fastapi import HTTPException
@@ -24,24 +26,21 @@ def test_raise_write_error_maps_foreign_key_to_400():
     assert exc_info.value.status_code == 400
 
 
-@pytest.fixture
-def sqlite_game_store(tmp_path, monkeypatch):
+@pytest.fixture(params=["rollback", "wal", "rollback-split-catalog", "wal-split-catalog"])
+def sqlite_game_store(tmp_path, monkeypatch, request):
     database_path = tmp_path / "games.db"
+    storage_mode, _, layout = request.param.partition("-")
 
-    with sqlite3.connect(database_path) as connection:
-        connection.execute("PRAGMA foreign_keys = ON")
-        for statement in database.SCHEMA_STATEMENTS:
-            connection.execute(statement)
-        connection.commit()
-
-    def temp_get_connection():
-        connection = sqlite3.connect(database_path, check_same_thread=False)
-        connection.row_factory = sqlite3.Row
-        connection.execute("PRAGMA foreign_keys = ON")
-        return connection
-
-    monkeypatch.setattr(crud, "get_connection", temp_get_connection)
-    return database_path
+    monkeypatch.setattr(database, "SQLITE_STORAGE_MODE", storage_mode)
+    monkeypatch.setattr(
+        database, "SQLITE_CATALOG_PATH", str(tmp_path / "catalog.db") if layout else ""
+    )
+    monkeypatch.setattr(database, "SQLITE_PATH", str(database_path))
+    monkeypatch.setattr(database, "SQLITE_GCS_BUCKET", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_OBJECT", "")
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    yield database_path
+    database.close_connection_pool()
 
 
 def test_get_games_page_returns_total_and_requested_slice(sqlite_game_store):
@@ -63,6 +62,20 @@ def test_get_games_page_returns_total_and_requested_slice(sqlite_game_store):
     assert [game["name"] for game in page["items"]] == ["Carcassonne"]
 
 
+def test_game_pages_with_a_zero_limit_are_empty(sqlite_game_store):
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    game = crud.create_game(schemas.GameCreate(name="Azul", type="jeu"))
+    crud.add_game_to_personal_collection(auth_user=auth_user, game_id=game["id"])
+
+    page = crud.get_games_page(limit=0)
+    collection_page = crud.get_personal_collection_games(auth_user=auth_user, limit=0)
+
+    assert (page["items"], page["total"], page["has_more"]) == ([], 1, False)
+    assert page["next_cursor"] is None
+    assert (collection_page["items"], collection_page["total"]) == ([], 1)
+    assert collection_page["has_more"] is False
+
+
 def test_get_games_page_filters_by_search_type_and_year(sqlite_game_store):
     crud.create_game(
         schemas.GameCreate(
@@ -104,6 +117,36 @@ def test_get_games_page_filters_by_search_type_and_year(sqlite_game_store):
     assert [game["name"] for game in page["items"]] == ["Azul"]
 
 
+def test_get_games_page_filters_by_numeric_ranges(sqlite_game_store):
+    for name, year, min_players, max_players, min_age, duration in (
+        ("Codenames", 2015, 2, 8, 14, 15),
+        ("Skull", 2011, 3, 6, 10, 30),
+        ("Terraforming Mars", 2016, 1, 5, 12, 120),
+        ("Patchwork", 2014, 2, 2, 8, 15),
+        ("Unknown Party Game", None, None, None, None, None),
+    ):
+        crud.create_game(
+            schemas.GameCreate(
+                name=name,
+                type="jeu",
+                creation_year=year,
+                min_players=min_players,
+                max_players=max_players,
+                min_age=min_age,
+                duration_minutes=duration,
+            )
+        )
+
+    quick_for_five = crud.get_games_page(limit=10, players=5, max_duration=45, sort_by="name")
+    recent_for_kids = crud.get_games_page(
+        limit=10, year_min=2012, year_max=2016, max_age=12, sort_by="name"
+    )
+
+    assert [game["name"] for game in quick_for_five["items"]] == ["Codenames", "Skull"]
+    assert quick_for_five["total"] == 2
+    assert [game["name"] for game in recent_for_kids["items"]] == ["Patchwork", "Terraforming Mars"]
+
+
 def test_get_games_page_sorts_by_author_and_numeric_fields(sqlite_game_store):
     crud.create_game(
         schemas.GameCreate(
@@ -146,6 +189,26 @@ def test_get_games_page_sorts_by_author_and_numeric_fields(sqlite_game_store):
     assert [game["name"] for game in duration_sorted_page["items"]] == ["Patchwork", "Azul", "Cascadia"]
 
 
+def test_contributor_sorts_follow_renames_and_removals(sqlite_game_store):
+    azul = crud.create_game(
+        schemas.GameCreate(name="Azul", type="jeu", authors=["Michael Kiesling"], editors=["Next Move"])
+    )
+    crud.create_game(
+        schemas.GameCreate(name="Cascadia", type="jeu", authors=["Randy Flynn"], editors=["AEG"])
+    )
+    crud.create_game(schemas.GameCreate(name="Solo Game", type="jeu"))
+    kiesling = azul["authors"][0]
+
+    crud.update_author(kiesling["id"], schemas.AuthorUpdate(name="Zoe Kiesling"))
+    renamed_page = crud.get_games_page(sort_by="authors")
+    crud.delete_editor(azul["editors"][0]["id"])
+    editor_page = crud.get_games_page(sort_by="editors")
+
+    assert [game["name"] for game in renamed_page["items"]] == ["Solo Game", "Cascadia", "Azul"]
+    assert [game["name"] for game in editor_page["items"]] == ["Azul", "Solo Game", "Cascadia"]
+    assert "author_sort_key" not in renamed_page["items"][0]
+
+
 def test_update_author_renames_reference(sqlite_game_store):
     author = crud.create_author(schemas.AuthorCreate(name="Wolfgang Kramer"))
 
@@ -188,6 +251,447 @@ def test_get_personal_collection_games_creates_user_collection_and_filters(sqlit
     assert [game["name"] for game in page["items"]] == ["Patchwork"]
 
 
+def test_search_matches_contributors_and_folds_accents(sqlite_game_store):
+    chateaux = crud.create_game(
+        schemas.GameCreate(
+            name="Les Châteaux de Bourgogne", type="jeu", authors=["Stefan Feld"], editors=["Alea"]
+        )
+    )
+    crud.create_game(schemas.GameCreate(name="Feld", type="jeu", authors=["Someone Else"]))
+    crud.create_game(schemas.GameCreate(name="Azul", type="jeu", authors=["Michael Kiesling"]))
+
+    accent_page = crud.get_games_page(search="chateaux bourg")
+    contributor_page = crud.get_games_page(search="feld")
+    crud.update_editor(chateaux["editors"][0]["id"], schemas.EditorUpdate(name="Ravensburger"))
+    renamed_page = crud.get_games_page(search="ravens")
+    crud.delete_game(chateaux["id"])
+    deleted_page = crud.get_games_page(search="chateaux")
+
+    assert [game["name"] for game in accent_page["items"]] == ["Les Châteaux de Bourgogne"]
+    assert [game["name"] for game in contributor_page["items"]] == [
+        "Feld",
+        "Les Châteaux de Bourgogne",
+    ]
+    assert contributor_page["total"] == 2
+    assert [game["name"] for game in renamed_page["items"]] == ["Les Châteaux de Bourgogne"]
+    assert deleted_page["total"] == 0
+
+
+def test_games_page_suggests_close_names_when_a_search_matches_nothing(sqlite_game_store):
+    crud.create_game(schemas.GameCreate(name="Carcassonne", type="jeu"))
+    crud.create_game(schemas.GameCreate(name="Azul", type="jeu"))
+
+    missed_page = crud.get_games_page(search="carcasone")
+    crud.create_game(schemas.GameCreate(name="Carcasonne", type="jeu"))
+    refreshed_suggestions = crud.suggest_game_names("carcasone")
+    found_page = crud.get_games_page(search="carcassonne")
+
+    assert missed_page["total"] == 0
+    assert [suggestion["name"] for suggestion in missed_page["suggestions"]] == ["Carcassonne"]
+    assert [suggestion["name"] for suggestion in refreshed_suggestions] == [
+        "Carcasonne",
+        "Carcassonne",
+    ]
+    assert found_page["suggestions"] == []
+
+
+def test_suggestion_index_is_only_rebuilt_when_game_names_change(sqlite_game_store, monkeypatch):
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    game = crud.create_game(schemas.GameCreate(name="Carcassonne", type="jeu"))
+    builds = []
+    trigram_index = crud.TrigramIndex
+
+    def counting_index(rows):
+        builds.append(1)
+        return trigram_index(rows)
+
+    monkeypatch.setattr(crud, "TrigramIndex", counting_index)
+    crud.suggest_game_names("carcasone")
+    crud.add_game_to_personal_collection(auth_user=auth_user, game_id=game["id"])
+    crud.create_personal_location(auth_user=auth_user, name="Salon")
+    crud.suggest_game_names("carcasone")
+    after_user_writes = len(builds)
+    crud.delete_game(game["id"])
+    remaining = crud.suggest_game_names("carcasone")
+
+    assert after_user_writes == 1
+    assert len(builds) == 2
+    assert remaining == []
+
+
+@pytest.mark.parametrize("sqlite_game_store", ["wal", "wal-split-catalog"], indirect=True)
+def test_suggestion_index_is_not_cached_from_an_older_snapshot(sqlite_game_store):
+    crud.create_game(schemas.GameCreate(name="Carcassonne", type="jeu"))
+
+    with database.unit_of_work():
+        crud.get_games_page(limit=1, include_total=False)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(
+                crud.create_game, schemas.GameCreate(name="Carcasonne", type="jeu")
+            ).result()
+        snapshot_suggestions = crud.suggest_game_names("carcasone")
+    committed_suggestions = crud.suggest_game_names("carcasone")
+
+    assert [suggestion["name"] for suggestion in snapshot_suggestions] == ["Carcassonne"]
+    assert [suggestion["name"] for suggestion in committed_suggestions] == [
+        "Carcasonne",
+        "Carcassonne",
+    ]
+
+
+def test_personal_collection_search_ranks_by_relevance(sqlite_game_store):
+    feld = crud.create_game(schemas.GameCreate(name="Feld", type="jeu"))
+    trajan = crud.create_game(
+        schemas.GameCreate(name="Trajan", type="jeu", authors=["Stefan Feld"])
+    )
+    crud.create_game(schemas.GameCreate(name="Bora Bora", type="jeu", authors=["Stefan Feld"]))
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    crud.add_game_to_personal_collection(auth_user=auth_user, game_id=trajan["id"])
+    crud.add_game_to_personal_collection(auth_user=auth_user, game_id=feld["id"])
+
+    page = crud.get_personal_collection_games(
+        auth_user=auth_user, search="Feld", sort_by="relevance"
+    )
+
+    assert page["total"] == 2
+    assert [game["name"] for game in page["items"]] == ["Feld", "Trajan"]
+
+
+def test_relevance_ordering_ignores_the_sort_direction(sqlite_game_store):
+    crud.create_game(schemas.GameCreate(name="Alhambra", type="jeu", authors=["Zeta Feld"]))
+    crud.create_game(schemas.GameCreate(name="Zeta Feld", type="jeu"))
+
+    ascending = crud.get_games_page(search="Feld", sort_by="relevance", sort_dir="asc")
+    descending = crud.get_games_page(search="Feld", sort_by="relevance", sort_dir="desc")
+    by_name = crud.get_games_page(search="Feld")
+
+    assert [game["name"] for game in ascending["items"]] == ["Zeta Feld", "Alhambra"]
+    assert [game["name"] for game in descending["items"]] == ["Zeta Feld", "Alhambra"]
+    assert [game["name"] for game in by_name["items"]] == ["Alhambra", "Zeta Feld"]
+
+
+def test_search_without_words_matches_no_game(sqlite_game_store):
+    game = crud.create_game(schemas.GameCreate(name="Carcassonne", type="jeu"))
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    crud.add_game_to_personal_collection(auth_user=auth_user, game_id=game["id"])
+
+    page = crud.get_games_page(search="!!", total_mode="estimate")
+    personal_page = crud.get_personal_collection_games(
+        auth_user=auth_user, search="--", total_mode="estimate"
+    )
+    blank_page = crud.get_games_page(search="  ")
+
+    assert page["items"] == [] and page["total"] == 0
+    assert personal_page["items"] == [] and personal_page["total"] == 0
+    assert [game["name"] for game in blank_page["items"]] == ["Carcassonne"]
+
+
+def walk_cursor_pages(fetch_page, limit: int) -> list[str]:
+    """Follow `next_cursor` from the first page to the last, collecting game names."""
+    names: list[str] = []
+    cursor = None
+    while True:
+        page = fetch_page(limit=limit, cursor=cursor)
+        names.extend(game["name"] for game in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return names
+
+
+def test_game_cursors_walk_every_order_like_a_single_page(sqlite_game_store):
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    for index, (name, year, min_players, max_players, duration, author) in enumerate(
+        (
+            ("Azul", 2017, 2, 4, 45, "Michael Kiesling"),
+            ("azul", 2017, 2, 4, 45, "Michael Kiesling"),
+            ("Patchwork", None, 2, 2, None, "Uwe Rosenberg"),
+            ("Cascadia", 2021, 1, 4, 45, "Randy Flynn"),
+            ("Carcassonne", 2000, None, 5, 35, "Klaus-Jurgen Wrede"),
+            ("Feld", None, None, None, 45, "Stefan Feld"),
+            ("Bora Bora", 2013, 2, 4, None, "Stefan Feld"),
+        )
+    ):
+        game = crud.create_game(
+            schemas.GameCreate(
+                name=name,
+                type="jeu" if index % 2 else "extension",
+                creation_year=year,
+                min_players=min_players,
+                max_players=max_players,
+                duration_minutes=duration,
+                authors=[author],
+            )
+        )
+        crud.add_game_to_personal_collection(auth_user=auth_user, game_id=game["id"])
+
+    for sort_by in (
+        "relevance",
+        "name",
+        "type",
+        "creation_year",
+        "players",
+        "duration_minutes",
+        "authors",
+        "editors",
+    ):
+        for sort_dir in ("asc", "desc"):
+            for search in (None, "a"):
+                options = {"search": search, "sort_by": sort_by, "sort_dir": sort_dir}
+                expected = [
+                    game["name"] for game in crud.get_games_page(limit=100, **options)["items"]
+                ]
+
+                assert (
+                    walk_cursor_pages(
+                        lambda **page: crud.get_games_page(**options, **page), limit=2
+                    )
+                    == expected
+                )
+                assert (
+                    walk_cursor_pages(
+                        lambda **page: crud.get_personal_collection_games(
+                            auth_user=auth_user, **options, **page
+                        ),
+                        limit=3,
+                    )
+                    == expected
+                )
+
+
+def test_listing_cursors_resume_after_the_last_id_and_reject_foreign_cursors(sqlite_game_store):
+    for name in ("Uwe Rosenberg", "Bruno Cathala", "Antoine Bauza", "Reiner Knizia"):
+        crud.create_author(schemas.AuthorCreate(name=name))
+
+    first_page = crud.get_authors(limit=3)
+    cursor = crud.get_next_page_cursor("authors", first_page, limit=3)
+    second_page = crud.get_authors(limit=3, cursor=cursor)
+
+    with pytest.raises(HTTPException) as foreign_exc_info:
+        crud.get_editors(limit=3, cursor=cursor)
+    with pytest.raises(HTTPException) as malformed_exc_info:
+        crud.get_games_page(cursor="not-a-cursor")
+
+    assert [author["name"] for author in second_page] == ["Reiner Knizia"]
+    assert crud.get_next_page_cursor("authors", second_page, limit=3) is None
+    assert crud.get_authors(skip=3, limit=3) == second_page
+    assert foreign_exc_info.value.status_code == 400
+    assert malformed_exc_info.value.status_code == 400
+
+
+def test_game_pages_can_skip_cache_or_estimate_their_total(sqlite_game_store):
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    for name in ("Azul", "Patchwork", "Cascadia"):
+        game = crud.create_game(schemas.GameCreate(name=name, type="jeu"))
+        crud.add_game_to_personal_collection(auth_user=auth_user, game_id=game["id"])
+
+    counted = crud.get_games_page(limit=2, game_type=" JEU ")
+    with sqlite3.connect(database.SQLITE_CATALOG_PATH or sqlite_game_store) as connection:
+        connection.execute("INSERT INTO games (name, type) VALUES ('Written Elsewhere', 'jeu')")
+    cached = crud.get_games_page(limit=2, game_type="jeu")
+    uncounted = crud.get_personal_collection_games(
+        auth_user=auth_user, limit=3, include_total=False
+    )
+    crud.create_game(schemas.GameCreate(name="Bora Bora", type="jeu"))
+    recounted = crud.get_games_page(limit=2, game_type="jeu")
+    estimated = crud.get_games_page(limit=2, total_mode="estimate")
+    filtered_estimate = crud.get_personal_collection_games(
+        auth_user=auth_user, search="azul", total_mode="estimate"
+    )
+
+    assert (counted["total"], counted["has_more"]) == (3, True)
+    assert cached["total"] == 3
+    assert (uncounted["total"], uncounted["has_more"], len(uncounted["items"])) == (None, False, 3)
+    assert recounted["total"] == 5
+    assert (estimated["total"], estimated["total_is_estimate"]) == (5, True)
+    assert (filtered_estimate["total"], filtered_estimate["total_is_estimate"]) == (1, False)
+
+
+def test_personal_estimate_counts_a_game_stored_at_several_locations_once(sqlite_game_store):
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    game = crud.create_game(schemas.GameCreate(name="Azul", type="jeu"))
+    location = crud.create_personal_location(auth_user=auth_user, name="Salon")
+    crud.add_game_to_personal_collection(auth_user=auth_user, game_id=game["id"])
+    with sqlite3.connect(sqlite_game_store) as connection:
+        connection.execute(
+            "INSERT INTO collection_games (collection_id, game_id, location_id) "
+            "SELECT collection_id, game_id, ? FROM collection_games",
+            (location["id"],),
+        )
+
+    counted = crud.get_personal_collection_games(auth_user=auth_user)
+    estimated = crud.get_personal_collection_games(auth_user=auth_user, total_mode="estimate")
+
+    assert counted["total"] == 1
+    assert (estimated["total"], estimated["total_is_estimate"]) == (1, True)
+
+
+def test_game_total_cache_ignores_uncommitted_writes(sqlite_game_store):
+    crud.create_game(schemas.GameCreate(name="Azul", type="jeu"))
+
+    with pytest.raises(RuntimeError):
+        with database.unit_of_work(write=True):
+            crud.create_game(schemas.GameCreate(name="Patchwork", type="jeu"))
+            pending_total = crud.get_games_page(limit=1)["total"]
+            raise RuntimeError("roll back")
+    committed_total = crud.get_games_page(limit=1)["total"]
+
+    assert pending_total == 2
+    assert committed_total == 1
+
+
+@pytest.mark.parametrize("sqlite_game_store", ["wal", "wal-split-catalog"], indirect=True)
+def test_game_total_cache_ignores_totals_counted_from_an_older_snapshot(sqlite_game_store):
+    crud.create_game(schemas.GameCreate(name="Azul", type="jeu"))
+
+    with database.unit_of_work():
+        crud.get_games_page(limit=1, include_total=False)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # The write commits after this unit's snapshot began, but before it counts.
+            executor.submit(
+                crud.create_game, schemas.GameCreate(name="Patchwork", type="jeu")
+            ).result()
+        snapshot_total = crud.get_games_page(limit=1)["total"]
+    committed_total = crud.get_games_page(limit=1)["total"]
+
+    assert snapshot_total == 1
+    assert committed_total == 2
+
+
+def test_game_fragments_follow_catalog_writes(sqlite_game_store):
+    owner = {"name": "Alice Example", "email": "alice@example.com"}
+    azul = crud.create_game(
+        schemas.GameCreate(name="Azul", type="jeu", authors=["Michael Kiesling"], editors=["Next Move"])
+    )
+    crystal = crud.create_game(
+        schemas.GameCreate(name="Azul Crystal Mosaic", type="extension", extension_of_id=azul["id"])
+    )
+    crud.add_game_to_personal_collection(auth_user=owner, game_id=crystal["id"])
+    cached_page = crud.get_games_page(sort_by="name")
+    cached_board = crud.get_personal_collection_board(auth_user=owner)
+
+    crud.update_author(azul["authors"][0]["id"], schemas.AuthorUpdate(name="M. Kiesling"))
+    crud.delete_editor(azul["editors"][0]["id"])
+    renamed_page = crud.get_games_page(sort_by="name")
+    crud.delete_game(azul["id"])
+    board = crud.get_personal_collection_board(auth_user=owner)
+    with sqlite3.connect(database.SQLITE_CATALOG_PATH or sqlite_game_store) as connection:
+        connection.execute(
+            "UPDATE games SET name = 'Restored Elsewhere' WHERE id = ?", (crystal["id"],)
+        )
+    cached_name = crud.get_games_page()["items"][0]["name"]
+    database.close_connection_pool()
+    swapped_name = crud.get_games_page()["items"][0]["name"]
+
+    assert cached_page["items"][0]["authors"] == [
+        {"id": azul["authors"][0]["id"], "name": "Michael Kiesling"}
+    ]
+    assert cached_board["items"][0]["game"]["extension_of_id"] == azul["id"]
+    assert renamed_page["items"][0]["authors"] == [
+        {"id": azul["authors"][0]["id"], "name": "M. Kiesling"}
+    ]
+    assert renamed_page["items"][0]["editors"] == []
+    assert board["items"][0]["game"]["extension_of_id"] is None
+    assert (cached_name, swapped_name) == ("Azul Crystal Mosaic", "Restored Elsewhere")
+
+
+def test_game_fragments_are_invalidated_when_writes_commit(sqlite_game_store):
+    azul = crud.create_game(
+        schemas.GameCreate(name="Azul", type="jeu", authors=["Michael Kiesling"])
+    )
+    author_id = azul["authors"][0]["id"]
+    crud.get_games_page()
+
+    with pytest.raises(RuntimeError):
+        with database.unit_of_work(write=True):
+            crud.update_author(author_id, schemas.AuthorUpdate(name="M. Kiesling"))
+            pending_page = crud.get_games_page()
+            raise RuntimeError("roll back")
+    rolled_back_page = crud.get_games_page()
+    with database.unit_of_work(write=True):
+        crud.update_author(author_id, schemas.AuthorUpdate(name="Kiesling"))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Another request still reads, and may cache, the committed name until this commit.
+            concurrent_page = executor.submit(crud.get_games_page).result()
+    committed_page = crud.get_games_page()
+
+    assert pending_page["items"][0]["authors"][0]["name"] == "M. Kiesling"
+    assert rolled_back_page["items"][0]["authors"][0]["name"] == "Michael Kiesling"
+    assert concurrent_page["items"][0]["authors"][0]["name"] == "Michael Kiesling"
+    assert committed_page["items"][0]["authors"][0]["name"] == "Kiesling"
+
+
+def test_game_cache_serves_details_and_shared_boards_until_writes_touch_them(sqlite_game_store):
+    azul = crud.create_game(
+        schemas.GameCreate(name="Azul", type="jeu", artists=["Chris Quilliams"])
+    )
+    alice = {"name": "Alice Example", "email": "alice@example.com"}
+    bob = {"name": "Bob Example", "email": "bob@example.com"}
+    crud.add_game_to_personal_collection(auth_user=alice, game_id=azul["id"])
+    settings = crud.update_personal_collection_share_settings(auth_user=alice, share_enabled=True)
+    shared = crud.join_shared_collection(auth_user=bob, share_token=settings["share_token"])
+    collection_id = shared["collection_id"]
+
+    before = crud.get_game_cache_stats()
+    detail = crud.get_game(azul["id"])
+    board = crud.get_shared_collection_board(auth_user=bob, collection_id=collection_id)
+    cached = crud.get_game_cache_stats()
+    crud.delete_artist(azul["artists"][0]["id"])
+    refreshed = crud.get_shared_collection_board(auth_user=bob, collection_id=collection_id)
+    after = crud.get_game_cache_stats()
+
+    assert (cached["hits"] - before["hits"], cached["misses"] - before["misses"]) == (2, 0)
+    assert board["items"][0]["game"] == detail == azul
+    assert after["invalidations"] - cached["invalidations"] == 1
+    assert refreshed["items"][0]["game"]["artists"] == []
+    assert json.loads(crud.get_game(azul["id"], as_json=True)) == refreshed["items"][0]["game"]
+    assert crud.get_game(azul["id"] + 1) is None
+
+
+def test_encoded_game_pages_and_boards_match_their_payloads(sqlite_game_store):
+    owner = {"name": "Alice Example", "email": "alice@example.com"}
+    for name in ("Azul", "Château Combo", "Patchwork"):
+        game = crud.create_game(
+            schemas.GameCreate(name=name, type="jeu", authors=["Uwe Rosenberg"])
+        )
+        crud.add_game_to_personal_collection(auth_user=owner, game_id=game["id"])
+    crud.create_personal_location(auth_user=owner, name="Salon")
+
+    # Once while hydrating the fragments, once from the cache.
+    for _ in range(2):
+        encoded_page = crud.get_games_page(limit=2, sort_by="name", as_json=True)
+        encoded_collection = crud.get_personal_collection_games(
+            auth_user=owner, search="combo", as_json=True
+        )
+        encoded_board = crud.get_personal_collection_board(auth_user=owner, as_json=True)
+
+        assert json.loads(encoded_page) == crud.get_games_page(limit=2, sort_by="name")
+        assert json.loads(encoded_collection) == crud.get_personal_collection_games(
+            auth_user=owner, search="combo"
+        )
+        assert json.loads(encoded_board) == crud.get_personal_collection_board(auth_user=owner)
+
+
+def test_id_sets_are_bound_as_one_parameter_beyond_the_variable_limit(sqlite_game_store):
+    authors = [
+        crud.create_author(schemas.AuthorCreate(name=name))
+        for name in ("Uwe Rosenberg", "Bruno Cathala")
+    ]
+    owner = {"name": "Alice Example", "email": "alice@example.com"}
+    azul = crud.create_game(schemas.GameCreate(name="Azul", type="jeu"))
+    crud.add_game_to_personal_collection(auth_user=owner, game_id=azul["id"])
+
+    rows = crud._fetch_rows_by_ids("authors", [*range(1000, 41000), authors[1]["id"]])
+    _, shares_by_collection, games_by_collection = crud._load_collection_relations(
+        list(range(1, 40001)), []
+    )
+
+    assert rows == [authors[1]]
+    assert shares_by_collection == {}
+    assert [game["game_id"] for games in games_by_collection.values() for game in games] == [
+        azul["id"]
+    ]
+
+
 def test_add_game_to_personal_collection_rejects_duplicate_game(sqlite_game_store):
     azul = crud.create_game(
         schemas.GameCreate(name="Azul", type="jeu", authors=["Michael Kiesling"], editors=["Next Move"])
@@ -202,6 +706,30 @@ def test_add_game_to_personal_collection_rejects_duplicate_game(sqlite_game_stor
     assert exc_info.value.status_code == 409
 
 
+def test_create_collection_game_rejects_a_missing_game(sqlite_game_store):
+    azul = crud.create_game(schemas.GameCreate(name="Azul", type="jeu"))
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    added = crud.add_game_to_personal_collection(auth_user=auth_user, game_id=azul["id"])
+    collection_id = added["collection_id"]
+
+    with pytest.raises(HTTPException) as exc_info:
+        crud.create_collection_game(
+            schemas.CollectionGameCreate(collection_id=collection_id, game_id=azul["id"] + 1)
+        )
+
+    assert exc_info.value.status_code == 400
+
+
+def test_delete_game_removes_it_from_collections(sqlite_game_store):
+    azul = crud.create_game(schemas.GameCreate(name="Azul", type="jeu"))
+    auth_user = {"name": "Alice Example", "email": "alice@example.com"}
+    crud.add_game_to_personal_collection(auth_user=auth_user, game_id=azul["id"])
+
+    crud.delete_game(azul["id"])
+
+    assert crud.get_collection_games() == []
+
+
 def test_get_personal_collection_board_groups_items_and_locations(sqlite_game_store):
     azul = crud.create_game(
         schemas.GameCreate(name="Azul", type="jeu", authors=["Michael Kiesling"], editors=["Next Move"])
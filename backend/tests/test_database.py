@@ -1,7 +1,11 @@
 import shutil
 import sqlite3
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
 from backend.app import database
 
 
@@ -19,6 +23,10 @@ class FakeStorageState:
     def __init__(self, remote_path: Path):
         self.remote_path = remote_path
         self.generation = 1 if remote_path.exists() else None
+        self.clients_created = 0
+        self.metadata_requests = 0
+        self.ranged_reads = 0
+        self.downloads = 0
 
 
 class FakeBlob:
@@ -27,18 +35,38 @@ class FakeBlob:
     def __init__(self, state: FakeStorageState):
         self._state = state
         self.generation = None
+        self.size = None
 
     def reload(self):
         """Refresh the blob metadata from the fake remote store."""
+        self._state.metadata_requests += 1
+        self._refresh()
+
+    def _refresh(self):
+        """Copy the fake remote metadata onto the blob, as object responses do."""
         if not self._state.remote_path.exists():
             raise FakeNotFound
         if self._state.generation is None:
             self._state.generation = 1
         self.generation = str(self._state.generation)
+        self.size = self._state.remote_path.stat().st_size
+
+    def download_as_bytes(
+        self, start: int, end: int, if_generation_match: int | None = None
+    ) -> bytes:
+        """Return an inclusive byte range of the fake remote object."""
+        self._refresh()
+        if if_generation_match is not None and if_generation_match != self._state.generation:
+            raise FakePreconditionFailed
+        self._state.ranged_reads += 1
+        with self._state.remote_path.open("rb") as handle:
+            handle.seek(start)
+            return handle.read(end - start + 1)
 
     def download_to_filename(self, filename: str | Path):
         """Copy the fake remote object to a local file."""
-        self.reload()
+        self._refresh()
+        self._state.downloads += 1
         shutil.copyfile(self._state.remote_path, filename)
 
     def upload_from_filename(self, filename: str | Path, if_generation_match: int | None = None):
@@ -75,6 +103,7 @@ class FakeStorageClient:
     def __init__(self):
         if self.state is None:
             raise RuntimeError("Fake storage state must be configured before use")
+        self.state.clients_created += 1
 
     def bucket(self, _name: str) -> FakeBucket:
         """Return the fake bucket instance."""
@@ -99,8 +128,12 @@ def configure_fake_storage(monkeypatch, tmp_path: Path, remote_exists: bool):
     monkeypatch.setattr(database, "SQLITE_GCS_BUCKET", "ludostock-data")
     monkeypatch.setattr(database, "SQLITE_GCS_OBJECT", "ludostock.db")
     monkeypatch.setattr(database, "_DB_INITIALIZED", False)
-    monkeypatch.setattr(database, "_REMOTE_GENERATION", None)
-    monkeypatch.setattr(database, "_HAS_UNSYNCED_LOCAL_CHANGES", False)
+    monkeypatch.setattr(database, "_REMOTE_GENERATIONS", {})
+    monkeypatch.setattr(database, "_UNSYNCED_DATABASES", set())
+    monkeypatch.setattr(database._RESOURCES, "snapshot_syncers", {})
+    monkeypatch.setattr(database._RESOURCES, "storage_bucket", None)
+    monkeypatch.setattr(database, "_REPLICA_SERVING_PATHS", {})
+    monkeypatch.setattr(database, "_RETIRED_REPLICA_PATHS", {})
     monkeypatch.setattr(
         database,
         "_get_storage_client_and_exceptions",
@@ -130,7 +163,657 @@ def test_write_commit_uploads_new_snapshot_to_remote_storage(tmp_path, monkeypat
         connection.execute("INSERT INTO authors (name) VALUES (?)", ("Uploaded Author",))
         connection.commit()
 
-    with sqlite3.connect(remote_path) as connection:
+    assert database.flush_sqlite_sync(timeout=5)
+    restored_path = tmp_path / "restored.db"
+    shutil.copyfile(remote_path, tmp_path / "remote.download")
+    database._restore_snapshot_file(tmp_path / "remote.download", restored_path)
+    with sqlite3.connect(restored_path) as connection:
         author_name = connection.execute("SELECT name FROM authors").fetchone()[0]
 
     assert author_name == "Uploaded Author"
+
+
+def test_restored_snapshot_ignores_a_leftover_wal_of_the_replaced_file(tmp_path):
+    local_path = tmp_path / "local.db"
+    leftover_wal = tmp_path / "leftover.db-wal"
+    connection = sqlite3.connect(local_path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA wal_autocheckpoint = 0")
+    connection.execute("CREATE TABLE authors (id INTEGER PRIMARY KEY, name TEXT)")
+    connection.execute("INSERT INTO authors (name) VALUES ('Stale Author')")
+    connection.commit()
+    shutil.copyfile(tmp_path / "local.db-wal", leftover_wal)
+    connection.close()
+    shutil.copyfile(leftover_wal, tmp_path / "local.db-wal")
+    snapshot_path = tmp_path / "remote.download"
+    with sqlite3.connect(snapshot_path) as snapshot:
+        snapshot.execute("CREATE TABLE authors (id INTEGER PRIMARY KEY, name TEXT)")
+        snapshot.execute("INSERT INTO authors (name) VALUES ('Remote Author')")
+    snapshot.close()
+
+    database._restore_snapshot_file(snapshot_path, local_path)
+    with sqlite3.connect(local_path) as restored:
+        names = [row[0] for row in restored.execute("SELECT name FROM authors")]
+    restored.close()
+
+    assert names == ["Remote Author"]
+    assert not (tmp_path / "local.db-wal").exists()
+
+
+def test_snapshot_syncs_reuse_one_client_and_skip_metadata_requests(tmp_path, monkeypatch):
+    configure_fake_storage(monkeypatch, tmp_path, remote_exists=True)
+    monkeypatch.setattr(database, "SQLITE_GCS_SYNC_INTERVAL_SECONDS", 0)
+    database.init_db()
+    startup_metadata_requests = FakeStorageClient.state.metadata_requests
+
+    for name in ["First Author", "Second Author"]:
+        with database.get_connection(write=True) as connection:
+            connection.execute("INSERT INTO authors (name) VALUES (?)", (name,))
+            connection.commit()
+    database.close_connection_pool()
+
+    assert FakeStorageClient.state.clients_created == 1
+    assert FakeStorageClient.state.metadata_requests == startup_metadata_requests
+    assert database._remote_generation() == FakeStorageClient.state.generation == 4
+
+
+def test_init_db_downloads_large_snapshots_with_parallel_ranged_reads(tmp_path, monkeypatch):
+    local_path, remote_path = configure_fake_storage(monkeypatch, tmp_path, remote_exists=True)
+    with sqlite3.connect(remote_path) as connection:
+        connection.executemany(
+            "INSERT INTO authors (name) VALUES (?)",
+            [(f"Remote Author {index:05d}",) for index in range(2000)],
+        )
+    monkeypatch.setattr(database, "SQLITE_DOWNLOAD_CHUNK_BYTES", 4096)
+
+    database.init_db()
+
+    with sqlite3.connect(local_path) as connection:
+        author_count = connection.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+
+    assert FakeStorageClient.state.ranged_reads > 1
+    assert FakeStorageClient.state.downloads == 0
+    assert author_count == 2001
+
+
+def test_init_db_skips_redundant_startup_download_and_upload(tmp_path, monkeypatch):
+    local_path, _ = configure_fake_storage(monkeypatch, tmp_path, remote_exists=False)
+    database.init_db()
+    published_generation = FakeStorageClient.state.generation
+
+    monkeypatch.setattr(database, "SQLITE_PATH", str(tmp_path / "cold-start.db"))
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    monkeypatch.setattr(database, "_REMOTE_GENERATIONS", {})
+    database.init_db()
+
+    assert FakeStorageClient.state.downloads == 1
+    assert FakeStorageClient.state.generation == published_generation
+
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    monkeypatch.setattr(database, "_REMOTE_GENERATIONS", {})
+    database.init_db()
+
+    assert FakeStorageClient.state.downloads == 1
+    assert FakeStorageClient.state.generation == published_generation
+    assert database._remote_generation() == published_generation
+
+
+def test_start_database_hydration_serves_the_seed_read_only_until_restored(tmp_path, monkeypatch):
+    local_path, remote_path = configure_fake_storage(monkeypatch, tmp_path, remote_exists=True)
+    seed_path = tmp_path / "seed.db"
+    with sqlite3.connect(seed_path) as connection:
+        connection.execute("CREATE TABLE authors (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE)")
+        connection.execute("INSERT INTO authors (name) VALUES (?)", ("Seed Author",))
+    monkeypatch.setattr(database, "SQLITE_SEED_PATH", str(seed_path))
+    monkeypatch.setattr(database, "SQLITE_HYDRATE_IN_BACKGROUND", True)
+    release_download = threading.Event()
+    download_snapshot = database._download_database_from_gcs
+
+    def slow_download(target: str = "main") -> bool:
+        release_download.wait(timeout=5)
+        return download_snapshot(target)
+
+    monkeypatch.setattr(database, "_download_database_from_gcs", slow_download)
+    database.close_connection_pool()
+
+    assert database.start_database_hydration() is True
+    with database.get_connection() as connection:
+        seed_names = [row["name"] for row in connection.execute("SELECT name FROM authors")]
+    with pytest.raises(database.DatabaseHydratingError):
+        with database.get_connection(write=True):
+            pass
+
+    release_download.set()
+    deadline = time.monotonic() + 5
+    while database.is_serving_seed_database() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with database.get_connection() as connection:
+        hydrated_names = [row["name"] for row in connection.execute("SELECT name FROM authors")]
+    database.close_connection_pool()
+
+    assert seed_names == ["Seed Author"]
+    assert hydrated_names == ["Remote Author"]
+
+
+def test_replica_rejects_writes_and_never_uploads(tmp_path, monkeypatch):
+    configure_fake_storage(monkeypatch, tmp_path, remote_exists=True)
+    monkeypatch.setattr(database, "SQLITE_INSTANCE_ROLE", "replica")
+    database.close_connection_pool()
+
+    database.init_db()
+    with database.get_connection() as connection:
+        names = [row["name"] for row in connection.execute("SELECT name FROM authors")]
+    with pytest.raises(database.ReplicaWriteRejectedError):
+        with database.get_connection(write=True):
+            pass
+    database.close_connection_pool()
+
+    assert names == ["Remote Author"]
+    assert FakeStorageClient.state.generation == 1
+
+
+def test_replica_poll_swaps_to_the_newer_snapshot_and_drains_readers(tmp_path, monkeypatch):
+    _, remote_path = configure_fake_storage(monkeypatch, tmp_path, remote_exists=True)
+    monkeypatch.setattr(database, "SQLITE_INSTANCE_ROLE", "replica")
+    database.close_connection_pool()
+    database.init_db()
+
+    assert database.poll_remote_snapshot() is False
+
+    reader = database.open_unit_of_work()
+    with sqlite3.connect(remote_path) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES (?)", ("Published Author",))
+    FakeStorageClient.state.generation += 1
+
+    assert database.poll_remote_snapshot() is True
+    in_flight_names = [
+        row["name"] for row in reader.connection.execute("SELECT name FROM authors ORDER BY name")
+    ]
+    reader.commit()
+    reader.close()
+    with database.get_connection() as connection:
+        swapped_names = [
+            row["name"] for row in connection.execute("SELECT name FROM authors ORDER BY name")
+        ]
+    database.close_connection_pool()
+
+    assert in_flight_names == ["Remote Author"]
+    assert swapped_names == ["Published Author", "Remote Author"]
+    assert database._serving_database_path() == database._replica_snapshot_path(2)
+
+
+def test_upload_conflict_replays_local_changes_onto_the_newer_snapshot(tmp_path, monkeypatch):
+    local_path, remote_path = configure_fake_storage(monkeypatch, tmp_path, remote_exists=True)
+    monkeypatch.setattr(database, "SQLITE_SNAPSHOT_FORMAT", "raw")
+    monkeypatch.setattr(database, "SQLITE_GCS_SYNC_INTERVAL_SECONDS", 0)
+    database.close_connection_pool()
+    database.init_db()
+
+    with sqlite3.connect(remote_path) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES (?)", ("Other Writer Author",))
+    FakeStorageClient.state.generation += 1
+
+    with database.get_connection(write=True) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES (?)", ("Local Author",))
+        connection.commit()
+    database.close_connection_pool()
+
+    with sqlite3.connect(remote_path) as connection:
+        remote_authors = connection.execute("SELECT id, name FROM authors ORDER BY id").fetchall()
+    with sqlite3.connect(local_path) as connection:
+        pending_changes = connection.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+
+    assert remote_authors == [(1, "Remote Author"), (2, "Other Writer Author"), (3, "Local Author")]
+    assert database._remote_generation() == FakeStorageClient.state.generation
+    assert pending_changes == 0
+
+
+def test_compressed_snapshot_is_compacted_and_round_trips(tmp_path, monkeypatch):
+    local_path, remote_path = configure_fake_storage(monkeypatch, tmp_path, remote_exists=False)
+    monkeypatch.setattr(database, "SQLITE_SNAPSHOT_FORMAT", "gzip")
+    monkeypatch.setattr(database, "SQLITE_GCS_SYNC_INTERVAL_SECONDS", 0)
+    database.init_db()
+
+    with database.get_connection(write=True) as connection:
+        connection.executemany(
+            "INSERT INTO authors (name) VALUES (?)",
+            [(f"Author {index:05d}",) for index in range(3000)],
+        )
+        connection.commit()
+    with database.get_connection(write=True) as connection:
+        connection.execute("DELETE FROM authors WHERE name <> ?", ("Author 00000",))
+        connection.commit()
+    database.close_connection_pool()
+
+    assert remote_path.read_bytes().startswith(database.SNAPSHOT_MAGIC)
+    assert remote_path.stat().st_size * 10 < local_path.stat().st_size
+
+    monkeypatch.setattr(database, "SQLITE_PATH", str(tmp_path / "cold-start.db"))
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    database.init_db()
+    with sqlite3.connect(tmp_path / "cold-start.db") as connection:
+        names = [row[0] for row in connection.execute("SELECT name FROM authors")]
+
+    assert names == ["Author 00000"]
+
+
+def test_compressed_snapshot_with_bad_checksum_is_rejected(tmp_path, monkeypatch):
+    local_path, _ = configure_fake_storage(monkeypatch, tmp_path, remote_exists=True)
+    snapshot_path = tmp_path / "snapshot.gz"
+    monkeypatch.setattr(database, "SQLITE_PATH", str(tmp_path / "remote" / "ludostock.db"))
+    database._create_compressed_snapshot(snapshot_path)
+    corrupted = bytearray(snapshot_path.read_bytes())
+    corrupted[len(database.SNAPSHOT_MAGIC)] ^= 0xFF
+    snapshot_path.write_bytes(bytes(corrupted))
+
+    with pytest.raises(ValueError):
+        database._restore_snapshot_file(snapshot_path, local_path)
+
+    assert not local_path.exists()
+
+
+def configure_background_sync(
+    monkeypatch, tmp_path: Path, interval_seconds: float, failures: int = 0
+) -> list[str]:
+    """Use fake storage with a debounced syncer and record every snapshot upload attempt."""
+    configure_fake_storage(monkeypatch, tmp_path, remote_exists=False)
+    monkeypatch.setattr(database, "SQLITE_GCS_SYNC_INTERVAL_SECONDS", interval_seconds)
+    monkeypatch.setattr(database, "SQLITE_GCS_SYNC_MAX_BACKOFF_SECONDS", interval_seconds * 4)
+    database.init_db()
+    uploads: list[str] = []
+
+    def fake_upload(reason: str, database: str = "main") -> bool:
+        uploads.append(reason)
+        if len(uploads) <= failures:
+            raise OSError("storage unavailable")
+        return True
+
+    monkeypatch.setattr(database, "_upload_database_to_gcs", fake_upload)
+
+    return uploads
+
+
+def test_background_sync_coalesces_a_burst_of_commits_into_one_upload(tmp_path, monkeypatch):
+    uploads = configure_background_sync(monkeypatch, tmp_path, interval_seconds=0.2)
+
+    for index in range(5):
+        with database.get_connection(write=True) as connection:
+            connection.execute("INSERT INTO authors (name) VALUES (?)", (f"Author {index}",))
+            connection.commit()
+
+    assert uploads == []
+    assert database.flush_sqlite_sync(timeout=5)
+    stats = database.get_sqlite_syncer_stats()
+    database.stop_sqlite_syncer()
+    database.close_connection_pool()
+
+    assert uploads == ["commit"]
+    assert stats["coalesced_commits"] == 5
+    assert stats["dirty"] is False
+
+
+def test_background_sync_skips_commits_without_changes(tmp_path, monkeypatch):
+    uploads = configure_background_sync(monkeypatch, tmp_path, interval_seconds=0.01)
+
+    with database.get_connection(write=True) as connection:
+        connection.execute("UPDATE authors SET name = name WHERE name = ?", ("Missing Author",))
+        connection.commit()
+
+    database.stop_sqlite_syncer()
+    database.close_connection_pool()
+
+    assert uploads == []
+
+
+def test_background_sync_retries_failed_uploads_with_backoff(tmp_path, monkeypatch):
+    uploads = configure_background_sync(monkeypatch, tmp_path, interval_seconds=0.01, failures=2)
+
+    with database.get_connection(write=True) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES (?)", ("Retried Author",))
+        connection.commit()
+
+    deadline = time.monotonic() + 5
+    while database.get_sqlite_syncer_stats()["uploads"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = database.get_sqlite_syncer_stats()
+    database.stop_sqlite_syncer()
+    database.close_connection_pool()
+
+    assert uploads == ["commit", "commit", "commit"]
+    assert stats["failed_uploads"] == 2
+    assert stats["uploads"] == 1
+    assert not database._has_unsynced_changes()
+
+
+def configure_local_database(monkeypatch, tmp_path: Path, pool_size: int = 2) -> Path:
+    """Point the database module at a temp SQLite file without remote sync."""
+    local_path = tmp_path / "local.db"
+
+    monkeypatch.setattr(database, "SQLITE_PATH", str(local_path))
+    monkeypatch.setattr(database, "SQLITE_GCS_BUCKET", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_OBJECT", "")
+    monkeypatch.setattr(database, "SQLITE_POOL_SIZE", pool_size)
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    database.close_connection_pool()
+
+    return local_path
+
+
+def test_get_connection_reuses_pooled_connection_with_pragmas_applied(tmp_path, monkeypatch):
+    configure_local_database(monkeypatch, tmp_path)
+
+    with database.get_connection() as connection:
+        foreign_keys = connection.execute("PRAGMA foreign_keys").fetchone()[0]
+        first_connection_id = id(connection)
+        with database.get_connection() as nested_connection:
+            assert nested_connection is connection
+
+    with database.get_connection() as connection:
+        second_connection_id = id(connection)
+
+    stats = database.get_connection_pool_stats()
+    database.close_connection_pool()
+
+    assert foreign_keys == 1
+    assert connection.row_factory is sqlite3.Row
+    assert first_connection_id == second_connection_id
+    assert stats["open"] == 1
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 2
+
+
+def test_connection_pool_waits_for_a_released_connection(tmp_path, monkeypatch):
+    configure_local_database(monkeypatch, tmp_path, pool_size=1)
+    checked_out = threading.Event()
+    release = threading.Event()
+
+    def hold_connection():
+        with database.get_connection():
+            checked_out.set()
+            release.wait(timeout=5)
+
+    holder = threading.Thread(target=hold_connection)
+    holder.start()
+    checked_out.wait(timeout=5)
+    threading.Timer(0.05, release.set).start()
+
+    with database.get_connection() as connection:
+        connection.execute("SELECT 1").fetchone()
+        in_use = database.get_connection_pool_stats()["in_use"]
+
+    holder.join(timeout=5)
+    stats = database.get_connection_pool_stats()
+    database.close_connection_pool()
+
+    assert in_use == 1
+    assert stats["open"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["wait_ms_max"] >= 40
+
+
+def test_wal_mode_sends_writes_to_the_writer_and_reads_to_read_only_connections(
+    tmp_path, monkeypatch
+):
+    local_path = configure_local_database(monkeypatch, tmp_path)
+    monkeypatch.setattr(database, "SQLITE_STORAGE_MODE", "wal")
+
+    with database.get_connection(write=True) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES (?)", ("Writer Author",))
+        connection.commit()
+
+    with database.get_connection() as connection:
+        author_name = connection.execute("SELECT name FROM authors").fetchone()["name"]
+        try:
+            connection.execute("INSERT INTO authors (name) VALUES (?)", ("Reader Author",))
+        except sqlite3.OperationalError as exc:
+            read_only_error = str(exc)
+        else:
+            read_only_error = ""
+
+    stats = database.get_connection_pool_stats()
+    database.close_connection_pool()
+    with sqlite3.connect(local_path) as connection:
+        journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert journal_mode == "wal"
+    assert author_name == "Writer Author"
+    assert "readonly" in read_only_error
+    assert stats["read_only"] is True
+    assert stats["writer"]["acquisitions"] == 1
+
+
+def test_wal_mode_readers_do_not_wait_for_an_open_write_transaction(tmp_path, monkeypatch):
+    configure_local_database(monkeypatch, tmp_path)
+    monkeypatch.setattr(database, "SQLITE_STORAGE_MODE", "wal")
+    write_started = threading.Event()
+    finish_write = threading.Event()
+
+    def slow_write():
+        with database.unit_of_work(write=True) as connection:
+            connection.execute("INSERT INTO authors (name) VALUES (?)", ("Pending Author",))
+            write_started.set()
+            finish_write.wait(timeout=5)
+
+    writer = threading.Thread(target=slow_write)
+    writer.start()
+    write_started.wait(timeout=5)
+
+    with database.get_connection() as connection:
+        visible_during_write = connection.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+
+    finish_write.set()
+    writer.join(timeout=5)
+    with database.get_connection() as connection:
+        visible_after_write = connection.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+    database.close_connection_pool()
+
+    assert visible_during_write == 0
+    assert visible_after_write == 1
+
+
+def test_writer_queue_reports_queue_depth_and_wait_time(tmp_path, monkeypatch):
+    configure_local_database(monkeypatch, tmp_path)
+    monkeypatch.setattr(database, "SQLITE_STORAGE_MODE", "wal")
+    holding = threading.Event()
+
+    def hold_writer():
+        with database.get_connection(write=True):
+            holding.set()
+            time.sleep(0.05)
+
+    holder = threading.Thread(target=hold_writer)
+    holder.start()
+    holding.wait(timeout=5)
+    with database.get_connection(write=True) as connection:
+        connection.execute("INSERT INTO authors (name) VALUES (?)", ("Queued Author",))
+    holder.join(timeout=5)
+
+    writer_stats = database.get_connection_pool_stats()["writer"]
+    database.close_connection_pool()
+
+    assert writer_stats["acquisitions"] == 2
+    assert writer_stats["max_queue_depth"] == 1
+    assert writer_stats["queue_depth"] == 0
+    assert writer_stats["wait_ms_max"] >= 40
+
+
+def configure_group_commit(monkeypatch, tmp_path: Path, window_ms: float) -> list[str]:
+    """Enable WAL group commit on a temp database and record snapshot syncs."""
+    configure_local_database(monkeypatch, tmp_path)
+    monkeypatch.setattr(database, "SQLITE_STORAGE_MODE", "wal")
+    monkeypatch.setattr(database, "SQLITE_GROUP_COMMIT_WINDOW_MS", window_ms)
+    sync_reasons: list[str] = []
+    monkeypatch.setattr(database, "request_sqlite_sync", lambda reason: sync_reasons.append(reason))
+    database.get_connection_pool_stats()
+
+    return sync_reasons
+
+
+def test_group_commit_coalesces_concurrent_writes_into_one_commit(tmp_path, monkeypatch):
+    sync_reasons = configure_group_commit(monkeypatch, tmp_path, window_ms=100)
+    committed: list[str] = []
+
+    def write_author(name: str):
+        with database.get_connection(write=True) as connection:
+            connection.execute("INSERT INTO authors (name) VALUES (?)", (name,))
+            connection.commit()
+        committed.append(name)
+
+    writers = [
+        threading.Thread(target=write_author, args=(f"Author {index}",)) for index in range(5)
+    ]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(timeout=5)
+
+    writer_stats = database.get_connection_pool_stats()["writer"]
+    with database.get_connection() as connection:
+        names = {row["name"] for row in connection.execute("SELECT name FROM authors")}
+    database.close_connection_pool()
+
+    assert sorted(committed) == [f"Author {index}" for index in range(5)]
+    assert names == set(committed)
+    assert writer_stats["batches"] == 1
+    assert writer_stats["max_batch_size"] == 5
+    assert sync_reasons == ["commit"]
+
+
+def test_group_commit_rolls_back_only_the_failing_unit(tmp_path, monkeypatch):
+    sync_reasons = configure_group_commit(monkeypatch, tmp_path, window_ms=100)
+    errors: list[Exception] = []
+
+    def write_author(name: str, fail: bool):
+        try:
+            with database.get_connection(write=True) as connection:
+                connection.execute("INSERT INTO authors (name) VALUES (?)", (name,))
+                if fail:
+                    raise RuntimeError("boom")
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    writers = [
+        threading.Thread(target=write_author, args=("Kept Author", False)),
+        threading.Thread(target=write_author, args=("Failed Author", True)),
+        threading.Thread(target=write_author, args=("Other Author", False)),
+    ]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(timeout=5)
+
+    with database.get_connection() as connection:
+        names = {row["name"] for row in connection.execute("SELECT name FROM authors")}
+    writer_stats = database.get_connection_pool_stats()["writer"]
+    database.close_connection_pool()
+
+    assert len(errors) == 1
+    assert names == {"Kept Author", "Other Author"}
+    assert writer_stats["batches"] == 1
+    assert writer_stats["batched_units"] == 2
+    assert sync_reasons == ["commit"]
+
+
+def test_group_commit_read_only_unit_waits_for_the_writes_it_read(tmp_path, monkeypatch):
+    configure_group_commit(monkeypatch, tmp_path, window_ms=200)
+
+    def write_author():
+        with database.get_connection(write=True) as connection:
+            connection.execute("INSERT INTO authors (name) VALUES ('Batched Author')")
+
+    writer = threading.Thread(target=write_author)
+    writer.start()
+    time.sleep(0.05)
+    with database.get_connection(write=True) as connection:
+        read_names = [row["name"] for row in connection.execute("SELECT name FROM authors")]
+    with database.get_connection() as connection:
+        committed_names = [row["name"] for row in connection.execute("SELECT name FROM authors")]
+    writer.join(timeout=5)
+    writer_stats = database.get_connection_pool_stats()["writer"]
+    database.close_connection_pool()
+
+    assert read_names == ["Batched Author"]
+    assert committed_names == ["Batched Author"]
+    assert writer_stats["batched_units"] == 1
+
+
+def configure_split_catalog(monkeypatch, tmp_path: Path) -> Path:
+    """Split the catalog into its own file and sync both files to a local stand-in bucket."""
+    storage_dir = tmp_path / "bucket"
+
+    monkeypatch.setattr(database, "SQLITE_PATH", str(tmp_path / "user-data.db"))
+    monkeypatch.setattr(database, "SQLITE_CATALOG_PATH", str(tmp_path / "catalog.db"))
+    monkeypatch.setattr(database, "SQLITE_GCS_BUCKET", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_OBJECT", "")
+    monkeypatch.setattr(database, "SQLITE_STORAGE_DIR", str(storage_dir))
+    monkeypatch.setattr(database, "SQLITE_GCS_SYNC_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(database, "SQLITE_CATALOG_SYNC_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(database, "_REMOTE_GENERATIONS", {})
+    monkeypatch.setattr(database, "_LOCAL_SNAPSHOT_STORES", {})
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    database.close_connection_pool()
+
+    return storage_dir
+
+
+def list_tables(path: Path) -> set[str]:
+    """Return the table names stored in a SQLite file."""
+    with sqlite3.connect(path) as connection:
+        return {
+            row[0]
+            for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+
+
+def test_split_catalog_publishes_only_the_file_a_write_touched(tmp_path, monkeypatch):
+    configure_split_catalog(monkeypatch, tmp_path)
+    database.init_db()
+    main_store = database._get_snapshot_store(database.MAIN_DATABASE)
+    catalog_store = database._get_snapshot_store(database.CATALOG_DATABASE)
+    initial_generations = (main_store.get_generation(), catalog_store.get_generation())
+
+    with database.get_connection(write=True) as connection:
+        connection.execute("INSERT INTO games (name, type) VALUES ('Catalog Game', 'game')")
+    after_catalog_write = (main_store.get_generation(), catalog_store.get_generation())
+
+    with database.get_connection(write=True) as connection:
+        connection.execute("INSERT INTO users (id, email) VALUES ('user-1', 'player@example.com')")
+    after_user_write = (main_store.get_generation(), catalog_store.get_generation())
+    database.close_connection_pool()
+
+    assert after_catalog_write == (initial_generations[0], initial_generations[1] + 1)
+    assert after_user_write == (initial_generations[0] + 1, initial_generations[1] + 1)
+    assert "games" in list_tables(tmp_path / "catalog.db")
+    assert "games" not in list_tables(tmp_path / "user-data.db")
+    assert "collection_games" in list_tables(tmp_path / "user-data.db")
+
+
+def test_split_catalog_migrates_a_single_file_database(tmp_path, monkeypatch):
+    local_path = configure_local_database(monkeypatch, tmp_path)
+    database.init_db()
+    with database.get_connection(write=True) as connection:
+        connection.execute("INSERT INTO games (name, type) VALUES ('Legacy Game', 'game')")
+        connection.execute("INSERT INTO users (id, email) VALUES ('user-1', 'player@example.com')")
+        connection.execute("INSERT INTO collections (name, owner_id) VALUES ('Shelf', 'user-1')")
+        connection.execute("INSERT INTO collection_games (collection_id, game_id) VALUES (1, 1)")
+    database.close_connection_pool()
+
+    monkeypatch.setattr(database, "SQLITE_CATALOG_PATH", str(tmp_path / "catalog.db"))
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    database.init_db()
+    with database.get_connection() as connection:
+        rows = connection.execute(
+            """
+            SELECT collections.name AS collection_name, games.name AS game_name
+            FROM collection_games
+            JOIN collections ON collections.id = collection_games.collection_id
+            JOIN games ON games.id = collection_games.game_id
+            """
+        ).fetchall()
+    database.close_connection_pool()
+
+    assert [(row["collection_name"], row["game_name"]) for row in rows] == [
+        ("Shelf", "Legacy Game")
+    ]
+    assert "games" not in list_tables(local_path)
+    assert "games" in list_tables(tmp_path / "catalog.db")
@@ -1,3 +1,5 @@
+import json
+
 from backend.app import main
 from backend.app import auth
 from types import SimpleNamespace
@@ -34,22 +36,54 @@ def test_get_games_delegates_to_paginated_crud(monkeypatch):
         search="azul",
         game_type="jeu",
         year="2017",
+        year_min=2010,
+        year_max=2020,
+        players=5,
+        max_age=10,
+        max_duration=45,
         sort_by="authors",
         sort_dir="desc",
+        cursor="opaque",
+        include_total=True,
+        total_mode="exact",
     )
 
-    assert response["total"] == 0
+    assert json.loads(response.body)["total"] == 0
     assert captured == {
         "skip": 20,
         "limit": 50,
         "search": "azul",
         "game_type": "jeu",
         "year": "2017",
+        "year_min": 2010,
+        "year_max": 2020,
+        "players": 5,
+        "max_age": 10,
+        "max_duration": 45,
         "sort_by": "authors",
         "sort_dir": "desc",
+        "cursor": "opaque",
+        "include_total": True,
+        "total_mode": "exact",
+        "as_json": True,
     }
 
 
+def test_get_game_suggestions_delegates_to_crud(monkeypatch):
+    captured = {}
+
+    def fake_suggest_game_names(query, limit):
+        captured.update({"query": query, "limit": limit})
+        return [{"id": 1, "name": "Carcassonne", "similarity": 0.571}]
+
+    monkeypatch.setattr(main.crud, "suggest_game_names", fake_suggest_game_names)
+
+    response = main.get_game_suggestions(q="carcasone", limit=3)
+
+    assert response == [{"id": 1, "name": "Carcassonne", "similarity": 0.571}]
+    assert captured == {"query": "carcasone", "limit": 3}
+
+
 def test_get_version_returns_backend_metadata():
     response = main.get_version()
 
@@ -120,11 +154,19 @@ def test_get_my_collection_games_delegates_to_personal_collection_crud(monkeypat
         search="azul",
         game_type="jeu",
         year="2017",
+        year_min=2010,
+        year_max=2020,
+        players=5,
+        max_age=10,
+        max_duration=45,
         sort_by="name",
         sort_dir="asc",
+        cursor=None,
+        include_total=False,
+        total_mode="estimate",
     )
 
-    assert response["total"] == 0
+    assert json.loads(response.body)["total"] == 0
     assert captured == {
         "auth_user": {"name": "Alice", "email": "alice@example.com"},
         "skip": 10,
@@ -132,8 +174,17 @@ def test_get_my_collection_games_delegates_to_personal_collection_crud(monkeypat
         "search": "azul",
         "game_type": "jeu",
         "year": "2017",
+        "year_min": 2010,
+        "year_max": 2020,
+        "players": 5,
+        "max_age": 10,
+        "max_duration": 45,
         "sort_by": "name",
         "sort_dir": "asc",
+        "cursor": None,
+        "include_total": False,
+        "total_mode": "estimate",
+        "as_json": True,
     }
 
 
@@ -165,14 +216,17 @@ def test_get_my_collection_board_delegates_to_crud(monkeypatch):
     request = SimpleNamespace(state=SimpleNamespace(user={"name": "Alice", "email": "alice@example.com"}))
 
     def fake_get_personal_collection_board(**kwargs):
-        assert kwargs == {"auth_user": {"name": "Alice", "email": "alice@example.com"}}
-        return {"collection_id": 1, "locations": [], "items": []}
+        assert kwargs == {
+            "auth_user": {"name": "Alice", "email": "alice@example.com"},
+            "as_json": True,
+        }
+        return b'{"collection_id":1,"locations":[],"items":[]}'
 
     monkeypatch.setattr(main.crud, "get_personal_collection_board", fake_get_personal_collection_board)
 
     response = main.get_my_collection_board(request=request)
 
-    assert response["collection_id"] == 1
+    assert json.loads(response.body)["collection_id"] == 1
 
 
 def test_get_my_collection_share_settings_delegates_to_crud(monkeypatch):
@@ -407,3 +461,125 @@ def test_delete_location_in_my_collection_delegates_to_crud(monkeypatch):
         "auth_user": {"name": "Alice", "email": "alice@example.com"},
         "location_id": 7,
     }
+
+
+def configure_request_database(monkeypatch, tmp_path):
+    """Route API requests to a temp SQLite file and record snapshot syncs."""
+    from fastapi.testclient import TestClient
+
+    from backend.app import database
+
+    sync_reasons = []
+
+    async def fake_get_authenticated_session(_request):
+        return {"user": {"name": "Alice Example", "email": "alice@example.com"}, "session": {}}
+
+    monkeypatch.setattr(database, "SQLITE_PATH", str(tmp_path / "requests.db"))
+    monkeypatch.setattr(database, "SQLITE_GCS_BUCKET", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_OBJECT", "")
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    monkeypatch.setattr(
+        database, "request_sqlite_sync", lambda reason="commit": sync_reasons.append(reason)
+    )
+    monkeypatch.setattr(main, "get_authenticated_session", fake_get_authenticated_session)
+    database.close_connection_pool()
+
+    return TestClient(main.app), database, sync_reasons
+
+
+def test_api_request_uses_one_connection_and_one_commit(monkeypatch, tmp_path):
+    client, database, sync_reasons = configure_request_database(monkeypatch, tmp_path)
+    game = main.crud.create_game(
+        main.schemas.GameCreate(name="Azul", type="jeu", authors=["Michael Kiesling"])
+    )
+    sync_reasons.clear()
+    checkouts_before = database.get_connection_pool_stats()["checkouts"]
+
+    response = client.post("/api/me/collection/games/", json={"game_id": game["id"]})
+
+    stats = database.get_connection_pool_stats()
+    database.close_connection_pool()
+
+    assert response.status_code == 200
+    assert stats["checkouts"] - checkouts_before == 1
+    assert stats["in_use"] == 0
+    assert sync_reasons == ["commit"]
+
+
+def test_api_request_error_rolls_back_the_whole_unit_of_work(monkeypatch, tmp_path):
+    client, database, sync_reasons = configure_request_database(monkeypatch, tmp_path)
+
+    response = client.post("/api/me/collection/games/", json={"game_id": 404})
+    users = main.crud.get_users()
+    database.close_connection_pool()
+
+    assert response.status_code == 404
+    assert users == []
+    assert sync_reasons == []
+
+
+def test_first_personal_read_creates_its_rows_while_another_writer_commits(monkeypatch, tmp_path):
+    import sqlite3
+    import threading
+
+    client, database, _ = configure_request_database(monkeypatch, tmp_path)
+    monkeypatch.setattr(database, "SQLITE_STORAGE_MODE", "rollback")
+    main.crud.create_game(main.schemas.GameCreate(name="Azul", type="jeu"))
+    writer = sqlite3.connect(database.SQLITE_PATH, check_same_thread=False)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO games (name, type) VALUES ('Patchwork', 'jeu')")
+    # The other writer commits during the request; a read transaction upgrading its lock would fail.
+    committer = threading.Timer(0.3, writer.commit)
+    committer.start()
+
+    response = client.get("/api/me/collection/games/")
+    committer.join()
+    writer.close()
+    collection = main.crud.get_collections()
+    database.close_connection_pool()
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+    assert [row["name"] for row in collection] == ["Collection de Alice Example"]
+
+
+def test_fast_read_endpoints_emit_exactly_their_response_schema(monkeypatch, tmp_path):
+    from pydantic import TypeAdapter
+
+    client, database, _ = configure_request_database(monkeypatch, tmp_path)
+    game = main.crud.create_game(
+        main.schemas.GameCreate(
+            name="Azul",
+            type="jeu",
+            creation_year=2017,
+            authors=["Michael Kiesling"],
+            artists=["Chris Quilliams"],
+            editors=["Next Move"],
+            distributors=["Asmodee"],
+        )
+    )
+    client.post("/api/me/collection/games/", json={"game_id": game["id"]})
+    client.post("/api/me/collection/locations/", json={"name": "Salon"})
+
+    responses = {
+        "/api/games/?limit=1": main.schemas.GamePage,
+        "/api/games/?search=azull": main.schemas.GamePage,
+        f"/api/games/{game['id']}": main.schemas.Game,
+        "/api/me/collection/games/?include_total=false": main.schemas.GamePage,
+        "/api/me/collection/board/": main.schemas.PersonalCollectionBoard,
+        "/api/authors/": list[main.schemas.Author],
+        "/api/artists/": list[main.schemas.Artist],
+        "/api/editors/?limit=1": list[main.schemas.Editor],
+        "/api/distributors/": list[main.schemas.Distributor],
+    }
+    payloads = {path: client.get(path) for path in responses}
+    database.close_connection_pool()
+
+    for path, schema in responses.items():
+        adapter = TypeAdapter(schema)
+        body = payloads[path].json()
+
+        assert payloads[path].status_code == 200, path
+        assert adapter.dump_python(adapter.validate_python(body), mode="json") == body, path
+    assert payloads["/api/editors/?limit=1"].headers[main.NEXT_CURSOR_HEADER]
+    assert payloads["/api/games/?search=azull"].json()["suggestions"][0]["name"] == "Azul"
@@ -0,0 +1,287 @@
+import re
+import sqlite3
+from uuid import NAMESPACE_URL, uuid5
+
+import pytest
+
+from backend.app import crud, database, schemas
+
+
+SEEDED_GAMES = 2000
+SEEDED_USERS = 300
+GAME_SORT_FIELDS = (
+    "name",
+    "type",
+    "creation_year",
+    "players",
+    "duration_minutes",
+    "authors",
+    "editors",
+)
+# Full scans that are expected, with the reason they cannot be served by an index.
+ALLOWED_SCANS = {
+    "ORDER BY id LIMIT": "paginated listings walk the rowid and stop at the page limit",
+    "LIKE '%": "substring filters cannot use a B-tree index",
+    "g.min_players DESC": "the NULLs-last prefix only partly orders descending player counts",
+}
+_TABLE_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def seeded_user_id(index: int) -> str:
+    """Return the stable UUID of a seeded user."""
+    return str(uuid5(NAMESPACE_URL, f"user-{index}"))
+
+
+def seed_database(path) -> None:
+    """Fill every application table with enough rows for the planner to prefer indexes."""
+    with sqlite3.connect(path) as connection:
+        for table, column in (
+            ("authors", "author"),
+            ("artists", "artist"),
+            ("editors", "editor"),
+            ("distributors", "distributor"),
+        ):
+            connection.executemany(
+                f"INSERT INTO {table} (name) VALUES (?)",
+                [(f"{column.capitalize()} {index:05d}",) for index in range(SEEDED_GAMES // 4)],
+            )
+        connection.executemany(
+            """
+            INSERT INTO games
+                (name, type, creation_year, min_players, max_players, duration_minutes)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    f"Game {index:05d}",
+                    "jeu" if index % 5 else "extension",
+                    1990 + index % 35,
+                    1 + index % 4,
+                    2 + index % 6,
+                    15 + index % 120,
+                )
+                for index in range(SEEDED_GAMES)
+            ],
+        )
+        for join_table, column in (
+            ("game_authors", "author_id"),
+            ("game_artists", "artist_id"),
+            ("game_editors", "editor_id"),
+            ("game_distributors", "distributor_id"),
+        ):
+            connection.executemany(
+                f"INSERT INTO {join_table} (game_id, {column}) VALUES (?, ?)",
+                [(index + 1, index % (SEEDED_GAMES // 4) + 1) for index in range(SEEDED_GAMES)],
+            )
+        connection.executemany(
+            "INSERT INTO users (id, email, username) VALUES (?, ?, ?)",
+            [
+                (seeded_user_id(index), f"user{index}@example.com", f"User {index:05d}")
+                for index in range(SEEDED_USERS)
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO collections (name, description, owner_id) VALUES (?, ?, ?)",
+            [(f"Collection {index}", None, seeded_user_id(index)) for index in range(SEEDED_USERS)],
+        )
+        connection.executemany(
+            "INSERT INTO user_locations (user_id, name) VALUES (?, ?)",
+            [(seeded_user_id(index), f"Shelf {index}") for index in range(SEEDED_USERS)],
+        )
+        connection.executemany(
+            "INSERT INTO collection_shares (collection_id, shared_with, permission) "
+            "VALUES (?, ?, 'viewer')",
+            [
+                (index % SEEDED_USERS + 1, seeded_user_id((index + 1) % SEEDED_USERS))
+                for index in range(SEEDED_USERS)
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO collection_games (collection_id, game_id, location_id, quantity) "
+            "VALUES (?, ?, NULL, 1)",
+            [
+                (index % SEEDED_USERS + 1, index % SEEDED_GAMES + 1)
+                for index in range(SEEDED_GAMES * 2)
+            ],
+        )
+
+
+@pytest.fixture
+def traced_statements(tmp_path, monkeypatch):
+    database_path = tmp_path / "plans.db"
+    monkeypatch.setattr(database, "SQLITE_PATH", str(database_path))
+    monkeypatch.setattr(database, "SQLITE_CATALOG_PATH", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_BUCKET", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_OBJECT", "")
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    database.close_connection_pool()
+    database.init_db()
+    seed_database(database_path)
+
+    statements: list[str] = []
+    database.set_statement_trace_callback(statements.append)
+    yield database_path, statements
+    database.close_connection_pool()
+    database.set_statement_trace_callback(None)
+
+
+def exercise_crud() -> None:
+    """Run every crud query shape against the seeded database."""
+    crud.get_games(skip=10, limit=5)
+    crud.get_game(42)
+    for sort_by in GAME_SORT_FIELDS:
+        for sort_dir in ("asc", "desc"):
+            page = crud.get_games_page(limit=10, sort_by=sort_by, sort_dir=sort_dir)
+            crud.get_games_page(
+                limit=10, sort_by=sort_by, sort_dir=sort_dir, cursor=page["next_cursor"]
+            )
+    crud.get_games_page(limit=10, search="game 001", game_type="jeu", year="2001")
+    crud.get_games_page(limit=10, year_min=2001, year_max=2003)
+    crud.get_games_page(limit=10, players=7, max_duration=20)
+    crud.get_games_page(limit=10, max_duration=20, max_age=8)
+
+    for label in ("author", "artist", "editor", "distributor"):
+        getattr(crud, f"get_{label}s")(limit=5)
+        getattr(crud, f"get_{label}")(3)
+        create = getattr(crud, f"create_{label}")
+        created = create(getattr(schemas, f"{label.capitalize()}Create")(name=f"Temporary {label}"))
+        getattr(crud, f"update_{label}")(
+            created["id"], getattr(schemas, f"{label.capitalize()}Update")(name=f"Renamed {label}")
+        )
+        getattr(crud, f"delete_{label}")(created["id"])
+    game = crud.create_game(
+        schemas.GameCreate(
+            name="Planned Game", type="jeu", authors=["Author 00001"], editors=["New Editor"]
+        )
+    )
+    crud.delete_game(game["id"])
+
+    authors = crud.get_authors(limit=5)
+    crud.get_authors(limit=5, cursor=crud.get_next_page_cursor("authors", authors, limit=5))
+    crud.get_users(limit=5)
+    crud.get_user_by_email("user7@example.com")
+    crud.get_user_by_username("User 00007")
+    crud.get_collections(limit=5)
+    crud.get_collection(5)
+    crud.get_collection_shares(limit=5)
+    crud.get_user_locations(limit=5)
+    crud.get_collection_games(limit=5)
+
+    owner = {"name": "User 00010", "email": "user10@example.com"}
+    subscriber = {"name": "Plan Subscriber", "email": "subscriber@example.com"}
+    for sort_by in GAME_SORT_FIELDS:
+        crud.get_personal_collection_games(owner, limit=10, sort_by=sort_by)
+    crud.get_personal_collection_games(owner, limit=10, search="game", game_type="jeu", year="20")
+    crud.get_personal_collection_games(owner, limit=10, players=4, max_duration=60, year_min=2000)
+    location = crud.create_personal_location(owner, "Planned Shelf")
+    crud.update_personal_location(owner, location["id"], "Renamed Shelf")
+    added = crud.add_game_to_personal_collection(owner, game_id=1999)
+    crud.move_personal_collection_game(owner, added["id"], location_id=location["id"])
+    crud.get_personal_collection_board(owner)
+    crud.remove_game_from_personal_collection(owner, added["id"])
+    crud.delete_personal_location(owner, location["id"])
+
+    settings = crud.update_personal_collection_share_settings(owner, share_enabled=True)
+    crud.join_shared_collection(subscriber, settings["share_token"])
+    crud.get_shared_collections(subscriber)
+    crud.get_shared_collection_board(subscriber, settings["collection_id"])
+    settings = crud.get_personal_collection_share_settings(owner)
+    crud.unsubscribe_from_shared_collection(subscriber, settings["collection_id"])
+    crud.join_shared_collection(subscriber, settings["share_token"])
+    share_id = crud.get_personal_collection_share_settings(owner)["subscribers"][0]["id"]
+    crud.revoke_personal_collection_subscriber(owner, share_id)
+    crud.delete_user(crud.get_user_by_email("subscriber@example.com")["id"])
+
+
+def find_full_scans(connection: sqlite3.Connection, statement: str) -> list[str]:
+    """Return the tables a statement reads with a full scan that no index drives."""
+    aliases = {}
+    for table, alias in _TABLE_ALIAS.findall(statement):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    scans = []
+    for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}"):
+        match = _FULL_SCAN.match(row[3])
+        if match and aliases.get(match.group(1), match.group(1)) in database.CHANGE_LOGGED_TABLES:
+            scans.append(aliases.get(match.group(1), match.group(1)))
+    return scans
+
+
+def test_crud_queries_do_not_scan_large_tables(traced_statements):
+    database_path, statements = traced_statements
+
+    exercise_crud()
+
+    queries = {
+        " ".join(statement.split())
+        for statement in statements
+        if statement.lstrip().split(None, 1)[0].upper() in {"SELECT", "UPDATE", "DELETE"}
+    }
+    with sqlite3.connect(database_path) as connection:
+        unexpected = {
+            query: scans
+            for query in sorted(queries)
+            if (scans := find_full_scans(connection, query))
+            and not any(marker in query for marker in ALLOWED_SCANS)
+        }
+
+    assert len(queries) > 40
+    assert unexpected == {}
+
+
+def test_game_pages_hydrate_only_uncached_games_in_one_statement(traced_statements):
+    _, statements = traced_statements
+
+    page = crud.get_games_page(limit=20, sort_by="name", include_total=False)
+    page_selects = [
+        statement for statement in statements if statement.lstrip().upper().startswith("SELECT")
+    ]
+    statements.clear()
+    cached_page = crud.get_games_page(limit=20, sort_by="name", include_total=False)
+    cached_page_selects = [
+        statement for statement in statements if statement.lstrip().upper().startswith("SELECT")
+    ]
+    statements.clear()
+    game = crud.get_game(2)
+    uncached_game = crud.get_game(SEEDED_GAMES)
+    game_selects = [
+        statement for statement in statements if statement.lstrip().upper().startswith("SELECT")
+    ]
+
+    assert len(page_selects) == 2
+    assert len(cached_page_selects) == 1
+    assert cached_page == page
+    assert len(game_selects) == 1
+    assert uncached_game["name"] == f"Game {SEEDED_GAMES - 1:05d}"
+    assert page["items"][0]["authors"] == [{"id": 1, "name": "Author 00000"}]
+    assert game["distributors"] == [{"id": 2, "name": "Distributor 00001"}]
+
+
+def test_indexes_are_versioned_and_built_once(tmp_path, monkeypatch):
+    database_path = tmp_path / "indexes.db"
+    monkeypatch.setattr(database, "SQLITE_PATH", str(database_path))
+    monkeypatch.setattr(database, "SQLITE_CATALOG_PATH", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_BUCKET", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_OBJECT", "")
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    database.close_connection_pool()
+    database.init_db()
+
+    with sqlite3.connect(database_path) as connection:
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        connection.execute("DROP INDEX idx_games_name_lower")
+        database._ensure_schema_migrations(connection)
+        rebuilt_after_drop = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'idx_games_name_lower'"
+        ).fetchone()
+        connection.execute("PRAGMA user_version = 0")
+        database._ensure_schema_migrations(connection)
+        rebuilt_after_reset = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'idx_games_name_lower'"
+        ).fetchone()
+
+    assert version == database.INDEX_VERSION
+    assert rebuilt_after_drop is None
+    assert rebuilt_after_reset is not None
@@ -0,0 +1,97 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from backend.app import database
+from backend.app.replication import PageReplicator
+from backend.app.storage import LocalDirectoryReplicaStore, StorageConflict
+
+
+def configure_page_replication(monkeypatch, tmp_path: Path, local_name: str = "local.db") -> Path:
+    """Replicate a temp SQLite file into a local directory standing in for the bucket."""
+    storage_dir = tmp_path / "bucket"
+
+    monkeypatch.setattr(database, "SQLITE_PATH", str(tmp_path / local_name))
+    monkeypatch.setattr(database, "SQLITE_GCS_BUCKET", "")
+    monkeypatch.setattr(database, "SQLITE_GCS_OBJECT", "")
+    monkeypatch.setattr(database, "SQLITE_REPLICATION_MODE", "pages")
+    monkeypatch.setattr(database, "SQLITE_STORAGE_DIR", str(storage_dir))
+    monkeypatch.setattr(database, "SQLITE_GCS_SYNC_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(database._RESOURCES, "page_replicator", None)
+    monkeypatch.setattr(database, "_UNSYNCED_DATABASES", set())
+    monkeypatch.setattr(database, "_DB_INITIALIZED", False)
+    database.close_connection_pool()
+
+    return storage_dir / f"{database.DEFAULT_SNAPSHOT_OBJECT}.replica"
+
+
+def insert_authors(names: list[str]) -> None:
+    """Insert authors through the pooled write path."""
+    with database.get_connection(write=True) as connection:
+        connection.executemany("INSERT INTO authors (name) VALUES (?)", [(name,) for name in names])
+        connection.commit()
+
+
+def test_page_replication_uploads_segments_sized_by_the_change(tmp_path, monkeypatch):
+    replica_dir = configure_page_replication(monkeypatch, tmp_path)
+    database.init_db()
+    insert_authors([f"Catalog Author {index:05d}" for index in range(5000)])
+
+    insert_authors(["One More Author"])
+    database.close_connection_pool()
+
+    names = sorted(path.name for path in replica_dir.iterdir())
+    database_size = Path(database.SQLITE_PATH).stat().st_size
+    last_segment_size = (replica_dir / names[-1]).stat().st_size
+
+    assert names[0] == "base-00000001.db"
+    assert names[-1] == "base-00000001.segment-00000002.pages"
+    assert database_size > 20 * last_segment_size
+
+
+def test_init_db_restores_the_latest_base_and_replays_segments(tmp_path, monkeypatch):
+    configure_page_replication(monkeypatch, tmp_path)
+    database.init_db()
+    insert_authors(["First Author"])
+    insert_authors(["Second Author"])
+    database.close_connection_pool()
+
+    configure_page_replication(monkeypatch, tmp_path, local_name="restored.db")
+    database.init_db()
+    with database.get_connection() as connection:
+        names = [
+            row["name"] for row in connection.execute("SELECT name FROM authors ORDER BY name")
+        ]
+    database.close_connection_pool()
+
+    assert names == ["First Author", "Second Author"]
+
+
+def test_page_replicator_starts_a_new_base_after_the_interval(tmp_path):
+    store = LocalDirectoryReplicaStore(tmp_path / "bucket")
+    replicator = PageReplicator(store, base_interval=1)
+    database_path = tmp_path / "source.db"
+    scratch_path = tmp_path / "scratch"
+
+    for name in ["First", "Second", "Third", "Fourth", "Fifth"]:
+        with sqlite3.connect(database_path) as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS authors (name TEXT)")
+            connection.execute("INSERT INTO authors (name) VALUES (?)", (name,))
+        replicator.publish(database_path, scratch_path)
+
+    assert store.list_names() == [
+        "base-00000002.db",
+        "base-00000002.segment-00000001.pages",
+        "base-00000003.db",
+    ]
+
+
+def test_local_directory_store_rejects_existing_names(tmp_path):
+    store = LocalDirectoryReplicaStore(tmp_path / "bucket")
+    source = tmp_path / "object"
+    source.write_bytes(b"segment")
+    store.upload("base-00000001.db", source)
+
+    with pytest.raises(StorageConflict):
+        store.upload("base-00000001.db", source)
@@ -0,0 +1,41 @@
+from backend.app.search import TrigramIndex, name_trigrams, normalize_name_key
+
+
+def test_normalize_name_key_folds_accents_case_and_punctuation():
+    assert (
+        normalize_name_key("Les Châteaux de Bourgogne : Édition Deluxe")
+        == "les chateaux de bourgogne edition deluxe"
+    )
+    assert normalize_name_key("Dungeons & Dragons") == "dungeons et dragons"
+
+
+def test_name_trigrams_pad_each_word():
+    assert name_trigrams("Go!") == {"  g", " go", "go "}
+
+
+def test_trigram_index_suggests_the_closest_distinct_names():
+    index = TrigramIndex(
+        [
+            (1, "Carcassonne"),
+            (2, "Carcassonne"),
+            (3, "Carcassonne Junior"),
+            (4, "Carcassonne: Chasseurs et Cueilleurs"),
+            (5, "Azul"),
+        ]
+    )
+
+    suggestions = index.suggest("carcasone", limit=3)
+
+    assert [suggestion["name"] for suggestion in suggestions] == [
+        "Carcassonne",
+        "Carcassonne Junior",
+    ]
+    assert suggestions[0]["id"] == 1
+    assert suggestions[0]["similarity"] > suggestions[1]["similarity"]
+
+
+def test_trigram_index_returns_partial_results_when_the_budget_is_spent():
+    index = TrigramIndex((game_id, f"Game {game_id}") for game_id in range(1000))
+
+    assert index.suggest("xyz") == []
+    assert len(index.suggest("game 12", limit=2, budget_seconds=0)) <= 2
@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+from backend.app.storage import LocalDirectorySnapshotStore, StorageConflict
+
+
+def test_local_snapshot_store_enforces_generation_match(tmp_path):
+    store = LocalDirectorySnapshotStore(tmp_path / "bucket", "ludostock.db")
+    snapshot = tmp_path / "snapshot.db"
+    snapshot.write_bytes(b"first")
+
+    assert store.get_generation() is None
+    assert store.put(snapshot, if_generation_match=0) == 1
+    with pytest.raises(StorageConflict):
+        store.put(snapshot, if_generation_match=0)
+
+    snapshot.write_bytes(b"second")
+    assert store.put(snapshot, if_generation_match=1) == 2
+    assert store.download(tmp_path / "downloaded.db") == 2
+    assert (tmp_path / "downloaded.db").read_bytes() == b"second"
+
+
+def test_local_snapshot_store_reports_missing_snapshot_and_injects_latency(tmp_path):
+    store = LocalDirectorySnapshotStore(tmp_path / "bucket", "ludostock.db", latency_seconds=0.05)
+
+    started = time.perf_counter()
+    generation = store.download(tmp_path / "downloaded.db")
+
+    assert generation is None
+    assert time.perf_counter() - started >= 0.05
+    assert not (tmp_path / "downloaded.db").exists()
@@ -19,6 +19,7 @@ import requests
 from bs4 import BeautifulSoup
 
 from backend.app.database import SCHEMA_STATEMENTS
+from backend.app.search import normalize_name_key
 from backend.app.schemas import GameCreate
 
 
@@ -180,16 +181,6 @@ def normalize_label(value: str) -> str:
     return re.sub(r"[^a-z0-9]+", "_", stripped.lower()).strip("_")
 
 
-def normalize_name_key(value: str | None) -> str:
-    """Normalize a game name to a fuzzy matching key."""
-    if not value:
-        return ""
-    lowered = value.casefold().replace("&", " et ")
-    normalized = unicodedata.normalize("NFKD", lowered)
-    stripped = "".join(character for character in normalized if not unicodedata.combining(character))
-    return re.sub(r"[^a-z0-9]+", " ", stripped).strip()
-
-
 def clean_text(value: Any) -> str | None:
     """Return a stripped string or None for null-like values."""
     if value is None:
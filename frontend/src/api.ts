@@ -2,7 +2,7 @@ const API_BASE_URL =
   (import.meta.env.VITE_API_BASE_URL as string | undefined)?.replace(/\/$/, "") ??
   "/api";
 
-export async function request<T>(path: string, init?: RequestInit): Promise<T> {
+async function fetchApi(path: string, init?: RequestInit): Promise<Response> {
   const response = await fetch(`${API_BASE_URL}${path}`, {
     credentials: "include",
     headers: {
@@ -17,6 +17,12 @@ export async function request<T>(path: string, init?: RequestInit): Promise<T> {
     throw new Error(errorPayload?.detail ?? `Erreur HTTP ${response.status}`);
   }
 
+  return response;
+}
+
+export async function request<T>(path: string, init?: RequestInit): Promise<T> {
+  const response = await fetchApi(path, init);
+
   if (response.status === 204) {
     return undefined as T;
   }
@@ -26,13 +32,18 @@ export async function request<T>(path: string, init?: RequestInit): Promise<T> {
 
 export async function requestAllPages<T>(path: string, pageSize = 500): Promise<T[]> {
   const items: T[] = [];
+  const separator = path.includes("?") ? "&" : "?";
+  let cursor: string | null = null;
 
-  for (let skip = 0; ; skip += pageSize) {
-    const separator = path.includes("?") ? "&" : "?";
-    const page = await request<T[]>(`${path}${separator}skip=${skip}&limit=${pageSize}`);
+  for (;;) {
+    const cursorParameter = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+    const response = await fetchApi(`${path}${separator}limit=${pageSize}${cursorParameter}`);
+    const page = (await response.json()) as T[];
     items.push(...page);
 
-    if (page.length < pageSize) {
+    // Each page resumes after the last id of the previous one instead of skipping rows.
+    cursor = response.headers.get("X-Next-Cursor");
+    if (!cursor || page.length < pageSize) {
       return items;
     }
   }
@@ -27,8 +27,11 @@ export type Game = {
 export type GamePage = {
   items: Game[];
   total: number;
+  total_is_estimate: boolean;
+  has_more: boolean;
   skip: number;
   limit: number;
+  next_cursor: string | null;
 };
 
 export type UserLocation = {